@@ -12,3 +12,7 @@ MAIN_MENU_ITEMS = [
 
     "trading_insights.Scenario",
 ]
+
+
+LIGHT_HOME_CONTEXT_PROVIDER = "trading_insights.services.dashboard.get_home_context"
+LIGHT_HOME_TEMPLATE_NAME = "trading_insights/home.html"
@@ -14,6 +14,7 @@ import os
 from pathlib import Path
 
 from django.contrib.messages import constants as messages
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -64,6 +65,7 @@ CRISPY_TEMPLATE_PACK = "bootstrap4"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -113,10 +115,45 @@ elif DEFAULT_DB == "postgres":
             "PASSWORD": os.getenv("DB_PASSWORD"),
             "HOST": os.getenv("DB_HOST"),
             "PORT": os.getenv("DB_PORT"),
+            # Keep connections open across requests of a worker, and check
+            # them before reuse so a restarted database does not fail requests.
+            # Under ASGI every request may run in a new thread, persistent
+            # connections would pile up: they are disabled there.
+            "CONN_MAX_AGE": (
+                0 if os.getenv("SERVER_INTERFACE", "wsgi") == "asgi"
+                else int(os.getenv("DB_CONN_MAX_AGE", "60"))
+            ),
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The file backend is shared by every worker process of a host, so bumping a
+# data version in one worker invalidates the cached pages of all of them.
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "/tmp/bear_vision_cache"),
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "bear_vision",
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}, expected \"file\" or \"locmem\"."
+    )
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -131,6 +168,8 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "lava_light.User"
 
+AUTHENTICATION_BACKENDS = ["lava_light.backends.PermissionBackend"]
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -155,6 +194,23 @@ MEDIA_URL = "media/"
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Static files are served by WhiteNoise. In production mode, collectstatic
+# writes hashed and compressed copies, served with far future cache headers.
+# The storage follows SERVER_MODE rather than DEBUG: the images collect the
+# static files with SERVER_MODE=production, so the manifest exists whatever
+# mode the container later runs in.
+SERVER_MODE = os.getenv("SERVER_MODE", "development")
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": (
+            "bear_vision.storage.StaticFilesStorage" if SERVER_MODE == "production"
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
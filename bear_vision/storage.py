@@ -0,0 +1,27 @@
+from urllib.parse import unquote, urlsplit
+
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Hashed and compressed static files. The vendor theme references source
+    maps it does not ship: only those references keep their original name,
+    any other missing file still fails collectstatic and `{% static %}`.
+    """
+
+    # Missing files tolerated: (static directory, extension).
+    missing_vendor_files = (
+        ("enlink/", ".map"),
+    )
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            # Source map comments may keep trailing spaces in `name`.
+            path = urlsplit(unquote(name)).path.strip()
+            for prefix, extension in self.missing_vendor_files:
+                if path.startswith(prefix) and path.endswith(extension):
+                    return name
+            raise
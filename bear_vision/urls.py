@@ -24,7 +24,7 @@ from django.conf.urls.static import static
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('', include('lava_light.urls', namespace="lava_light")),
-    # path("insights/", include("trading_insights.urls")),
+    path("insights/", include("trading_insights.urls")),
 ]
 
 if settings.DEBUG is True:
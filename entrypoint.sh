@@ -4,7 +4,14 @@
 set -e
 
 python manage.py migrate --no-input
-python manage.py collectstatic --no-input
+# Always write the hashed files and their manifest, used in production mode.
+SERVER_MODE=production python manage.py collectstatic --no-input
 python manage.py light_setup
 
-python manage.py runserver 0.0.0.0:8000
+# SERVER_MODE=production serves the app with gunicorn (see gunicorn.conf.py),
+# anything else runs the development server.
+if [ "$SERVER_MODE" = "production" ]; then
+    exec gunicorn -c gunicorn.conf.py
+else
+    exec python manage.py runserver 0.0.0.0:${PORT:-8000}
+fi
@@ -0,0 +1,42 @@
+"""
+Gunicorn settings of the production server, see `entrypoint.sh`.
+
+Every value can be overridden from the environment:
+    WEB_CONCURRENCY: number of worker processes (2 x CPUs + 1 by default).
+    WEB_THREADS: threads per worker process (sync workers only).
+    WEB_TIMEOUT: seconds before a silent worker is restarted.
+    WEB_MAX_REQUESTS: requests served before a worker is recycled.
+    SERVER_INTERFACE: "wsgi" (default) or "asgi", served by uvicorn workers
+        (the settings then disable persistent database connections).
+"""
+
+import multiprocessing
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("WEB_THREADS", "1"))
+
+if os.getenv("SERVER_INTERFACE", "wsgi") == "asgi":
+    wsgi_app = "bear_vision.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "bear_vision.wsgi:application"
+    worker_class = "gthread" if threads > 1 else "sync"
+
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers regularly, jittered so they do not all restart at once.
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# Load Django once in the master so workers fork with the app ready.
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("WEB_LOG_LEVEL", "info")
@@ -6,3 +6,6 @@ class LavaLightConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "lava_light"
     verbose_name = _("Administration")
+
+    def ready(self):
+        from lava_light import signals  # noqa: F401
@@ -0,0 +1,15 @@
+from django.contrib.auth.backends import ModelBackend
+
+from lava_light.permissions import get_user_permissions
+
+
+class PermissionBackend(ModelBackend):
+    """
+    `ModelBackend` reading permissions from `get_user_permissions`, so
+    permission checks hit the database at most once per user and version.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if obj is not None or user_obj.is_anonymous:
+            return set()
+        return get_user_permissions(user_obj)
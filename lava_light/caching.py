@@ -0,0 +1,108 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+
+from lava_light import settings as light_settings
+
+
+def get_cache():
+    return caches[light_settings.CACHE_ALIAS]
+
+
+def _version_key(namespace, key):
+    return f"lava_light:version:{namespace}:{key}"
+
+
+def _new_version():
+    # Versions never repeat: a version key that is culled or evicted gets a
+    # new one, so entries cached against an earlier version are never read.
+    return uuid.uuid4().hex[:16]
+
+
+def get_version(namespace, key):
+    """
+    Current data version of `key` in `namespace` (e.g. an account id).
+    Entries built with `make_key` are invalidated by bumping it.
+    """
+    cache = get_cache()
+    version_key = _version_key(namespace, key)
+    version = cache.get(version_key)
+    if version is None:
+        # `add` lets concurrent requests agree on the same new version.
+        version = _new_version()
+        if not cache.add(version_key, version, timeout=None):
+            version = cache.get(version_key) or version
+    return version
+
+
+def bump_version(namespace, key):
+    """
+    Switch `key` to a new version. A plain `set` rather than `incr`, which
+    is not atomic on every backend: concurrent bumps both invalidate.
+    """
+    version = _new_version()
+    get_cache().set(_version_key(namespace, key), version, timeout=None)
+    return version
+
+
+def get_versions(namespace, keys):
+    """
+    Batch `get_version`: `{key: version}` read with a single `get_many`.
+    """
+    cache = get_cache()
+    version_keys = {_version_key(namespace, key): key for key in keys}
+    versions = {
+        version_keys[version_key]: version
+        for version_key, version in cache.get_many(version_keys).items()
+    }
+    for key in keys:
+        if key not in versions:
+            versions[key] = get_version(namespace, key)
+    return versions
+
+
+def bump_versions(namespace, keys):
+    """
+    Batch `bump_version`, with a single `set_many`.
+    """
+    versions = {_version_key(namespace, key): _new_version() for key in keys}
+    get_cache().set_many(versions, timeout=None)
+
+
+def build_key(namespace, key, version, *parts):
+    suffix = ":".join(str(part) for part in parts)
+    return f"lava_light:{namespace}:{key}:v{version}:{suffix}"
+
+
+def make_key(namespace, key, *parts):
+    return build_key(namespace, key, get_version(namespace, key), *parts)
+
+
+def get_or_compute(namespace, key, parts, compute, timeout=None):
+    """
+    Return the value cached for `(namespace, key, *parts)` at the current
+    version of `key`, computing and storing it on a miss.
+    """
+    if timeout is None:
+        timeout = light_settings.CACHE_TIMEOUT
+    cache_key = make_key(namespace, key, *parts)
+    value = get_cache().get(cache_key)
+    if value is None:
+        value = compute()
+        get_cache().set(cache_key, value, timeout)
+    return value
+
+
+async def aget_or_compute(namespace, key, parts, compute, timeout=None):
+    """
+    `get_or_compute` for async views, `compute()` returns an awaitable.
+    """
+    if timeout is None:
+        timeout = light_settings.CACHE_TIMEOUT
+    cache_key = await sync_to_async(make_key)(namespace, key, *parts)
+    value = await get_cache().aget(cache_key)
+    if value is None:
+        value = await compute()
+        await get_cache().aset(cache_key, value, timeout)
+    return value
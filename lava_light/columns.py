@@ -0,0 +1,64 @@
+from operator import attrgetter, methodcaller
+
+from django.utils.formats import localize
+from django.utils.timezone import template_localtime
+
+
+EMPTY_VALUE = "-----"
+
+
+class ListColumn:
+    """
+    A list display column with its accessor resolved once: choice fields read
+    `get_FOO_display`, relations read the related object, and values are
+    formatted the way the template engine would (local time, localization).
+    """
+
+    __slots__ = ("field", "name", "verbose_name", "getter")
+
+    def __init__(self, field):
+        self.field = field
+        self.name = field.name
+        self.verbose_name = getattr(field, "verbose_name", field.name)
+
+        if getattr(field, "choices", None):
+            self.getter = methodcaller(f"get_{field.name}_display")
+        elif hasattr(field, "get_accessor_name") or field.many_to_many:
+            # Reverse and many-to-many relations, read from the prefetch cache.
+            manager = attrgetter(
+                field.name if field.concrete else field.get_accessor_name()
+            )
+            self.getter = lambda obj: ", ".join(
+                str(related) for related in manager(obj).all()
+            )
+        else:
+            self.getter = attrgetter(field.name)
+
+    def __repr__(self):
+        return "<ListColumn: %s>" % self.name
+
+    def render(self, obj):
+        value = self.getter(obj)
+        if value is None or value == "":
+            return EMPTY_VALUE
+        if isinstance(value, str):
+            return value
+        return str(localize(template_localtime(value)))
+
+
+def build_list_columns(fields):
+    return tuple(ListColumn(field) for field in fields)
+
+
+def render_rows(objects, columns):
+    """
+    Pre-render `objects` as `(url, label, cells)` tuples for the list template.
+    """
+    return [
+        (
+            obj.get_absolute_url(),
+            str(obj),
+            tuple(column.render(obj) for column in columns),
+        )
+        for obj in objects
+    ]
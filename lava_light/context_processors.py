@@ -1,46 +1,72 @@
+import hashlib
+
+from django.utils import translation
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.apps import apps
 
 from lava_light import settings as light_settings
+from lava_light.caching import get_or_compute
+from lava_light.permissions import get_user_permissions
 
 
-# Cashing support for menu items
-CASHED_MAIN_MENU = list()
+MENU_CACHE_NAMESPACE = "menu"
 
 
-def get_menu_items():
+def get_permissions_key(user):
+    """
+    A hash of the user's permission set, users with the same permissions
+    share the same menu.
+    """
+    if not user.is_active:
+        return "inactive"
+    if user.is_superuser:
+        return "superuser"
 
-    global CASHED_MAIN_MENU
+    permissions = "\n".join(sorted(get_user_permissions(user)))
+    return hashlib.sha1(permissions.encode()).hexdigest()
 
-    if CASHED_MAIN_MENU:
-        return CASHED_MAIN_MENU
-
-    model_list = []
-    for model_name in light_settings.MAIN_MENU_ITEMS:
-        model = apps.get_model(model_name)
-        model_list.append(model)
 
+def build_menu_items(user):
     main_menu = [{
-        "title": _("Tableau de bord"),
+        "title": str(_("Tableau de bord")),
         "icon": "anticon anticon-dashboard",
         "url": reverse("lava_light:home"),
     }]
 
-    for model in model_list:
+    for model_name in light_settings.MAIN_MENU_ITEMS:
+        model = apps.get_model(model_name)
+        opts = model._meta
+        if not user.has_perm(f"{opts.app_label}.view_{opts.model_name}"):
+            continue
         main_menu.append({
-            "title": model._meta.verbose_name,
+            "title": str(opts.verbose_name),
             "icon": model.menu_icon_class,
             "url": model.get_list_url()
         })
 
-    CASHED_MAIN_MENU = main_menu
-
     return main_menu
 
 
+def get_menu_items(user):
+    """
+    Menu items the user is allowed to see, rendered in the active language
+    and cached per permission set.
+    """
+    if not user.is_authenticated:
+        return []
+
+    return get_or_compute(
+        MENU_CACHE_NAMESPACE, "all",
+        (get_permissions_key(user), translation.get_language()),
+        lambda: build_menu_items(user)
+    )
+
+
 def generics(request):
     context = {
-        "main_menu": get_menu_items()
+        # Only computed when a template renders the menu.
+        "main_menu": SimpleLazyObject(lambda: get_menu_items(request.user))
     }
     return context
@@ -0,0 +1,38 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lava_light import settings as light_settings
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Process wide executor of `EXECUTOR_WORKERS` threads, created on first
+    use so that forked server workers each get their own.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=light_settings.EXECUTOR_WORKERS,
+                    thread_name_prefix="lava_light",
+                )
+    return _executor
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Await `func(*args, **kwargs)` computed by the bounded executor. Meant for
+    CPU-bound work (NumPy releases the GIL), `func` must not use the ORM:
+    load the data with the async ORM first and pass it in.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
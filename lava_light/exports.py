@@ -0,0 +1,125 @@
+import csv
+
+from django.utils import timezone
+from django.utils.text import capfirst
+
+
+class ExportColumn:
+    """
+    An exported column read with `values_list`: forward relations export the
+    first of the related model's `list_str_fields` (or its primary key),
+    choice fields their label and aware datetimes their naive local time.
+    """
+
+    __slots__ = ("field", "lookup", "verbose_name", "convert")
+
+    def __init__(self, field):
+        self.field = field
+        self.verbose_name = capfirst(getattr(field, "verbose_name", field.name))
+        self.lookup = field.name
+        self.convert = None
+
+        if field.is_relation:
+            str_fields = getattr(field.related_model, "list_str_fields", None)
+            if str_fields:
+                self.lookup = f"{field.name}__{str_fields[0]}"
+        elif getattr(field, "choices", None):
+            labels = {value: str(label) for value, label in field.flatchoices}
+            self.convert = lambda value: labels.get(value, value)
+        elif field.get_internal_type() == "DateTimeField":
+            self.convert = lambda value: (
+                timezone.make_naive(value) if value is not None and timezone.is_aware(value)
+                else value
+            )
+
+    def __repr__(self):
+        return "<ExportColumn: %s>" % self.lookup
+
+
+def build_export_columns(fields):
+    """
+    Columns of the concrete `fields`, many-to-many and reverse relations
+    are left out since they have no single value per row.
+    """
+    return tuple(
+        ExportColumn(field) for field in fields
+        if getattr(field, "concrete", False) and not field.many_to_many
+    )
+
+
+def iter_export_rows(queryset, columns, chunk_size):
+    """
+    Value tuples of `queryset` for `columns`, fetched `chunk_size` rows at
+    a time so memory does not grow with the number of rows.
+    """
+    converters = [(index, column.convert) for index, column in enumerate(columns) if column.convert]
+    rows = queryset.values_list(*(column.lookup for column in columns)).iterator(
+        chunk_size=chunk_size
+    )
+    if not converters:
+        yield from rows
+        return
+    for row in rows:
+        row = list(row)
+        for index, convert in converters:
+            row[index] = convert(row[index])
+        yield row
+
+
+# Leading characters that make spreadsheet applications evaluate a cell.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formulas(row):
+    """
+    Prefix the text cells of `row` that start like a formula with a quote,
+    so opening an export never evaluates stored text (CSV injection).
+    Numbers, negative ones included, are left as is.
+    """
+    return [
+        f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES)
+        else value
+        for value in row
+    ]
+
+
+class Echo:
+    """
+    File-like object returning what is written, lets `csv.writer` produce
+    lines for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([str(column.verbose_name) for column in columns])
+    for row in rows:
+        yield writer.writerow(escape_formulas(row))
+
+
+def write_xlsx(columns, rows, file, title=None):
+    """
+    Write `rows` to `file` as an XLSX workbook. The write only mode flushes
+    rows to a temporary file as they are appended, so memory stays flat,
+    but the archive is only complete once every row is written: unlike CSV,
+    an XLSX export is not streamed.
+    """
+    # openpyxl is only needed for XLSX exports.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=title[:31] if title else None)
+    worksheet.append([str(column.verbose_name) for column in columns])
+    for row in rows:
+        # openpyxl would store text starting with "=" as a formula.
+        worksheet.append(escape_formulas(row))
+    workbook.save(file)
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
@@ -1,9 +1,11 @@
+import time
 import logging
 
 from django.apps import apps
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 from lava_light.models import User, Group
 from lava_light import settings as light_settings
@@ -32,83 +34,80 @@ class Command(BaseCommand):
             help="If this argument is set, all permissions will be removed and recreated (This action is irreversible!!).",
         )
 
+    def log(self, message):
+        if not self.no_logs:
+            self.stdout.write(message)
+
+    def get_model_permissions(self, model, content_type):
+        """
+        The `(codename, name)` pairs `model` should have, skipping locked ones.
+        """
+        opts = model._meta
+        if hasattr(model, "_create_default_permissions"):
+            permissions = list(model._create_default_permissions())
+        else:
+            permissions = [
+                (f"{perm}_{opts.model_name}", f"Can {perm} {opts.verbose_name}")
+                for perm in opts.default_permissions
+            ]
+        # Other permissions (From Meta.permissions)
+        permissions.extend((codename, name) for codename, name in opts.permissions)
+
+        for codename, name in permissions:
+            permission_name = f"{content_type.app_label}.{codename}"
+            if permission_name in light_settings.LOCKED_PERMISSIONS["permissions"]:
+                self.log(f"Skipping permission: {permission_name}")
+                continue
+            yield codename, name
+
+    def create_permissions(self):
+        """
+        Diff the permissions every model should have against the existing
+        rows and insert the missing ones at once.
+        """
+        models = apps.get_models()
+        content_types = ContentType.objects.get_for_models(*models)
+
+        desired = {}
+        for model in models:
+            content_type = content_types[model]
+            model_full_name = f"{content_type.app_label}.{model.__name__.lower()}"
+            if model_full_name in light_settings.LOCKED_PERMISSIONS["models"]:
+                self.log(f"Skipping model permissions for: {model_full_name}")
+                continue
+
+            for codename, name in self.get_model_permissions(model, content_type):
+                desired.setdefault((content_type.pk, codename), str(name))
+
+        existing = set(Permission.objects.values_list("content_type_id", "codename"))
+        missing = [
+            Permission(content_type_id=content_type_id, codename=codename, name=name)
+            for (content_type_id, codename), name in desired.items()
+            if (content_type_id, codename) not in existing
+        ]
+        Permission.objects.bulk_create(missing, ignore_conflicts=True)
+        return len(missing)
+
     def handle(self, *args, **options):
-        no_logs = options["no_logs"]
+        self.no_logs = options["no_logs"]
         reset_perms = options["reset_perms"]
         reset_users = options["reset_users"]
+        start = time.perf_counter()
 
+        with transaction.atomic():
+            self.setup(reset_perms, reset_users)
+
+        self.log(f"Setup done in {time.perf_counter() - start:.2f}s.")
+
+    def setup(self, reset_perms, reset_users):
         # Reset permissions:
         if reset_perms:
             logging.info("Resetting all permissions")
             Permission.objects.all().delete()
-        # from django.utils import translation
-        # translation.activate('fr')
-        # print("current lang:", translation.get_language())
-
-        # Create base model default permissions
-        for model in apps.get_models():
-            opts = model._meta
-            content_type = ContentType.objects.get_for_model(model)
-
-            model_full_name = f"{content_type.app_label}.{model.__name__.lower()}"
-            if model_full_name in light_settings.LOCKED_PERMISSIONS["models"]:
-                print("skipping model permissions for:", model_full_name)
-                continue
 
-            if hasattr(model, "_create_default_permissions"):
-                default_permissions = model._create_default_permissions()
-                for code_name, verbose_name in default_permissions:
-
-                    permission_name = f"{content_type.app_label}.{code_name}"
-                    if (
-                        permission_name
-                        in light_settings.LOCKED_PERMISSIONS["permissions"]
-                    ):
-                        print("Skipping permission:", permission_name)
-                        continue
-
-                    Permission.objects.get_or_create(
-                        codename=code_name,
-                        content_type=content_type,
-                        defaults={
-                            "name": verbose_name,
-                        },
-                    )
-            else:
-                # Create other models default permissions
-                for perm in opts.default_permissions:
-                    codename = f"{perm}_{opts.model_name}"
-                    name = f"Can {perm} {opts.verbose_name}"
-
-                    permission_name = f"{content_type.app_label}.{codename}"
-                    if (
-                        permission_name
-                        in light_settings.LOCKED_PERMISSIONS["permissions"]
-                    ):
-                        print("Skipping permission:", permission_name)
-                        continue
-
-                    Permission.objects.get_or_create(
-                        codename=codename,
-                        content_type=content_type,
-                        defaults={"name": name},
-                    )
-
-            # Create other permissions (From Meta.permissions)
-            for perm in opts.permissions:
-                codename = perm[0]
-                name = perm[1]
-
-                permission_name = f"{content_type.app_label}.{codename}"
-                if permission_name in light_settings.LOCKED_PERMISSIONS["permissions"]:
-                    print("Skipping permission:", permission_name)
-                    continue
-
-                Permission.objects.get_or_create(
-                    codename=codename,
-                    content_type=content_type,
-                    defaults={"name": name},
-                )
+        step = time.perf_counter()
+        created = self.create_permissions()
+        self.log(f"{created} permissions created in {time.perf_counter() - step:.2f}s.")
 
         # Create the group 'ADMINS' if it does not exist
         admins_group, _created = Group.objects.get_or_create(
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.contrib.auth.password_validation import validate_password
@@ -15,6 +16,8 @@ from lava_light.utils import (
     Result, generate_password, get_user_photo_filename,
     get_model_fields
 )
+from lava_light.columns import build_list_columns
+from lava_light.exports import build_export_columns
 
 
 class BaseModel(models.Model):
@@ -23,8 +26,21 @@ class BaseModel(models.Model):
         ("__str__", "__model_name__")
     ]
     cashed_list_display_fields = None
+    cashed_list_columns = None
+    # Fields read by `__str__`, lets list views restrict loaded columns.
+    list_str_fields = None
     readonly_fields = []
     menu_icon_class = "anticon anticon-select"
+    # Let DataTables fetch, sort and search the rows from the data endpoint
+    # instead of rendering them in the list page. The endpoint pages with
+    # keyset cursors and never counts the rows.
+    list_server_side = False
+    # Searched with a prefix match, these fields should have `db_index`
+    # (on PostgreSQL it also adds the `LIKE` pattern index).
+    list_search_fields = []
+    # Fields of the CSV/XLSX export, defaults to the list display fields.
+    list_export_fields = None
+    cashed_export_columns = None
 
     class Meta:
         abstract = True
@@ -99,6 +115,20 @@ class BaseModel(models.Model):
         lava_light_app_label = "lava_light"
         return reverse(f'{lava_light_app_label}:{app_label}_{model_name}_list')
 
+    @classmethod
+    def get_data_url(cls):
+        app_label = cls._meta.app_label
+        model_name = cls._meta.model_name.lower()
+        lava_light_app_label = "lava_light"
+        return reverse(f'{lava_light_app_label}:{app_label}_{model_name}_data')
+
+    @classmethod
+    def get_export_url(cls):
+        app_label = cls._meta.app_label
+        model_name = cls._meta.model_name.lower()
+        lava_light_app_label = "lava_light"
+        return reverse(f'{lava_light_app_label}:{app_label}_{model_name}_export')
+
     @classmethod
     def get_create_url(cls):
         app_label = cls._meta.app_label
@@ -129,6 +159,28 @@ class BaseModel(models.Model):
         cls.cashed_list_display_fields = display_fields
         return display_fields
 
+    @classmethod
+    def get_list_columns(cls):
+        if cls.cashed_list_columns is not None:
+            return cls.cashed_list_columns
+
+        cls.cashed_list_columns = build_list_columns(cls.get_list_display())
+        return cls.cashed_list_columns
+
+    @classmethod
+    def get_export_columns(cls):
+        if cls.cashed_export_columns is not None:
+            return cls.cashed_export_columns
+
+        if cls.list_export_fields:
+            fields = [cls._meta.get_field(name) for name in cls.list_export_fields]
+        else:
+            # Lists show the object itself first, exports its `__str__` fields.
+            fields = [cls._meta.get_field(name) for name in cls.list_str_fields or ()]
+            fields += [field for field in cls.get_list_display() if field not in fields]
+        cls.cashed_export_columns = build_export_columns(fields)
+        return cls.cashed_export_columns
+
 
 class User(BaseModel, AbstractUser):
 
@@ -166,9 +218,13 @@ class User(BaseModel, AbstractUser):
     )
 
     def get_all_permissions(self):
-        user_perms_ids = self.user_permissions.all().values_list("id", flat=True)
-        groups_perms_ids = self.groups.all().values_list("permissions__id", flat=True)
-        return Permission.objects.filter(pk__in=[*user_perms_ids, *groups_perms_ids])
+        """
+        Permissions of the user and of their groups, as a `Permission`
+        queryset. Permission checks go through `get_user_permissions`.
+        """
+        return Permission.objects.filter(
+            Q(user=self) | Q(group__user=self)
+        ).distinct()
 
     def create(
         self,
@@ -0,0 +1,152 @@
+import json
+import base64
+import binascii
+
+from django.db.models import Q
+from django.core.exceptions import ValidationError
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    A page of a `KeysetPaginator`. It only knows whether there are more rows
+    before or after it, there is no page number nor total count.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return "<KeysetPage of %s rows>" % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row of the previous page
+    (`WHERE (close_time, id) < (...) ORDER BY close_time DESC, id DESC LIMIT n`)
+    instead of using `OFFSET`, so every page costs the same and no `COUNT(*)`
+    is issued.
+
+    The ordering is taken from the queryset, or the model's `Meta.ordering`,
+    and always ends with the primary key to make it total. Ordering fields
+    must be concrete, non nullable fields of the model.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(ordering)
+        self.fields = [
+            self.model._meta.get_field(name.lstrip("-")) for name in self.ordering
+        ]
+
+    def get_ordering(self, ordering=None):
+        if ordering is None:
+            ordering = self.queryset.query.order_by or self.model._meta.ordering
+        ordering = [str(name) for name in ordering]
+
+        pk_name = self.model._meta.pk.name
+        names = {name.lstrip("-") for name in ordering}
+        if not names & {"pk", pk_name}:
+            descending = ordering[-1].startswith("-") if ordering else False
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+
+        return [
+            name.replace("pk", pk_name) if name.lstrip("-") == "pk" else name
+            for name in ordering
+        ]
+
+    def encode_cursor(self, obj):
+        values = []
+        for field in self.fields:
+            value = getattr(obj, field.attname)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        data = json.dumps(values, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if len(values) != len(self.fields):
+                raise InvalidCursor(cursor)
+            return [
+                field.to_python(value) for field, value in zip(self.fields, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise InvalidCursor(cursor)
+
+    def get_seek_filter(self, values, backwards=False):
+        """
+        Build `(f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...`, with each
+        comparison flipped for descending fields and when going backwards.
+        """
+        seek = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            descending = name.startswith("-")
+            lookup = "lt" if descending != backwards else "gt"
+            field_name = name.lstrip("-")
+            seek |= equal & Q(**{f"{field_name}__{lookup}": value})
+            equal &= Q(**{field_name: value})
+        return seek
+
+    def get_page(self, cursor=None, backwards=False):
+        queryset = self.queryset
+        ordering = self.ordering
+        if backwards:
+            ordering = [
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+
+        if cursor:
+            queryset = queryset.filter(
+                self.get_seek_filter(self.decode_cursor(cursor), backwards)
+            )
+
+        # One extra row tells whether there is another page, without a count.
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        # Coming from a cursor means there are rows on the side we came from.
+        if backwards:
+            has_next, has_previous = bool(cursor), has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1])
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0])
+
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
@@ -0,0 +1,124 @@
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+
+from lava_light.caching import get_cache, get_versions, build_key, get_or_compute
+
+
+# Versions of this namespace are bumped by `lava_light.signals`: the version
+# of a user id when only that user's groups or permissions change, the
+# `PERMISSIONS_SHARED_KEY` version when a change may affect every user.
+PERMISSIONS_CACHE_NAMESPACE = "permissions"
+
+PERMISSIONS_SHARED_KEY = "all"
+
+
+def _permission_names(rows):
+    return frozenset(f"{app_label}.{codename}" for app_label, codename in rows)
+
+
+def get_all_permission_names():
+    return get_or_compute(
+        PERMISSIONS_CACHE_NAMESPACE, PERMISSIONS_SHARED_KEY, ("superuser",),
+        lambda: _permission_names(
+            Permission.objects.values_list("content_type__app_label", "codename")
+        )
+    )
+
+
+def load_permissions(user_ids):
+    """
+    Direct and group permissions of `user_ids`, in a single joined query.
+    Returns `{user_id: frozenset("app_label.codename", ...)}`.
+    """
+    user_ids = list(user_ids)
+    permissions = {user_id: set() for user_id in user_ids}
+    if not user_ids:
+        return {}
+
+    rows = Permission.objects.filter(
+        Q(user__id__in=user_ids) | Q(group__user__id__in=user_ids)
+    ).values_list(
+        "content_type__app_label", "codename", "user__id", "group__user__id"
+    ).distinct()
+    for app_label, codename, user_id, group_user_id in rows:
+        name = f"{app_label}.{codename}"
+        # The OR join may return a user's group permissions along with
+        # another user's direct ones on the same row.
+        if user_id in permissions:
+            permissions[user_id].add(name)
+        if group_user_id in permissions:
+            permissions[group_user_id].add(name)
+    return {user_id: frozenset(names) for user_id, names in permissions.items()}
+
+
+def _user_keys(user_ids):
+    """
+    Cache keys of the permissions of `user_ids`, at the version of each
+    user and the shared version, all read in one cache lookup.
+    """
+    versions = get_versions(PERMISSIONS_CACHE_NAMESPACE, [PERMISSIONS_SHARED_KEY, *user_ids])
+    shared_version = versions[PERMISSIONS_SHARED_KEY]
+    return {
+        user_id: build_key(
+            PERMISSIONS_CACHE_NAMESPACE, user_id, versions[user_id], "user", shared_version
+        )
+        for user_id in user_ids
+    }
+
+
+def get_users_permissions(users):
+    """
+    Batch version of `get_user_permissions`: one cache lookup for the
+    versions of all `users`, one for their permissions and one query for
+    those missing from the cache.
+    """
+    users = list(users)
+    result = {}
+    regular = []
+    for user in users:
+        if not user.is_active or getattr(user, "is_anonymous", False):
+            result[user.pk] = frozenset()
+        elif user.is_superuser:
+            result[user.pk] = get_all_permission_names()
+        else:
+            regular.append(user)
+
+    if regular:
+        cache = get_cache()
+        keys = _user_keys([user.pk for user in regular])
+        cached = cache.get_many(keys.values())
+        missing = []
+        for user in regular:
+            if keys[user.pk] in cached:
+                result[user.pk] = cached[keys[user.pk]]
+            else:
+                missing.append(user.pk)
+
+        loaded = load_permissions(missing)
+        cache.set_many({keys[user_id]: names for user_id, names in loaded.items()})
+        result.update(loaded)
+
+    for user in users:
+        user._lava_permissions = result[user.pk]
+    return result
+
+
+def get_user_permissions(user):
+    """
+    Every permission of `user` as a frozenset of "app_label.codename",
+    cached per user until groups or permissions change, and memoized on the
+    user instance for the rest of the request.
+    """
+    if not hasattr(user, "_lava_permissions"):
+        get_users_permissions([user])
+    return user._lava_permissions
+
+
+def users_with_perm(users, perm):
+    """
+    The subset of `users` having `perm`, resolved in one batch.
+    """
+    users = list(users)
+    permissions = get_users_permissions(users)
+    return [user for user in users if perm in permissions[user.pk]]
+
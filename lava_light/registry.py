@@ -0,0 +1,54 @@
+import importlib
+
+
+class ClassRegistry:
+    """
+    Build each model's generated classes (views, forms) once and keep them.
+
+    Entries are keyed by `(model label, kind)`, a kind being a view class
+    suffix such as "ListView", or `("Form", action, fields)` for forms.
+    Use `items()` to inspect what has been built.
+    """
+
+    def __init__(self):
+        self._classes = {}
+        self._modules = {}
+
+    def import_app_module(self, app_label, module_name):
+        """
+        Import `<app_label>.<module_name>` once, failed imports are remembered
+        and return None.
+        """
+        key = (app_label, module_name)
+        if key not in self._modules:
+            try:
+                self._modules[key] = importlib.import_module(f"{app_label}.{module_name}")
+            except ImportError:
+                self._modules[key] = None
+        return self._modules[key]
+
+    def get_custom_class(self, model, module_name, suffix):
+        """
+        Return `<ModelName><suffix>` from the model's app `module_name`
+        module if the app defines one.
+        """
+        module = self.import_app_module(model._meta.app_label, module_name)
+        if module is None:
+            return None
+        return getattr(module, f"{model._meta.object_name}{suffix}", None)
+
+    def get_or_build(self, model, kind, build):
+        key = (model._meta.label, kind)
+        if key not in self._classes:
+            self._classes[key] = build()
+        return self._classes[key]
+
+    def items(self):
+        return list(self._classes.items())
+
+    def clear(self):
+        self._classes.clear()
+        self._modules.clear()
+
+
+registry = ClassRegistry()
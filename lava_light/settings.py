@@ -1,3 +1,5 @@
+import os
+
 from django.conf import settings
 
 
@@ -11,3 +13,18 @@ LOCKED_PERMISSIONS = getattr(settings, "LOCKED_PERMISSIONS", {
 })
 
 MAIN_MENU_ITEMS = getattr(settings, "MAIN_MENU_ITEMS", [])
+
+# Cache alias used by `lava_light.caching`.
+CACHE_ALIAS = getattr(settings, "LIGHT_CACHE_ALIAS", "default")
+
+# Versioned entries never go stale, the timeout only bounds their lifetime.
+CACHE_TIMEOUT = getattr(settings, "LIGHT_CACHE_TIMEOUT", 24 * 60 * 60)
+
+# Dotted path of a `function(request)` returning extra context for the home
+# page, and the template rendering it.
+HOME_CONTEXT_PROVIDER = getattr(settings, "LIGHT_HOME_CONTEXT_PROVIDER", None)
+HOME_TEMPLATE_NAME = getattr(settings, "LIGHT_HOME_TEMPLATE_NAME", "lava_light/home.html")
+
+# Threads of the bounded executor running CPU-bound work off the event loop of
+# async views, see `lava_light.executors`.
+EXECUTOR_WORKERS = getattr(settings, "LIGHT_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1))
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from lava_light.caching import bump_version, bump_versions
+from lava_light.permissions import PERMISSIONS_CACHE_NAMESPACE, PERMISSIONS_SHARED_KEY
+from lava_light.models import User
+
+
+def invalidate_permissions(user_ids=None):
+    """
+    Invalidate the cached permissions of `user_ids`, or of every user.
+    """
+    if user_ids is None:
+        bump_version(PERMISSIONS_CACHE_NAMESPACE, PERMISSIONS_SHARED_KEY)
+    elif user_ids:
+        bump_versions(PERMISSIONS_CACHE_NAMESPACE, user_ids)
+
+
+def get_group_user_ids(group_ids):
+    return list(
+        User.objects.filter(groups__in=group_ids).values_list("pk", flat=True).distinct()
+    )
+
+
+def user_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    `User.groups` and `User.user_permissions` changes only affect the users
+    involved: the instance, or the users of `pk_set` from the reverse side.
+    """
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_permissions([instance.pk])
+    elif pk_set is not None:
+        invalidate_permissions(list(pk_set))
+    else:
+        # A reverse `clear()` does not tell which users were removed.
+        invalidate_permissions()
+
+
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    `Group.permissions` changes affect the users of the groups involved.
+    """
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_permissions(get_group_user_ids([instance.pk]))
+    elif pk_set is not None:
+        invalidate_permissions(get_group_user_ids(pk_set))
+    else:
+        invalidate_permissions()
+
+
+for through in (User.groups.through, User.user_permissions.through):
+    m2m_changed.connect(
+        user_relations_changed, sender=through,
+        dispatch_uid=f"lava_light_permissions_{through._meta.label}"
+    )
+
+m2m_changed.connect(
+    group_permissions_changed, sender=Group.permissions.through,
+    dispatch_uid=f"lava_light_permissions_{Group.permissions.through._meta.label}"
+)
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+@receiver(post_save, sender=Permission)
+def permissions_changed(sender, **kwargs):
+    invalidate_permissions()
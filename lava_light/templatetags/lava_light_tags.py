@@ -1,17 +1,42 @@
 from django import template
+from django.db.models import Manager
 
 register = template.Library()
 
 
+@register.filter(name="get_field_label")
+def get_field_label(field):
+    if isinstance(field, tuple):
+        field = field[0]
+
+    if field.auto_created and not field.concrete:
+        # Reverse relations have no verbose name of their own.
+        if field.one_to_one:
+            return field.related_model._meta.verbose_name
+        return field.related_model._meta.verbose_name_plural
+    return field.verbose_name
+
+
 @register.filter(name="get_field_value")
 def get_field_value(obj, field):
     if isinstance(field, tuple):
         field = field[0]
 
+    if field.auto_created and not field.concrete:
+        # Reverse relations are not loaded with the object, a reverse foreign
+        # key may hold any number of rows: only their count is shown.
+        accessor = field.get_accessor_name()
+        if field.one_to_one:
+            related = getattr(obj, accessor, None)
+            return related if related is not None else "-----"
+        return getattr(obj, accessor).count()
+
     if hasattr(obj, field.name):
         attr = getattr(obj, field.name, "-----")
+        if isinstance(attr, Manager):
+            # Related managers read from the `prefetch_related` cache.
+            return ", ".join(str(related) for related in attr.all()) or "-----"
         if callable(attr):
-            print("callable:", attr)
             return attr()
         return attr
     return "-----"
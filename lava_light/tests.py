@@ -1,3 +1,327 @@
-from django.test import TestCase
+from datetime import datetime
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone, translation
+
+from lava_light.caching import (
+    get_cache,
+    get_version,
+    bump_version,
+    get_versions,
+    make_key,
+    get_or_compute
+)
+from lava_light import settings as light_settings
+from lava_light.context_processors import build_menu_items, generics, get_menu_items
+from lava_light.exports import escape_formulas
+from lava_light.models import User
+from lava_light.pagination import InvalidCursor, KeysetPaginator
+from lava_light.registry import ClassRegistry, registry
+from lava_light.permissions import PERMISSIONS_CACHE_NAMESPACE, get_user_permissions
+from lava_light.views.generic_views import (
+    get_create_view,
+    get_list_view,
+    get_sortable_fields,
+    get_update_view
+)
+
+
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+class KeysetPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        date_joined = timezone.make_aware(datetime(2026, 1, 1))
+        # Rows sharing `date_joined` make the primary key tie breaker matter.
+        User.objects.bulk_create(
+            User(
+                username=f"user{index:02d}", last_name=f"L{index % 3}",
+                first_name=f"F{index}", date_joined=date_joined.replace(day=1 + index % 4)
+            )
+            for index in range(25)
+        )
+
+    def walk(self, paginator, cursor=None, backwards=False):
+        pages = []
+        while True:
+            page = paginator.get_page(cursor, backwards=backwards)
+            pages.append([user.pk for user in page])
+            cursor = page.previous_cursor if backwards else page.next_cursor
+            if cursor is None:
+                return pages, page
+
+    def test_pages_follow_the_ordering(self):
+        expected = list(User.objects.order_by(
+            "-date_joined", "last_name", "first_name", "pk"
+        ).values_list("pk", flat=True))
+        pages, last_page = self.walk(KeysetPaginator(User.objects.all(), 10))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), expected)
+        self.assertFalse(last_page.has_next())
+        self.assertTrue(last_page.has_previous())
+
+    def test_pages_backwards(self):
+        paginator = KeysetPaginator(User.objects.order_by("username"), 10)
+        first_page = paginator.get_page()
+        self.assertFalse(first_page.has_previous())
+        _pages, last_page = self.walk(paginator)
+
+        pages, first_again = self.walk(paginator, last_page.previous_cursor, backwards=True)
+        expected = list(User.objects.order_by("username").values_list("pk", flat=True))
+        self.assertEqual(sum(reversed(pages), []), expected[:20])
+        self.assertFalse(first_again.has_previous())
+        self.assertEqual(list(first_again), list(first_page))
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), 10)
+        for cursor in ("garbage", "WzFd", "WyJ4IiwiYSIsImIiLDFd"):
+            with self.assertRaises(InvalidCursor):
+                paginator.get_page(cursor)
+
+    def test_sortable_fields(self):
+        sortable = get_sortable_fields(User)
+
+        self.assertIn("id", sortable)
+        self.assertIn("username", sortable)
+        self.assertNotIn("first_name", sortable)
+        self.assertNotIn("photo", sortable)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CachingTests(SimpleTestCase):
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_bump_version_invalidates_entries(self):
+        self.assertEqual(get_or_compute("test", 1, ("value",), lambda: "old"), "old")
+        self.assertEqual(get_or_compute("test", 1, ("value",), lambda: "new"), "old")
+
+        bump_version("test", 1)
+        self.assertEqual(get_or_compute("test", 1, ("value",), lambda: "new"), "new")
+
+    def test_lost_version_does_not_resurrect_entries(self):
+        key = make_key("test", 1, "value")
+        get_cache().set(key, "stale")
+        bump_version("test", 1)
+        get_cache().delete("lava_light:version:test:1")
+
+        self.assertNotEqual(make_key("test", 1, "value"), key)
+
+    def test_get_versions(self):
+        bump_version("test", 2)
+        versions = get_versions("test", [1, 2])
+
+        self.assertEqual(versions, {1: get_version("test", 1), 2: get_version("test", 2)})
+        self.assertNotEqual(versions[1], versions[2])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class PermissionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.permissions = list(Permission.objects.filter(
+            content_type__app_label="lava_light"
+        ).order_by("pk")[:2])
+        cls.group = Group.objects.create(name="Editors")
+        cls.member = User.objects.create(username="member")
+        cls.member.groups.add(cls.group)
+        cls.other = User.objects.create(username="other")
+
+    def setUp(self):
+        get_cache().clear()
+
+    def get_permissions(self, user):
+        # A fresh instance, permissions are memoized on the user.
+        return get_user_permissions(User.objects.get(pk=user.pk))
+
+    def name(self, permission):
+        return f"{permission.content_type.app_label}.{permission.codename}"
+
+    def test_user_permission_change_only_bumps_that_user(self):
+        other_version = get_version(PERMISSIONS_CACHE_NAMESPACE, self.other.pk)
+        self.assertEqual(self.get_permissions(self.member), frozenset())
+
+        self.member.user_permissions.add(self.permissions[0])
+        self.assertEqual(self.get_permissions(self.member), {self.name(self.permissions[0])})
+        self.assertEqual(
+            get_version(PERMISSIONS_CACHE_NAMESPACE, self.other.pk), other_version
+        )
+
+    def test_group_permission_change_reaches_members(self):
+        self.assertEqual(self.get_permissions(self.member), frozenset())
+        self.assertEqual(self.get_permissions(self.other), frozenset())
+
+        self.group.permissions.add(self.permissions[1])
+        self.assertEqual(self.get_permissions(self.member), {self.name(self.permissions[1])})
+        self.assertEqual(self.get_permissions(self.other), frozenset())
+
+        self.group.users.remove(self.member)
+        self.assertEqual(self.get_permissions(self.member), frozenset())
+
+    def test_get_all_permissions_is_a_queryset(self):
+        self.member.user_permissions.add(self.permissions[0])
+        self.group.permissions.add(*self.permissions)
+        permissions = self.member.get_all_permissions()
+
+        self.assertIsInstance(permissions, QuerySet)
+        self.assertEqual(list(permissions.order_by("pk")), self.permissions)
+
+
+
+@override_settings(CACHES=TEST_CACHES)
+class MenuTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.menu_model = apps.get_model(light_settings.MAIN_MENU_ITEMS[0])
+        cls.permission = Permission.objects.get(
+            content_type=ContentType.objects.get_for_model(cls.menu_model),
+            codename=f"view_{cls.menu_model._meta.model_name}"
+        )
+        cls.first = User.objects.create(username="first")
+        cls.second = User.objects.create(username="second")
+
+    def setUp(self):
+        get_cache().clear()
+
+    def get_menu_items(self, user):
+        return get_menu_items(User.objects.get(pk=user.pk))
+
+    def get_titles(self, user):
+        return [item["title"] for item in self.get_menu_items(user)]
+
+    def test_anonymous_user_has_no_menu(self):
+        self.assertEqual(get_menu_items(AnonymousUser()), [])
+
+    def test_menu_follows_permissions(self):
+        title = str(self.menu_model._meta.verbose_name)
+        self.assertEqual(self.get_titles(self.first), ["Tableau de bord"])
+
+        self.first.user_permissions.add(self.permission)
+        self.assertEqual(self.get_titles(self.first), ["Tableau de bord", title])
+        self.assertEqual(self.get_titles(self.second), ["Tableau de bord"])
+
+    def test_menu_is_shared_by_permission_set_and_language(self):
+        with mock.patch(
+            "lava_light.context_processors.build_menu_items", wraps=build_menu_items
+        ) as build:
+            self.get_menu_items(self.first)
+            self.get_menu_items(self.second)
+            self.assertEqual(build.call_count, 1)
+
+            with translation.override("fr"):
+                self.get_menu_items(self.first)
+            self.assertEqual(build.call_count, 2)
+
+    def test_context_value_is_lazy(self):
+        request = RequestFactory().get("/")
+        request.user = self.first
+        with mock.patch(
+            "lava_light.context_processors.build_menu_items", return_value=[]
+        ) as build:
+            context = generics(request)
+            build.assert_not_called()
+
+            self.assertEqual(list(context["main_menu"]), [])
+            build.assert_called_once()
+
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SetupCommandTests(TestCase):
+
+    def call_setup(self):
+        stdout = StringIO()
+        call_command("light_setup", stdout=stdout)
+        return stdout.getvalue()
+
+    def test_missing_permissions_are_created(self):
+        self.call_setup()
+        permissions = set(Permission.objects.values_list("content_type_id", "codename"))
+        deleted = Permission.objects.filter(content_type__app_label="lava_light")
+        count = deleted.count()
+        deleted.delete()
+
+        self.assertIn(f"{count} permissions created", self.call_setup())
+        self.assertEqual(
+            set(Permission.objects.values_list("content_type_id", "codename")), permissions
+        )
+        self.assertIn("0 permissions created", self.call_setup())
+
+        admins = Group.objects.get(name="ADMINISTRATOR")
+        self.assertEqual(admins.permissions.count(), len(permissions))
+        self.assertTrue(User.objects.filter(username="superuser", is_superuser=True).exists())
+        self.assertTrue(User.objects.filter(username="admin", groups=admins).exists())
+
+    def test_locked_permissions_are_skipped(self):
+        Permission.objects.filter(content_type__app_label="lava_light").delete()
+        locked = {"models": ["lava_light.group"], "permissions": ["lava_light.view_user"]}
+        with mock.patch.object(light_settings, "LOCKED_PERMISSIONS", locked):
+            self.call_setup()
+
+        codenames = set(Permission.objects.filter(
+            content_type__app_label="lava_light"
+        ).values_list("codename", flat=True))
+        self.assertIn("change_user", codenames)
+        self.assertNotIn("view_user", codenames)
+        self.assertFalse({"view_group", "change_group"} & codenames)
+
+
+class ExportTests(SimpleTestCase):
+
+    def test_escape_formulas(self):
+        row = ["=1+2", "+33 6", "-x", "@SUM(A1)", "plain", -12, 3.5, None]
+
+        self.assertEqual(
+            escape_formulas(row),
+            ["'=1+2", "'+33 6", "'-x", "'@SUM(A1)", "plain", -12, 3.5, None]
+        )
+
+
+class RegistryTests(SimpleTestCase):
+
+    def test_classes_are_built_once(self):
+        list_view = get_list_view(User)
+
+        self.assertIs(get_list_view(User), list_view)
+        self.assertIs(list_view.model, User)
+        self.assertEqual(list_view.paginate_by, 20)
+        self.assertIn(((User._meta.label, "ListView"), list_view), registry.items())
+
+        update_view = get_update_view(User)
+        self.assertIs(get_update_view(User).form_class, update_view.form_class)
+        self.assertIs(update_view.form_class._meta.model, User)
+        self.assertEqual(update_view.form_class.form_action, "update")
+        self.assertIsNot(get_create_view(User).form_class, update_view.form_class)
+
+    def test_failed_imports_are_remembered(self):
+        classes = ClassRegistry()
+        with mock.patch(
+            "lava_light.registry.importlib.import_module", side_effect=ImportError
+        ) as import_module:
+            self.assertIsNone(classes.get_custom_class(User, "missing", "View"))
+            self.assertIsNone(classes.get_custom_class(User, "missing", "Form"))
+
+        import_module.assert_called_once_with("lava_light.missing")
+
+    def test_custom_classes(self):
+        classes = ClassRegistry()
+        module = SimpleNamespace(UserListView=object)
+        with mock.patch("lava_light.registry.importlib.import_module", return_value=module):
+            self.assertIs(classes.get_custom_class(User, "views", "ListView"), object)
+            self.assertIsNone(classes.get_custom_class(User, "views", "DetailView"))
@@ -3,7 +3,7 @@ from django.apps import apps
 
 from lava_light.views import (
     get_list_view, get_detail_view,
-    get_update_view, get_create_view,
+    get_update_view, get_create_view, get_data_view, get_export_view,
     HomeView, NotificationsView,
     SignupView, LoginView, LogoutView,
     PasswordReset
@@ -32,6 +32,14 @@ for model_name in light_settings.MAIN_MENU_ITEMS:
             f'{app_label}/{model_name}/',
             get_list_view(model).as_view(), name=f'{app_label}_{model_name}_list'
         ),
+        path(
+            f'{app_label}/{model_name}/data/',
+            get_data_view(model).as_view(), name=f'{app_label}_{model_name}_data'
+        ),
+        path(
+            f'{app_label}/{model_name}/export/',
+            get_export_view(model).as_view(), name=f'{app_label}_{model_name}_export'
+        ),
         path(
             f'{app_label}/{model_name}/create/',
             get_create_view(model).as_view(), name=f'{app_label}_{model_name}_create'
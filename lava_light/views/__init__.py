@@ -6,7 +6,8 @@ from .main_views import (
 
 from .generic_views import (
     ProtectedBaseViewMixin, BaseProtectedModelViewMixin,
-    ListView, DetailView, CreateView, UpdateView,
-    ProtectedRedirectView, ProtectedTemplateView,
+    ListView, DetailView, CreateView, UpdateView, DataTableView, ExportView,
+    ProtectedRedirectView, ProtectedTemplateView, AsyncProtectedView,
     get_list_view, get_detail_view, get_create_view, get_update_view,
+    get_data_view, get_export_view,
 )
\ No newline at end of file
@@ -1,33 +1,65 @@
-import importlib
-
+import json
+import tempfile
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.html import conditional_escape, format_html
 from django.views.generic import (
     DetailView as BaseDetailView,
     ListView as BaseListView,
     UpdateView as BaseUpdateView,
     CreateView as BaseCreateView,
-    TemplateView, RedirectView
+    TemplateView, RedirectView, View
 )
+from django.views.generic.list import MultipleObjectMixin
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.utils.decorators import method_decorator
 
 from lava_light.utils import Result
 from lava_light.forms import get_model_form
+from lava_light.registry import registry
+from lava_light.pagination import KeysetPaginator, InvalidCursor
+from lava_light.columns import build_list_columns, render_rows
+from lava_light.exports import (
+    EXPORT_FORMATS,
+    build_export_columns,
+    iter_export_rows,
+    stream_csv,
+    write_xlsx
+)
 
 
 def try_import_view(model, model_view_suffix="View"):
+    return registry.get_custom_class(model, "views", model_view_suffix)
 
-    try:
-        app_label = model._meta.app_label
-        model_name = model._meta.model.__name__
-        views_module = importlib.import_module(f"{app_label}.views")
-        CustomModelListView = getattr(
-            views_module, "%s%s" % (model_name, model_view_suffix)
-        )
-        return CustomModelListView
-    except (ImportError, AttributeError) as e:
-        return None
+
+def build_model_view(model, base_class, **attrs):
+    """
+    Subclass `base_class` for `model`, with the model and the other
+    view settings as class attributes.
+    """
+    attrs.update(model=model, __module__=__name__)
+    return type(f"Generic{model._meta.object_name}{base_class.__name__}", (base_class,), attrs)
+
+
+def get_model_view(model, suffix, base_class, **attrs):
+
+    # Check if the model has a custom view first
+    custom_view = try_import_view(model, suffix)
+    if custom_view:
+        return custom_view
+
+    # Otherwise, create a generic view
+    return registry.get_or_build(
+        model, suffix, lambda: build_model_view(model, base_class, **attrs)
+    )
 
 
 class BaseViewMixin:
@@ -59,9 +91,41 @@ class BaseViewMixin:
 
 class ProtectedBaseViewMixin(BaseViewMixin):
 
+    # Optional permission required on top of the login.
+    permission_required = None
+
     @method_decorator(login_required)
-    def dispatch(self, *args, **kwargs):
-        return super().dispatch(*args, **kwargs)
+    def dispatch(self, request, *args, **kwargs):
+        if self.permission_required and not request.user.has_perm(self.permission_required):
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+
+class AsyncProtectedView(View):
+    """
+    Base of the async views: the same login requirement as
+    `ProtectedBaseViewMixin`, plus an optional `permission_required`, both
+    resolved off the event loop. Subclasses define async handlers only.
+    """
+
+    permission_required = None
+
+    def has_access(self, request):
+        """
+        None for anonymous users, else whether the user may see the view.
+        """
+        user = request.user
+        if not user.is_authenticated:
+            return None
+        return self.permission_required is None or user.has_perm(self.permission_required)
+
+    async def dispatch(self, request, *args, **kwargs):
+        access = await sync_to_async(self.has_access)(request)
+        if access is None:
+            return redirect_to_login(request.get_full_path())
+        if not access:
+            raise PermissionDenied
+        return await super().dispatch(request, *args, **kwargs)
 
 
 class ProtectedTemplateView(ProtectedBaseViewMixin, TemplateView):
@@ -85,24 +149,318 @@ class BaseProtectedModelViewMixin(ProtectedBaseViewMixin):
         return context
 
 
-class ListView(BaseProtectedModelViewMixin, BaseListView):
+def get_list_fields(model):
+    if hasattr(model, "get_list_display"):
+        return model.get_list_display()
+    return model._meta.get_fields(include_parents=True)
+
+
+def get_list_columns(model):
+    if hasattr(model, "get_list_columns"):
+        return model.get_list_columns()
+    return build_list_columns(get_list_fields(model))
+
+
+def get_export_columns(model):
+    if hasattr(model, "get_export_columns"):
+        return model.get_export_columns()
+    return build_export_columns(get_list_fields(model))
+
+
+def get_search_filter(model, term, max_length=64):
+    """
+    Bounded search: only the model's `list_search_fields` are searched,
+    with a case-sensitive `startswith`, a `LIKE 'term%'` prefix match that
+    the indexes of those fields can serve.
+    """
+    term = term.strip()[:max_length]
+    search_fields = getattr(model, "list_search_fields", [])
+    if not term or not search_fields:
+        return None
+
+    search = Q()
+    for field_name in search_fields:
+        search |= Q(**{f"{field_name}__startswith": term})
+    return search
+
+
+def get_sortable_fields(model):
+    """
+    Names of the fields a list can be ordered by with an index: the primary
+    key, unique and indexed fields, and the leading field of the model's
+    indexes and unique constraints. Relations (ordered by the related
+    model's ordering) and nullable fields (which keyset pagination cannot
+    seek on) are left out.
+    """
+    opts = model._meta
+    names = set()
+    for index in [*opts.indexes, *opts.constraints]:
+        fields = getattr(index, "fields", None)
+        if fields and getattr(index, "condition", None) is None:
+            names.add(fields[0].lstrip("-"))
+
+    sortable = set()
+    for field in opts.concrete_fields:
+        if field.is_relation or field.null:
+            continue
+        if field.primary_key or field.unique or field.db_index or field.name in names:
+            sortable.add(field.name)
+    return sortable
+
+
+def plan_queryset(queryset, fields, restrict_columns=False):
+    """
+    Load the relations displayed in `fields` along with the queryset:
+    forward foreign keys are joined with `select_related`, reverse and
+    many-to-many relations are fetched with `prefetch_related`.
+
+    With `restrict_columns`, only the displayed columns, the ordering and the
+    model's `list_str_fields` (the fields used by `__str__`) are loaded.
+    Models without `list_str_fields` always load every column.
+    """
+    model = queryset.model
+    select_related = []
+    prefetch_related = []
+    only_fields = {model._meta.pk.name}
+
+    for field in fields:
+        if not getattr(field, "is_relation", False):
+            if getattr(field, "concrete", False):
+                only_fields.add(field.name)
+            continue
+
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            select_related.append(field.name)
+            only_fields.add(field.name)
+            related_str_fields = getattr(field.related_model, "list_str_fields", None)
+            if related_str_fields is not None:
+                only_fields.update(f"{field.name}__{name}" for name in related_str_fields)
+        elif field.many_to_many and field.concrete:
+            prefetch_related.append(field.name)
+        else:
+            prefetch_related.append(field.get_accessor_name())
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    str_fields = getattr(model, "list_str_fields", None)
+    if restrict_columns and str_fields is not None:
+        ordering = queryset.query.order_by or model._meta.ordering
+        only_fields.update(name.lstrip("-") for name in ordering if name.lstrip("-") != "pk")
+        queryset = queryset.only(*only_fields, *str_fields)
+    return queryset
+
+
+class QueryPlanningMixin:
+    """
+    Plan `select_related`, `prefetch_related` and `only` from the displayed
+    fields, so rendering a page does not issue one query per row and relation.
+    """
+
+    restrict_columns = True
+
+    def get_planned_fields(self):
+        return get_list_fields(self.model)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return plan_queryset(queryset, self.get_planned_fields(), self.restrict_columns)
+
+
+class ListView(BaseProtectedModelViewMixin, QueryPlanningMixin, BaseListView):
 
     generic_template_name = "lava_light/generics/list.html"
     paginate_by = 10
 
+    def is_server_side(self):
+        return getattr(self.model, "list_server_side", False)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.is_server_side():
+            # Rows are fetched by DataTables from the data endpoint.
+            return queryset.none()
+        return queryset
+
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        available_fields = self.model._meta.get_fields(include_parents=True)
-        if hasattr(self.model, "get_list_display"):
-            available_fields = self.model.get_list_display()
-        context["model_fields"] = available_fields
+        columns = get_list_columns(self.model)
+        context["model_fields"] = get_list_fields(self.model)
+        context["list_columns"] = columns
+        context["rows"] = render_rows(context["object_list"], columns)
         context["view"] = "list"
+        context["export_url"] = self.model.get_export_url()
+        if self.is_server_side():
+            context["data_url"] = self.model.get_data_url()
+            sortable = get_sortable_fields(self.model)
+            context["unsortable_columns"] = [0, *(
+                index for index, column in enumerate(columns, start=1)
+                if getattr(column.field, "name", None) not in sortable
+            )]
         return context
 
 
-class DetailView(BaseProtectedModelViewMixin, BaseDetailView):
+class DataTableView(ProtectedBaseViewMixin, QueryPlanningMixin, MultipleObjectMixin, View):
+    """
+    Answer DataTables' server-side processing requests
+    (draw/length/order/search) for the list display columns of a model.
+    The first column is the object itself, linked to its detail page.
+
+    Pages are fetched with a `KeysetPaginator`: the response carries the
+    `next` and `previous` cursors, which the list page sends back as
+    `cursor`/`direction`. No `COUNT(*)` is issued, the record counts only
+    tell DataTables whether there is a next page.
+    """
+
+    max_length = 100
+    max_search_length = 64
+    chunk_size = 100
+    cursor_kwarg = "cursor"
+    direction_kwarg = "direction"
+
+    def get_columns(self):
+        return [None, *get_list_columns(self.model)]
+
+    def get_int(self, name, default=0):
+        try:
+            return int(self.request.GET.get(name, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_search_filter(self):
+        return get_search_filter(
+            self.model, self.request.GET.get("search[value]", ""), self.max_search_length
+        )
+
+    def get_ordering(self):
+        """
+        The first requested column when it is index-backed (see
+        `get_sortable_fields`), else the model ordering.
+        """
+        columns = self.get_columns()
+        column = self.get_int("order[0][column]", -1)
+        if 0 < column < len(columns):
+            field = columns[column].field
+            if getattr(field, "name", None) in get_sortable_fields(self.model):
+                descending = self.request.GET.get("order[0][dir]") == "desc"
+                return [f"-{field.name}" if descending else field.name]
+        return list(self.model._meta.ordering)
+
+    def render_row(self, obj, columns):
+        row = [format_html('<a href="{}">{}</a>', obj.get_absolute_url(), obj)]
+        for column in columns:
+            row.append(conditional_escape(column.render(obj)))
+        return row
+
+    def stream(self, draw, filtered, page):
+        columns = self.get_columns()[1:]
+        yield '{"draw":%d,"recordsTotal":%d,"recordsFiltered":%d,' % (draw, filtered, filtered)
+        yield '"next":%s,"previous":%s,"data":[' % (
+            json.dumps(page.next_cursor), json.dumps(page.previous_cursor)
+        )
+        for index, obj in enumerate(page):
+            row = json.dumps(
+                self.render_row(obj, columns), cls=DjangoJSONEncoder, separators=(",", ":")
+            )
+            yield f",{row}" if index else row
+        yield "]}"
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        search = self.get_search_filter()
+        if search is not None:
+            queryset = queryset.filter(search)
+
+        length = self.get_int("length", self.max_length)
+        if not 0 < length <= self.max_length:
+            length = self.max_length
+
+        paginator = KeysetPaginator(queryset, length, self.get_ordering())
+        cursor = request.GET.get(self.cursor_kwarg)
+        backwards = request.GET.get(self.direction_kwarg) == "previous"
+        try:
+            page = paginator.get_page(cursor, backwards=backwards)
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        # DataTables enables "next" while `start + length < recordsFiltered`.
+        filtered = max(self.get_int("start"), 0) + len(page) + int(page.has_next())
+        return StreamingHttpResponse(
+            self.stream(self.get_int("draw"), filtered, page),
+            content_type="application/json",
+        )
+
+
+class ExportView(ProtectedBaseViewMixin, MultipleObjectMixin, View):
+    """
+    Export the model's rows, filtered by the `search` term of the list page,
+    as CSV or XLSX (`format`). Rows are read as value tuples in chunks, so
+    memory stays constant whatever the number of rows. CSV is streamed as
+    rows are read, XLSX is written to a temporary file and sent once complete.
+    """
+
+    chunk_size = 2000
+    max_search_length = 64
+    format_kwarg = "format"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search = get_search_filter(
+            self.model, self.request.GET.get("search", ""), self.max_search_length
+        )
+        if search is not None:
+            queryset = queryset.filter(search)
+
+        ordering = list(queryset.query.order_by or self.model._meta.ordering)
+        pk_name = self.model._meta.pk.name
+        if not {name.lstrip("-") for name in ordering} & {"pk", pk_name}:
+            ordering.append(pk_name)
+        return queryset.order_by(*ordering)
+
+    def get_filename(self, export_format):
+        opts = self.model._meta
+        return f"{opts.app_label}_{opts.model_name}_{timezone.localdate():%Y%m%d}.{export_format}"
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get(self.format_kwarg, "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise Http404("Unknown export format.")
+
+        columns = get_export_columns(self.model)
+        rows = iter_export_rows(self.get_queryset(), columns, self.chunk_size)
+        filename = self.get_filename(export_format)
+        if export_format == "xlsx":
+            # XLSX is a zip archive whose index is written last, it is built
+            # in a temporary file first.
+            file = tempfile.TemporaryFile()
+            write_xlsx(columns, rows, file, title=str(self.model._meta.verbose_name_plural))
+            file.seek(0)
+            return FileResponse(
+                file, as_attachment=True, filename=filename,
+                content_type=EXPORT_FORMATS[export_format],
+            )
+
+        response = StreamingHttpResponse(
+            stream_csv(columns, rows), content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class DetailView(BaseProtectedModelViewMixin, QueryPlanningMixin, BaseDetailView):
 
     template_name = "lava_light/generics/detail.html"
+    restrict_columns = False
+
+    def get_planned_fields(self):
+        # Only the forward relations are loaded with the object. Reverse
+        # relations can hold any number of rows, the table only counts them.
+        return [
+            field for field in self.model._meta.get_fields(include_parents=True)
+            if field.concrete
+        ]
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
@@ -146,79 +504,33 @@ class UpdateView(BaseProtectedModelViewMixin, BaseUpdateView):
 
 
 def get_list_view(model):
+    return get_model_view(model, "ListView", ListView, paginate_by=20)
 
-    # Check if the model has a custom view first
-    CustomModelListView = try_import_view(model, "ListView")
-    if CustomModelListView:
-        return CustomModelListView
-
-    # Otherwise, create a generic view
-    class GenericListView(ListView):
 
-        def __init__(self, **kwargs):
-            self.model = model
-            self.paginate_by = 20
+def get_data_view(model):
+    return get_model_view(model, "DataTableView", DataTableView)
 
-            super().__init__()
 
-    return GenericListView
+def get_export_view(model):
+    return get_model_view(model, "ExportView", ExportView)
 
 
 def get_detail_view(model):
-
-    form_class = get_model_form(model, fields=None)
-
-    # Check if the model has a custom view first
-    CustomModelDetailView = try_import_view(model, "DetailView")
-    if CustomModelDetailView:
-        return CustomModelDetailView
-
-    class GenericDetailView(DetailView):
-
-        def __init__(self, **kwargs):
-            self.model = model
-            self.form_class = form_class
-
-            super().__init__()
-
-    return GenericDetailView
+    return get_model_view(
+        model, "DetailView", DetailView,
+        form_class=get_model_form(model, fields=None),
+    )
 
 
 def get_create_view(model):
-
-    form_class = get_model_form(model, fields=None, action="create")
-
-    # Check if the model has a custom view first
-    CustomModelCreateView = try_import_view(model, "CreateView")
-    if CustomModelCreateView:
-        return CustomModelCreateView
-
-    class GenericCreateView(CreateView):
-
-        def __init__(self, **kwargs):
-            self.model = model
-            self.form_class = form_class
-
-            super().__init__()
-
-    return GenericCreateView
+    return get_model_view(
+        model, "CreateView", CreateView,
+        form_class=get_model_form(model, fields=None, action="create"),
+    )
 
 
 def get_update_view(model):
-
-    form_class = get_model_form(model, fields=None, action="update")
-
-    # Check if the model has a custom view first
-    CustomModelUpdateView = try_import_view(model, "UpdateView")
-    if CustomModelUpdateView:
-        return CustomModelUpdateView
-
-    class GenericUpdateView(UpdateView):
-
-        def __init__(self, **kwargs):
-            self.model = model
-            self.form_class = form_class
-
-            super().__init__()
-
-    return GenericUpdateView
+    return get_model_view(
+        model, "UpdateView", UpdateView,
+        form_class=get_model_form(model, fields=None, action="update"),
+    )
@@ -1,4 +1,5 @@
 from django.shortcuts import redirect, render, reverse
+from django.utils.module_loading import import_string
 from django.views.generic import (
     TemplateView,
     RedirectView
@@ -16,14 +17,17 @@ from django.contrib.auth.views import (
 from lava_light.views.generic_views import (
     ProtectedTemplateView, ProtectedRedirectView
 )
+from lava_light import settings as light_settings
 
 
 class HomeView(ProtectedTemplateView):
-    template_name = "lava_light/home.html"
+    template_name = light_settings.HOME_TEMPLATE_NAME
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # context["latest_articles"] = Article.objects.all()[:5]
+        if light_settings.HOME_CONTEXT_PROVIDER:
+            get_home_context = import_string(light_settings.HOME_CONTEXT_PROVIDER)
+            context.update(get_home_context(self.request))
         return context
 
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TradingInsightsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "trading_insights"
+
+    def ready(self):
+        from trading_insights import signals  # noqa: F401
@@ -0,0 +1,194 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, ProtectedError, Sum
+from django.utils import timezone
+
+from trading_insights.models import (
+    Account, Symbol, Position, EquityPoint, PositionMetrics, PositionRollup
+)
+from trading_insights.settings import SYMBOLS, CASH_POSITION_TYPES
+from trading_insights.services.statistics import load_position_arrays
+
+
+BENCHMARK_ACCOUNT_NAME = "Benchmark"
+
+# Reserved `account_id` marking the account created by this command, any
+# other account is left alone whatever its name.
+BENCHMARK_ACCOUNT_ID = "trading-insights-benchmark"
+
+
+class Command(BaseCommand):
+    help = """
+        This command seeds a benchmark account with generated positions and
+        prints the query plan and timing of the per-account queries used by
+        the statistics and dashboards.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of positions to generate.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of positions inserted per query.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs per query, the best timing is reported.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="If this argument is set, the benchmark account is not deleted at the end.",
+        )
+
+    def seed(self, account, rows, batch_size):
+        symbol_ids = []
+        for name in SYMBOLS:
+            symbol, _created = Symbol.objects.get_or_create(name=name)
+            symbol_ids.append(symbol.pk)
+
+        rng = np.random.default_rng(0)
+        start = timezone.now() - timedelta(minutes=15 * rows)
+        for offset in range(0, rows, batch_size):
+            size = min(batch_size, rows - offset)
+            open_minutes = (offset + np.arange(size)) * 15
+            durations = rng.integers(1, 60 * 24 * 3, size)
+            symbols = rng.choice(symbol_ids, size)
+            types = rng.choice(["buy", "sell", "deposit", "withdraw"], size, p=[
+                0.4995, 0.4995, 0.0006, 0.0004
+            ])
+            profits = rng.normal(2, 25, size).round(2)
+
+            positions = []
+            for index in range(size):
+                open_time = start + timedelta(minutes=int(open_minutes[index]))
+                position_type = str(types[index])
+                is_cash = position_type in CASH_POSITION_TYPES
+                positions.append(Position(
+                    account=account,
+                    symbol_id=int(symbols[index]),
+                    position_id=f"benchmark-{offset + index}",
+                    position_type=position_type,
+                    open_time=open_time,
+                    close_time=open_time + timedelta(minutes=int(durations[index])),
+                    volume=Decimal("0.10"),
+                    open_price=Decimal("1.10000"),
+                    stop_loss=Decimal("1.09800"),
+                    take_profit=Decimal("1.10400"),
+                    close_price=Decimal("1.10100"),
+                    commission=Decimal("-0.70"),
+                    swap=Decimal("0.00"),
+                    profit=Decimal(0) if is_cash else Decimal(str(profits[index])),
+                    amount=Decimal("1000.00") if is_cash else Decimal(0),
+                ))
+            with transaction.atomic():
+                Position.objects.bulk_create(positions)
+            self.stdout.write(f"Seeded {offset + size}/{rows} positions...")
+
+    def get_account(self):
+        return Account.objects.filter(account_id=BENCHMARK_ACCOUNT_ID).order_by("pk").first()
+
+    def create_account(self):
+        return Account.objects.create(
+            name=BENCHMARK_ACCOUNT_NAME, account_id=BENCHMARK_ACCOUNT_ID
+        )
+
+    def delete(self, account):
+        if account.account_id != BENCHMARK_ACCOUNT_ID:
+            raise CommandError(f"Account {account.pk} is not a benchmark account.")
+
+        # Raw deletes, a queryset delete would load every position to send
+        # the post_delete signals. Rows referencing positions go first, all
+        # in one transaction so nothing is lost if the account is protected.
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in (PositionMetrics, PositionRollup, EquityPoint, Position):
+                        cursor.execute(
+                            f"DELETE FROM {model._meta.db_table} WHERE account_id = %s",
+                            [account.pk]
+                        )
+                account.delete()
+        except ProtectedError:
+            raise CommandError(
+                f"The benchmark account {account.pk} is still referenced, "
+                "delete its scenarios first."
+            )
+
+    def measure(self, title, queryset, repeat, run=list):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(queryset.explain())
+
+        timings = []
+        for _index in range(repeat):
+            start = time.perf_counter()
+            # Clone the queryset, evaluated querysets cache their rows.
+            run(queryset.all())
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(self.style.SUCCESS(f"Best of {repeat}: {min(timings) * 1000:.1f} ms\n"))
+
+    def handle(self, *args, **options):
+        account = self.get_account()
+        existing = 0
+        if account is not None:
+            existing = Position.objects.filter(account=account).count()
+        if existing != options["rows"]:
+            if account is not None:
+                self.delete(account)
+            account = self.create_account()
+            self.seed(account, options["rows"], options["batch_size"])
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        last_close = Position.objects.filter(account=account).order_by(
+            "-close_time"
+        ).values_list("close_time", flat=True).first()
+        month_ago = last_close - timedelta(days=30)
+        quarter_ago = last_close - timedelta(days=90)
+        symbol_id = Position.objects.filter(account=account).values_list(
+            "symbol_id", flat=True
+        ).first()
+        repeat = options["repeat"]
+
+        latest = Position.objects.filter(account=account).order_by("-close_time", "-id")[:20]
+        self.measure("Latest positions page", latest, repeat)
+
+        month = Position.objects.filter(
+            account=account, close_time__gte=month_ago
+        ).values("position_type").annotate(count=Count("id"), profit=Sum("profit"))
+        self.measure("Last month P&L by type", month, repeat)
+
+        symbol = Position.objects.filter(
+            account=account, symbol_id=symbol_id, close_time__gte=quarter_ago
+        ).order_by("close_time")
+        self.measure("Symbol history for a quarter", symbol, repeat)
+
+        cash = Position.objects.filter(
+            account=account, position_type__in=CASH_POSITION_TYPES
+        ).order_by("close_time")
+        self.measure("Deposits and withdrawals", cash, repeat)
+
+        statistics = Position.objects.filter(
+            account=account, close_time__gte=quarter_ago
+        ).order_by("close_time", "id")
+        self.measure(
+            "Statistics columns for a quarter", statistics, repeat,
+            run=load_position_arrays
+        )
+
+        if not options["keep"]:
+            self.delete(account)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.models import Account
+from trading_insights.services.equity import (
+    materialize_equity_curve,
+    truncate_equity_curve
+)
+
+
+class Command(BaseCommand):
+    help = """
+        This command appends the equity points of every position closed
+        since the last materialized point of each account.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--account",
+            type=int,
+            help="Only materialize the equity curve of the account with this id.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="If this argument is set, the existing equity points are dropped and rebuilt from the first position.",
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+        if options["account"] is not None:
+            accounts = accounts.filter(pk=options["account"])
+            if not accounts.exists():
+                raise CommandError(f"Account {options['account']} does not exist.")
+
+        for account in accounts:
+            if options["rebuild"]:
+                truncate_equity_curve(account)
+            created = materialize_equity_curve(account)
+            self.stdout.write(f"{account}: {created} equity points materialized.")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.management.utils import get_account
+from trading_insights.services.archives import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_FORMATS,
+    ArchiveError,
+    export_archive
+)
+
+
+class Command(BaseCommand):
+    help = """
+        This command exports the full position history of an account, with
+        its symbols, to a columnar Parquet or Arrow IPC file.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", help="Id or account ID of the exported account.")
+        parser.add_argument("path", help="File to write, .parquet, .arrow or .feather.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(ARCHIVE_FORMATS.values())),
+            help="Archive format, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="Number of positions per record batch.",
+        )
+
+    def handle(self, *args, **options):
+        account = get_account(options["account"])
+        start = time.perf_counter()
+        try:
+            exported = export_archive(
+                account, options["path"], options["format"], options["batch_size"]
+            )
+        except ImportError:
+            raise CommandError("pyarrow must be installed to export histories.")
+        except (ArchiveError, OSError) as e:
+            raise CommandError(f"{options['path']}: {e}")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{account}: {exported} positions exported to {options['path']} in {elapsed:.2f}s."
+        )
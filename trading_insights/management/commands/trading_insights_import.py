@@ -0,0 +1,69 @@
+import time
+import zoneinfo
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.management.utils import get_account
+from trading_insights.services.importers import (
+    IMPORT_BATCH_SIZE,
+    STATEMENT_READERS,
+    PositionImporter,
+    StatementError,
+    read_statement
+)
+
+
+class Command(BaseCommand):
+    help = """
+        This command imports broker statements (MT4/MT5 CSV, HTML or XLSX
+        reports) into positions. Rows are streamed from the files and
+        inserted in batches.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Statement files to import.")
+        parser.add_argument(
+            "--account",
+            help="Id or account ID of the account the positions belong to, "
+            "required unless the statement has an `account` column.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(STATEMENT_READERS),
+            help="Statement format, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Number of positions inserted per query.",
+        )
+        parser.add_argument(
+            "--timezone",
+            help="Time zone of the broker server times, defaults to TIME_ZONE.",
+        )
+
+    def handle(self, *args, **options):
+        account = get_account(options["account"])
+
+        tz = None
+        if options["timezone"]:
+            try:
+                tz = zoneinfo.ZoneInfo(options["timezone"])
+            except zoneinfo.ZoneInfoNotFoundError:
+                raise CommandError(f"Unknown time zone: {options['timezone']}")
+
+        for path in options["paths"]:
+            start = time.perf_counter()
+            importer = PositionImporter(
+                account=account, batch_size=options["batch_size"], tz=tz
+            )
+            try:
+                imported = importer.run(read_statement(path, options["format"]))
+            except ImportError:
+                raise CommandError("openpyxl must be installed to import XLSX reports.")
+            except (StatementError, OSError) as e:
+                raise CommandError(f"{path}: {e}")
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{path}: {imported} positions imported in {elapsed:.2f}s.")
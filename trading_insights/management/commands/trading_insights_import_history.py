@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.management.utils import get_account
+from trading_insights.services.archives import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_FORMATS,
+    ArchiveError,
+    import_archive
+)
+
+
+class Command(BaseCommand):
+    help = """
+        This command imports position histories exported with
+        `trading_insights_export_history`. Files are memory-mapped and
+        positions upserted in batches.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Archive files to import.")
+        parser.add_argument(
+            "--account",
+            help="Id or account ID of the account the positions are imported into, "
+            "by default the archived account, created if it does not exist. "
+            "Required for archives of accounts without an account ID.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(ARCHIVE_FORMATS.values())),
+            help="Archive format, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="Number of positions upserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        account = get_account(options["account"])
+
+        for path in options["paths"]:
+            start = time.perf_counter()
+            try:
+                imported_account, imported = import_archive(
+                    path, account, options["format"], options["batch_size"]
+                )
+            except ImportError:
+                raise CommandError("pyarrow must be installed to import histories.")
+            except (ArchiveError, OSError) as e:
+                raise CommandError(f"{path}: {e}")
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{path}: {imported} positions imported into {imported_account} "
+                f"in {elapsed:.2f}s."
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.models import Account
+from trading_insights.services.metrics import rebuild_position_metrics
+
+
+class Command(BaseCommand):
+    help = """
+        This command recomputes the pip and R-multiple metrics of the trades
+        of each account.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--account",
+            type=int,
+            help="Only recompute the metrics of the account with this id.",
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+        if options["account"] is not None:
+            accounts = accounts.filter(pk=options["account"])
+            if not accounts.exists():
+                raise CommandError(f"Account {options['account']} does not exist.")
+
+        for account in accounts:
+            refreshed = rebuild_position_metrics(account.pk)
+            self.stdout.write(f"{account}: metrics of {refreshed} trades computed.")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.models import Account
+from trading_insights.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = """
+        This command rebuilds the daily, weekly and monthly position rollups
+        of each account from its positions.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--account",
+            type=int,
+            help="Only rebuild the rollups of the account with this id.",
+        )
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+        if options["account"] is not None:
+            accounts = accounts.filter(pk=options["account"])
+            if not accounts.exists():
+                raise CommandError(f"Account {options['account']} does not exist.")
+
+        for account in accounts:
+            created = rebuild_rollups(account.pk)
+            self.stdout.write(f"{account}: {created} rollups built.")
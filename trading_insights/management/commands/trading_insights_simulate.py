@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trading_insights.models import Account, Scenario
+from trading_insights.services.simulations import (
+    SIMULATION_PATHS,
+    SIMULATION_BATCH_SIZE,
+    SIMULATION_RUIN_RATIO,
+    simulate_scenario
+)
+
+
+class Command(BaseCommand):
+    help = """
+        This command runs a Monte Carlo stress test of a scenario's lines by
+        resampling the historical returns of its account.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", type=int, help="Id of the scenario to simulate.")
+        parser.add_argument(
+            "--account",
+            type=int,
+            help="Sample the returns of the account with this id instead of the scenario's account.",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=["day", "trade"],
+            default="day",
+            help="Resample daily returns or individual trade returns.",
+        )
+        parser.add_argument("--paths", type=int, default=SIMULATION_PATHS, help="Number of simulated paths.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SIMULATION_BATCH_SIZE,
+            help="Number of paths simulated per task.",
+        )
+        parser.add_argument(
+            "--ruin-ratio",
+            type=float,
+            default=SIMULATION_RUIN_RATIO,
+            help="Share of the start amount under which a path counts as ruined.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the random generator, for reproducible results.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Number of worker processes, defaults to the number of CPUs.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scenario = Scenario.objects.select_related("account").get(pk=options["scenario"])
+        except Scenario.DoesNotExist:
+            raise CommandError(f"Scenario {options['scenario']} does not exist.")
+
+        account = None
+        if options["account"] is not None:
+            try:
+                account = Account.objects.get(pk=options["account"])
+            except Account.DoesNotExist:
+                raise CommandError(f"Account {options['account']} does not exist.")
+
+        start = time.perf_counter()
+        try:
+            results = simulate_scenario(
+                scenario, account=account, mode=options["mode"], paths=options["paths"],
+                seed=options["seed"], workers=options["workers"],
+                batch_size=options["batch_size"], ruin_ratio=options["ruin_ratio"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{result['start_date']} - {result['end_date']}: "
+                f"{result['start_amount']:.2f} -> {result['target_amount']:.2f} "
+                f"({result['paths']} paths, {result['days']} days)"
+            ))
+            self.stdout.write(f"Target probability: {result['target_probability']:.2%}")
+            self.stdout.write(f"Ruin probability: {result['ruin_probability']:.2%}")
+            for percentile, value in result["drawdown_percentiles"].items():
+                self.stdout.write(f"Max drawdown P{percentile}: {value:.2%}")
+            for percentile, value in result["end_amount_percentiles"].items():
+                self.stdout.write(f"End amount P{percentile}: {value:.2f}")
+        self.stdout.write(self.style.SUCCESS(f"Simulated in {time.perf_counter() - start:.1f}s."))
@@ -0,0 +1,19 @@
+from django.core.management.base import CommandError
+
+from trading_insights.models import Account
+
+
+def get_account(value):
+    """
+    The account whose id or account ID is `value`, as given to the
+    `--account` option of the commands. None when no value is given.
+    """
+    if value is None:
+        return None
+    accounts = Account.objects.filter(account_id=value)
+    if value.isdigit():
+        accounts = accounts | Account.objects.filter(pk=int(value))
+    account = accounts.first()
+    if account is None:
+        raise CommandError(f"Account {value} does not exist.")
+    return account
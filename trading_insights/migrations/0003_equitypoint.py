@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 09:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading_insights', '0002_account_created_at_account_created_by_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquityPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time', models.DateTimeField(verbose_name='Time')),
+                ('kind', models.CharField(choices=[('buy', 'Buy'), ('sell', 'Sell'), ('deposit', 'Deposit'), ('withdraw', 'Withdraw')], max_length=16, verbose_name='Type')),
+                ('change', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Change')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Balance')),
+                ('peak', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Peak')),
+                ('drawdown', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Drawdown')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equity_points', to='trading_insights.account')),
+                ('position', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='trading_insights.position')),
+            ],
+            options={
+                'verbose_name': 'Equity Point',
+                'verbose_name_plural': 'Equity Points',
+                'ordering': ('account', 'time', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='equitypoint',
+            index=models.Index(fields=['account', 'time', 'position'], name='trading_ins_account_aecfa4_idx'),
+        ),
+    ]
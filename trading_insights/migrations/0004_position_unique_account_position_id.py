@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+def fill_position_ids(apps, schema_editor):
+    """
+    Give every position a `position_id` that is unique within its account
+    before the constraint is added: blank ids get a generated one and
+    duplicates are suffixed with the row id.
+    """
+    Position = apps.get_model("trading_insights", "Position")
+
+    seen = set()
+    renamed = []
+    positions = Position.objects.order_by("id").values_list(
+        "id", "account_id", "position_id"
+    )
+    for pk, account_id, position_id in positions.iterator(chunk_size=5000):
+        key = (account_id, position_id)
+        if not position_id:
+            renamed.append(Position(id=pk, position_id=f"manual-{pk}"))
+        elif key in seen:
+            renamed.append(Position(id=pk, position_id=f"{position_id}-{pk}"))
+        else:
+            seen.add(key)
+
+    Position.objects.bulk_update(renamed, ["position_id"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0003_equitypoint"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_position_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="position",
+            constraint=models.UniqueConstraint(
+                fields=("account", "position_id"), name="unique_account_position_id"
+            ),
+        ),
+    ]
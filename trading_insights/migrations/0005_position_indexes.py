@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0004_position_unique_account_position_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                fields=["account", "close_time"], name="position_account_close_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                fields=["account", "open_time"], name="position_account_open_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                fields=["account", "symbol", "close_time"],
+                name="position_acc_symbol_close_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                fields=["account", "position_type", "close_time"],
+                name="position_acc_type_close_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                condition=models.Q(("position_type__in", ("deposit", "withdraw"))),
+                fields=["account", "close_time"],
+                name="position_cash_flow_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0005_position_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="position",
+            options={
+                "ordering": ("-close_time", "-id"),
+                "verbose_name": "Position",
+                "verbose_name_plural": "Positions",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(
+                fields=["close_time", "id"], name="position_close_time_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 4.2 on 2026-10-18 09:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0006_position_ordering"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PositionRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week"), ("month", "Month")],
+                        max_length=8,
+                        verbose_name="Period",
+                    ),
+                ),
+                ("period_start", models.DateField(verbose_name="Period Start")),
+                ("trade_count", models.IntegerField(default=0, verbose_name="Trades")),
+                ("win_count", models.IntegerField(default=0, verbose_name="Wins")),
+                ("loss_count", models.IntegerField(default=0, verbose_name="Losses")),
+                (
+                    "gross_profit",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Gross Profit",
+                    ),
+                ),
+                (
+                    "gross_loss",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Gross Loss",
+                    ),
+                ),
+                (
+                    "commission",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Commission",
+                    ),
+                ),
+                (
+                    "swap",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=15, verbose_name="Swap"
+                    ),
+                ),
+                (
+                    "volume",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Volume",
+                    ),
+                ),
+                (
+                    "deposits",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Deposits",
+                    ),
+                ),
+                (
+                    "withdrawals",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=15,
+                        verbose_name="Withdrawals",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="trading_insights.account",
+                    ),
+                ),
+                (
+                    "symbol",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="trading_insights.symbol",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Position Rollup",
+                "verbose_name_plural": "Position Rollups",
+                "ordering": ("account", "period", "period_start", "symbol"),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="positionrollup",
+            constraint=models.UniqueConstraint(
+                fields=("account", "period", "period_start", "symbol"),
+                name="unique_position_rollup",
+            ),
+        ),
+    ]
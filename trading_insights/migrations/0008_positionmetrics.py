@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0007_positionrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PositionMetrics",
+            fields=[
+                (
+                    "position",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="metrics",
+                        serialize=False,
+                        to="trading_insights.position",
+                    ),
+                ),
+                ("close_time", models.DateTimeField(verbose_name="Close Time")),
+                ("pips", models.FloatField(blank=True, null=True, verbose_name="Pips")),
+                (
+                    "risk_pips",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Distance to the stop loss, empty without a protective stop.",
+                        null=True,
+                        verbose_name="Risk (pips)",
+                    ),
+                ),
+                (
+                    "reward_pips",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Distance to the take profit, empty without one.",
+                        null=True,
+                        verbose_name="Reward (pips)",
+                    ),
+                ),
+                (
+                    "reward_risk_ratio",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Reward/Risk"
+                    ),
+                ),
+                (
+                    "r_multiple",
+                    models.FloatField(blank=True, null=True, verbose_name="R-Multiple"),
+                ),
+                (
+                    "mae_pips",
+                    models.FloatField(blank=True, null=True, verbose_name="MAE (pips)"),
+                ),
+                (
+                    "mfe_pips",
+                    models.FloatField(blank=True, null=True, verbose_name="MFE (pips)"),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="trading_insights.account",
+                    ),
+                ),
+                (
+                    "symbol",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="trading_insights.symbol",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Position Metrics",
+                "verbose_name_plural": "Position Metrics",
+                "ordering": ("account", "close_time", "position"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="positionmetrics",
+            index=models.Index(
+                fields=["account", "symbol", "close_time"],
+                name="metrics_acc_symbol_close_idx",
+            ),
+        ),
+    ]
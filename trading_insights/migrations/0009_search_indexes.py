@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0008_positionmetrics"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="position",
+            name="position_id",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                max_length=256,
+                verbose_name="Position ID",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="symbol",
+            name="name",
+            field=models.CharField(
+                db_index=True, max_length=256, verbose_name="Symbol"
+            ),
+        ),
+    ]
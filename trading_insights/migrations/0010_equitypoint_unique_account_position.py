@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-18 10:31
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicated_curves(apps, schema_editor):
+    """
+    Concurrent materializations may have appended the same points twice.
+    The curves of the accounts concerned are dropped, they are rebuilt on
+    their next read.
+    """
+    EquityPoint = apps.get_model("trading_insights", "EquityPoint")
+
+    account_ids = EquityPoint.objects.filter(position__isnull=False).order_by().values(
+        "account_id", "position_id"
+    ).annotate(count=Count("id")).filter(count__gt=1).values_list("account_id", flat=True)
+    EquityPoint.objects.filter(account_id__in=set(account_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading_insights", "0009_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicated_curves, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="equitypoint",
+            constraint=models.UniqueConstraint(
+                fields=("account", "position"),
+                name="unique_equity_point_account_position",
+            ),
+        ),
+    ]
@@ -4,3 +4,6 @@ from .raw_data_models import (
 from .strategy_models import (
     Scenario, ScenarioLine
 )
+from .statistics import (
+    EquityPoint, PositionRollup, PositionMetrics
+)
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -5,19 +7,22 @@ from lava_light.models import BaseModel
 
 from trading_insights.settings import (
     POSITION_TYPE_CHOICES,
-    SYMBOL_TYPE_CHOICES
+    SYMBOL_TYPE_CHOICES,
+    CASH_POSITION_TYPES
 )
 
 
 class Symbol(BaseModel):
 
     menu_icon_class = "anticon anticon-dollar"
+    list_display_fields = ["display_name", "symbol_type", "pip_value"]
+    list_str_fields = ["name", "display_name"]
 
     class Meta:
         verbose_name = _("Symbol")
         verbose_name_plural = _("Symbols")
 
-    name = models.CharField(_("Symbol"), max_length=256, null=False, blank=False)
+    name = models.CharField(_("Symbol"), max_length=256, null=False, blank=False, db_index=True)
     display_name = models.CharField(_("Extended name"), max_length=256, default="", blank=True)
     symbol_type = models.CharField(_("Type"), max_length=32, choices=SYMBOL_TYPE_CHOICES, default="forex", blank=False)
     pip_value = models.DecimalField(
@@ -33,6 +38,8 @@ class Symbol(BaseModel):
 class Account(BaseModel):
 
     menu_icon_class = "anticon anticon-user"
+    list_display_fields = ["broker", "account_id", "starting_balance"]
+    list_str_fields = ["name"]
 
     class Meta:
         verbose_name = _("Account")
@@ -52,14 +59,57 @@ class Account(BaseModel):
 class Position(BaseModel):
 
     menu_icon_class = "anticon anticon-dollar"
+    list_display_fields = [
+        "account", "symbol", "position_type", "open_time", "close_time",
+        "volume", "profit",
+    ]
+    list_str_fields = ["position_type", "profit", "amount", "open_time"]
+    list_server_side = True
+    list_search_fields = ["position_id", "symbol__name"]
+    list_export_fields = [
+        "position_id", "account", "symbol", "position_type", "open_time",
+        "close_time", "volume", "open_price", "stop_loss", "take_profit",
+        "close_price", "commission", "swap", "profit", "amount",
+    ]
 
     class Meta:
         verbose_name = _("Position")
         verbose_name_plural = _("Positions")
+        ordering = ("-close_time", "-id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "position_id"], name="unique_account_position_id"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["close_time", "id"], name="position_close_time_id_idx"),
+            models.Index(
+                fields=["account", "close_time"], name="position_account_close_idx"
+            ),
+            models.Index(
+                fields=["account", "open_time"], name="position_account_open_idx"
+            ),
+            models.Index(
+                fields=["account", "symbol", "close_time"],
+                name="position_acc_symbol_close_idx"
+            ),
+            models.Index(
+                fields=["account", "position_type", "close_time"],
+                name="position_acc_type_close_idx"
+            ),
+            # Deposits and withdrawals are a handful of rows per account.
+            models.Index(
+                fields=["account", "close_time"],
+                condition=models.Q(position_type__in=CASH_POSITION_TYPES),
+                name="position_cash_flow_idx"
+            ),
+        ]
 
     account = models.ForeignKey(Account, null=False, blank=False, on_delete=models.PROTECT)
     symbol = models.ForeignKey(Symbol, null=False, blank=False, on_delete=models.PROTECT)
-    position_id = models.CharField(_("Position ID"), max_length=256, default="", blank=True)
+    position_id = models.CharField(
+        _("Position ID"), max_length=256, default="", blank=True, db_index=True
+    )
     position_type = models.CharField(
         _("Type"), choices=POSITION_TYPE_CHOICES, max_length=16, null=False, blank=False
     )
@@ -84,3 +134,10 @@ class Position(BaseModel):
         if self.position_type in ["deposit", "withdraw"]:
             amount = self.amount
         return f"{self.get_position_type_display()} - {amount} - {self.open_time.strftime('%d/%m/%Y %H:%M')}"
+
+    def save(self, *args, **kwargs):
+        # `position_id` is unique per account, positions entered by hand
+        # get a generated one.
+        if not self.position_id:
+            self.position_id = f"manual-{uuid.uuid4().hex}"
+        super().save(*args, **kwargs)
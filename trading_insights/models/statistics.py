@@ -0,0 +1,154 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from trading_insights.models.raw_data_models import (
+    Account, Symbol, Position
+)
+from trading_insights.settings import (
+    POSITION_TYPE_CHOICES,
+    ROLLUP_PERIOD_CHOICES
+)
+
+
+class EquityPoint(models.Model):
+    """
+    Materialized balance of an account after each closed position or
+    deposit/withdraw row. Rows are only appended by
+    `trading_insights.services.equity.materialize_equity_curve`, and dropped
+    from a given time onwards whenever older positions change.
+    """
+
+    class Meta:
+        verbose_name = _("Equity Point")
+        verbose_name_plural = _("Equity Points")
+        ordering = ("account", "time", "position")
+        indexes = [
+            models.Index(fields=["account", "time", "position"]),
+        ]
+        constraints = [
+            # Concurrent requests materializing the same account insert the
+            # same points, the constraint lets the later ones be ignored.
+            models.UniqueConstraint(
+                fields=["account", "position"], name="unique_equity_point_account_position"
+            ),
+        ]
+
+    account = models.ForeignKey(
+        Account, null=False, blank=False, on_delete=models.CASCADE,
+        related_name="equity_points"
+    )
+    position = models.ForeignKey(
+        Position, null=True, blank=True, on_delete=models.CASCADE,
+        related_name="+"
+    )
+    time = models.DateTimeField(_("Time"), null=False, blank=False)
+    kind = models.CharField(
+        _("Type"), choices=POSITION_TYPE_CHOICES, max_length=16, null=False, blank=False
+    )
+    change = models.DecimalField(_("Change"), max_digits=15, decimal_places=2)
+    balance = models.DecimalField(_("Balance"), max_digits=15, decimal_places=2)
+    peak = models.DecimalField(_("Peak"), max_digits=15, decimal_places=2)
+    drawdown = models.DecimalField(_("Drawdown"), max_digits=15, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.account} - {self.balance} - {self.time.strftime('%d/%m/%Y %H:%M')}"
+
+
+class PositionRollup(models.Model):
+    """
+    Aggregates of the positions of an account and symbol closed during a
+    day, week or month (local time). Kept current by delta updates on
+    position save/delete and rebuilt from a given period on bulk changes,
+    see `trading_insights.services.rollups`.
+    """
+
+    class Meta:
+        verbose_name = _("Position Rollup")
+        verbose_name_plural = _("Position Rollups")
+        ordering = ("account", "period", "period_start", "symbol")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "period", "period_start", "symbol"],
+                name="unique_position_rollup",
+            ),
+        ]
+
+    account = models.ForeignKey(
+        Account, null=False, blank=False, on_delete=models.CASCADE,
+        related_name="rollups"
+    )
+    symbol = models.ForeignKey(
+        Symbol, null=False, blank=False, on_delete=models.CASCADE,
+        related_name="+"
+    )
+    period = models.CharField(
+        _("Period"), choices=ROLLUP_PERIOD_CHOICES, max_length=8, null=False, blank=False
+    )
+    period_start = models.DateField(_("Period Start"), null=False, blank=False)
+    trade_count = models.IntegerField(_("Trades"), default=0)
+    win_count = models.IntegerField(_("Wins"), default=0)
+    loss_count = models.IntegerField(_("Losses"), default=0)
+    gross_profit = models.DecimalField(_("Gross Profit"), max_digits=15, decimal_places=2, default=0)
+    gross_loss = models.DecimalField(_("Gross Loss"), max_digits=15, decimal_places=2, default=0)
+    commission = models.DecimalField(_("Commission"), max_digits=15, decimal_places=2, default=0)
+    swap = models.DecimalField(_("Swap"), max_digits=15, decimal_places=2, default=0)
+    volume = models.DecimalField(_("Volume"), max_digits=15, decimal_places=2, default=0)
+    deposits = models.DecimalField(_("Deposits"), max_digits=15, decimal_places=2, default=0)
+    withdrawals = models.DecimalField(_("Withdrawals"), max_digits=15, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.account} - {self.symbol} - {self.period} {self.period_start}"
+
+    @property
+    def net_profit(self):
+        return self.gross_profit - self.gross_loss
+
+
+class PositionMetrics(models.Model):
+    """
+    Per trade figures derived from the prices of a position and the
+    `pip_value` of its symbol, stored as floats for the edge reports.
+    Refreshed for the changed positions only, see
+    `trading_insights.services.metrics`.
+    """
+
+    class Meta:
+        verbose_name = _("Position Metrics")
+        verbose_name_plural = _("Position Metrics")
+        ordering = ("account", "close_time", "position")
+        indexes = [
+            models.Index(
+                fields=["account", "symbol", "close_time"],
+                name="metrics_acc_symbol_close_idx"
+            ),
+        ]
+
+    position = models.OneToOneField(
+        Position, primary_key=True, on_delete=models.CASCADE, related_name="metrics"
+    )
+    account = models.ForeignKey(
+        Account, null=False, blank=False, on_delete=models.CASCADE,
+        related_name="+"
+    )
+    symbol = models.ForeignKey(
+        Symbol, null=False, blank=False, on_delete=models.CASCADE,
+        related_name="+"
+    )
+    close_time = models.DateTimeField(_("Close Time"), null=False, blank=False)
+    pips = models.FloatField(_("Pips"), null=True, blank=True)
+    risk_pips = models.FloatField(
+        _("Risk (pips)"), null=True, blank=True,
+        help_text=_("Distance to the stop loss, empty without a protective stop.")
+    )
+    reward_pips = models.FloatField(
+        _("Reward (pips)"), null=True, blank=True,
+        help_text=_("Distance to the take profit, empty without one.")
+    )
+    reward_risk_ratio = models.FloatField(_("Reward/Risk"), null=True, blank=True)
+    r_multiple = models.FloatField(_("R-Multiple"), null=True, blank=True)
+    # Excursions need intra-trade prices, which statements do not provide.
+    mae_pips = models.FloatField(_("MAE (pips)"), null=True, blank=True)
+    mfe_pips = models.FloatField(_("MFE (pips)"), null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.position_id} - {self.r_multiple}"
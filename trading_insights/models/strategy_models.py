@@ -11,6 +11,8 @@ from trading_insights.models.raw_data_models import (
 class Scenario(BaseModel):
 
     menu_icon_class = "anticon anticon-file"
+    list_display_fields = ["account"]
+    list_str_fields = ["name"]
 
     class Meta:
         verbose_name = _("Scenario")
@@ -0,0 +1,277 @@
+import json
+
+from django.db import transaction
+
+from trading_insights.models import Account, Symbol, Position
+from trading_insights.services.importers import merge_changes, upsert_positions
+from trading_insights.signals import positions_changed
+
+
+ARCHIVE_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# Positions per record batch when writing, and per upsert when reading.
+ARCHIVE_BATCH_SIZE = 10_000
+
+# Parquet is compressed, Arrow IPC files are not so they can be memory-mapped.
+ARCHIVE_PARQUET_COMPRESSION = "zstd"
+
+# Schema metadata key holding the account and symbol metadata.
+ARCHIVE_METADATA_KEY = b"bear_vision"
+
+ARCHIVE_VERSION = 1
+
+ARCHIVE_ACCOUNT_FIELDS = ("name", "broker", "account_id", "starting_balance")
+
+ARCHIVE_SYMBOL_FIELDS = ("name", "display_name", "symbol_type", "pip_value")
+
+# Position columns of an archive, `symbol` holds the symbol name.
+ARCHIVE_POSITION_COLUMNS = (
+    "position_id", "symbol", "position_type", "open_time", "close_time",
+    "volume", "open_price", "stop_loss", "take_profit", "close_price",
+    "commission", "swap", "profit", "amount",
+)
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def get_archive_format(path, archive_format=None):
+    if archive_format:
+        return archive_format
+    for extension, name in ARCHIVE_FORMATS.items():
+        if str(path).lower().endswith(extension):
+            return name
+    raise ArchiveError(
+        f"Unknown archive format, use one of: {', '.join(ARCHIVE_FORMATS)}."
+    )
+
+
+def get_archive_schema(metadata):
+    """
+    Arrow schema of the position columns, with the account and symbol
+    `metadata` attached as JSON.
+    """
+    # pyarrow is only needed for archives.
+    import pyarrow as pa
+
+    fields = []
+    for name in ARCHIVE_POSITION_COLUMNS:
+        if name == "symbol":
+            data_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            field = Position._meta.get_field(name)
+            internal_type = field.get_internal_type()
+            if internal_type == "DecimalField":
+                # Decimals keep their exact database precision.
+                data_type = pa.decimal128(field.max_digits, field.decimal_places)
+            elif internal_type == "DateTimeField":
+                data_type = pa.timestamp("us", tz="UTC")
+            else:
+                data_type = pa.string()
+        fields.append(pa.field(name, data_type, nullable=False))
+
+    return pa.schema(fields, metadata={
+        ARCHIVE_METADATA_KEY: json.dumps(metadata, default=str),
+    })
+
+
+def get_archive_metadata(account):
+    symbols = Symbol.objects.filter(
+        pk__in=Position.objects.filter(account=account).values("symbol_id")
+    ).order_by("name").values(*ARCHIVE_SYMBOL_FIELDS)
+    return {
+        "version": ARCHIVE_VERSION,
+        "account": {name: getattr(account, name) for name in ARCHIVE_ACCOUNT_FIELDS},
+        "symbols": list(symbols),
+    }
+
+
+def rows_to_record_batch(rows, schema, symbol_indexes):
+    """
+    Record batch of `rows` (tuples of `ARCHIVE_POSITION_COLUMNS`). Symbols
+    are encoded against the same dictionary in every batch, which Arrow IPC
+    files require.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array([symbol_indexes[name] for name in values], pa.int32()),
+                pa.array(list(symbol_indexes), pa.string()),
+            ))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_record_batches(account, schema, symbol_indexes, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Record batches of the positions of `account` in close time order, rows
+    are streamed from the database `batch_size` at a time.
+    """
+    columns = [
+        "symbol__name" if name == "symbol" else name for name in ARCHIVE_POSITION_COLUMNS
+    ]
+    rows = Position.objects.filter(account=account).order_by(
+        "close_time", "id"
+    ).values_list(*columns).iterator(chunk_size=batch_size)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield rows_to_record_batch(batch, schema, symbol_indexes)
+            batch = []
+    if batch:
+        yield rows_to_record_batch(batch, schema, symbol_indexes)
+
+
+def export_archive(account, path, archive_format=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Write the positions of `account`, along with the account and symbol
+    metadata, to a Parquet or Arrow IPC file. Returns the number of positions.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    archive_format = get_archive_format(path, archive_format)
+    metadata = get_archive_metadata(account)
+    schema = get_archive_schema(metadata)
+    symbol_indexes = {
+        symbol["name"]: index for index, symbol in enumerate(metadata["symbols"])
+    }
+
+    exported = 0
+    batches = iter_record_batches(account, schema, symbol_indexes, batch_size)
+    if archive_format == "parquet":
+        with pq.ParquetWriter(path, schema, compression=ARCHIVE_PARQUET_COMPRESSION) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                exported += batch.num_rows
+    else:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                exported += batch.num_rows
+    return exported
+
+
+def read_archive(path, archive_format=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Open an archive memory-mapped. Returns its metadata and an iterator of
+    its record batches: Arrow IPC batches are zero-copy views of the mapped
+    file, Parquet pages are decoded `batch_size` rows at a time.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    archive_format = get_archive_format(path, archive_format)
+    try:
+        if archive_format == "parquet":
+            parquet_file = pq.ParquetFile(str(path), memory_map=True)
+            schema = parquet_file.schema_arrow
+            batches = parquet_file.iter_batches(batch_size=batch_size)
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+            schema = reader.schema
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    except pa.ArrowInvalid as e:
+        raise ArchiveError(f"Not a valid {archive_format} file: {e}")
+
+    missing = set(ARCHIVE_POSITION_COLUMNS) - set(schema.names)
+    if missing or ARCHIVE_METADATA_KEY not in (schema.metadata or {}):
+        raise ArchiveError("Not a position archive, the metadata or columns are missing.")
+    return json.loads(schema.metadata[ARCHIVE_METADATA_KEY]), batches
+
+
+def get_archive_account(metadata, account=None, user=None):
+    """
+    The account archived positions are imported into: `account` when
+    given, else the account with the archived account ID, created if needed.
+    Without an account ID, every import would create a new copy of the
+    account: the target account must then be given.
+    """
+    if account is not None:
+        return account
+    values = metadata["account"]
+    if not values["account_id"]:
+        raise ArchiveError(
+            f"The archived account {values['name']} has no account ID, "
+            "give the account to import into."
+        )
+    account = Account.objects.filter(account_id=values["account_id"]).first()
+    if account is None:
+        account = Account.objects.create(
+            created_by=user, **{name: values[name] for name in ARCHIVE_ACCOUNT_FIELDS}
+        )
+    return account
+
+
+def get_archive_symbols(metadata, user=None):
+    """
+    `{name: pk}` of the archived symbols, creating the missing ones.
+    """
+    names = [symbol["name"] for symbol in metadata["symbols"]]
+    existing = set(Symbol.objects.filter(name__in=names).values_list("name", flat=True))
+    Symbol.objects.bulk_create([
+        Symbol(created_by=user, **{name: symbol[name] for name in ARCHIVE_SYMBOL_FIELDS})
+        for symbol in metadata["symbols"]
+        if symbol["name"] not in existing
+    ])
+    return dict(Symbol.objects.filter(name__in=names).values_list("name", "pk"))
+
+
+def record_batch_to_positions(batch, account, symbols, user=None):
+    columns = {name: batch.column(name) for name in ARCHIVE_POSITION_COLUMNS}
+    symbol_column = columns.pop("symbol")
+    if hasattr(symbol_column, "dictionary"):
+        # Resolve each dictionary entry once rather than once per row.
+        symbol_ids = [symbols[name] for name in symbol_column.dictionary.to_pylist()]
+        symbol_ids = [symbol_ids[index] for index in symbol_column.indices.to_pylist()]
+    else:
+        symbol_ids = [symbols[name] for name in symbol_column.to_pylist()]
+
+    values = {name: column.to_pylist() for name, column in columns.items()}
+    return [
+        Position(
+            account=account, symbol_id=symbol_id, created_by=user,
+            **{name: values[name][index] for name in values},
+        )
+        for index, symbol_id in enumerate(symbol_ids)
+    ]
+
+
+def import_archive(
+    path, account=None, archive_format=None, batch_size=ARCHIVE_BATCH_SIZE, user=None
+):
+    """
+    Upsert the positions of an archive into `account` (see
+    `get_archive_account`), in batches of `batch_size` positions. Returns the
+    account and the number of positions imported.
+    """
+    metadata, batches = read_archive(path, archive_format, batch_size)
+    imported = 0
+    changes = {}
+    with transaction.atomic():
+        account = get_archive_account(metadata, account, user)
+        symbols = get_archive_symbols(metadata, user)
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batch_size):
+                positions = record_batch_to_positions(
+                    batch.slice(offset, batch_size), account, symbols, user
+                )
+                merge_changes(changes, upsert_positions(positions))
+                imported += len(positions)
+
+    for account_id, since in changes.items():
+        positions_changed.send(
+            sender=Position, account_id=account_id, since=since, bulk=True
+        )
+    return account, imported
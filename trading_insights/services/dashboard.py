@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from lava_light.caching import get_or_compute
+
+from trading_insights.models import Account, PositionRollup
+from trading_insights.services.equity import get_last_equity_point
+from trading_insights.services.rollups import ROLLUP_PERIODS, get_period_start
+from trading_insights.services.tracking import get_daily_balances
+
+
+# Cache namespace of the per-account data, bumped on `positions_changed`.
+ACCOUNT_CACHE_NAMESPACE = "account"
+
+DASHBOARD_CURVE_DAYS = 90
+
+DASHBOARD_TOP_SYMBOLS = 5
+
+
+def compute_dashboard(account, today):
+    """
+    Figures of the home dashboard, as plain values so they can be cached.
+    Reads the materialized equity curve and the position rollups only.
+    """
+    first_day = today - timedelta(days=DASHBOARD_CURVE_DAYS - 1)
+    balances = get_daily_balances(account, first_day, today)
+    last_point = get_last_equity_point(account)
+
+    rollups = PositionRollup.objects.filter(account=account)
+    current_periods = Q()
+    for period in ROLLUP_PERIODS:
+        current_periods |= Q(period=period, period_start=get_period_start(today, period))
+    net_profit = Sum(F("gross_profit") - F("gross_loss"))
+    period_results = {
+        row["period"]: row
+        for row in rollups.filter(current_periods).values("period").annotate(
+            net_profit=net_profit, trade_count=Sum("trade_count"), win_count=Sum("win_count")
+        )
+    }
+
+    # Monthly rollups are enough for all time totals per symbol.
+    top_symbols = rollups.filter(period="month").values("symbol__name").annotate(
+        net_profit=net_profit, trade_count=Sum("trade_count")
+    ).filter(trade_count__gt=0).order_by("-net_profit")[:DASHBOARD_TOP_SYMBOLS]
+
+    balance = float(balances[-1]) if balances.size else float(account.starting_balance)
+    peak = float(last_point.peak) if last_point else balance
+    drawdown = float(last_point.drawdown) if last_point else 0.0
+
+    return {
+        "balance": balance,
+        "peak": peak,
+        "drawdown": drawdown,
+        "drawdown_ratio": drawdown / peak if peak > 0 else 0.0,
+        "periods": {
+            period: {
+                "net_profit": float(period_results.get(period, {}).get("net_profit") or 0),
+                "trade_count": period_results.get(period, {}).get("trade_count") or 0,
+                "win_count": period_results.get(period, {}).get("win_count") or 0,
+            }
+            for period in ROLLUP_PERIODS
+        },
+        "top_symbols": [
+            {
+                "name": row["symbol__name"],
+                "net_profit": float(row["net_profit"]),
+                "trade_count": row["trade_count"],
+            }
+            for row in top_symbols
+        ],
+        "curve": {
+            "labels": [
+                (first_day + timedelta(days=index)).isoformat()
+                for index in range(balances.size)
+            ],
+            "balances": [round(value, 2) for value in balances.tolist()],
+        },
+    }
+
+
+def get_dashboard(account, today=None):
+    """
+    Cached `compute_dashboard`, keyed by the account data version so it is
+    only recomputed once positions of this account change.
+    """
+    today = today or timezone.localdate()
+    return get_or_compute(
+        ACCOUNT_CACHE_NAMESPACE, account.pk, ("dashboard", today.isoformat()),
+        lambda: compute_dashboard(account, today)
+    )
+
+
+# Permission required to see the figures of the accounts.
+ACCOUNT_VIEW_PERMISSION = "trading_insights.view_account"
+
+
+def get_selected_account(request):
+    """
+    Every account, and the one picked with the `account` GET parameter
+    (the first one by default). Users without `ACCOUNT_VIEW_PERMISSION`
+    get no account.
+    """
+    if not request.user.has_perm(ACCOUNT_VIEW_PERMISSION):
+        return [], None
+    accounts = list(Account.objects.order_by("name", "id"))
+    account = accounts[0] if accounts else None
+    selected = request.GET.get("account")
+    for candidate in accounts:
+        if str(candidate.pk) == selected:
+            account = candidate
+    return accounts, account
+
+
+def get_home_context(request):
+    """
+    Home page context: the accounts and the dashboard of the selected one.
+    """
+    accounts, account = get_selected_account(request)
+    return {
+        "model_verbose_name_plural": _("Tableau de bord"),
+        "can_view_accounts": request.user.has_perm(ACCOUNT_VIEW_PERMISSION),
+        "accounts": accounts,
+        "account": account,
+        "dashboard": get_dashboard(account) if account else None,
+    }
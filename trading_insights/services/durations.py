@@ -0,0 +1,125 @@
+import numpy as np
+
+from django.db.models import DurationField, ExpressionWrapper, F
+
+from lava_light.caching import get_or_compute, aget_or_compute
+from lava_light.executors import run_in_executor
+
+from trading_insights.services.dashboard import ACCOUNT_CACHE_NAMESPACE
+from trading_insights.services.statistics import get_account_positions
+from trading_insights.settings import TRADE_POSITION_TYPES
+
+
+# Upper bounds (in seconds) of the holding period buckets, the last bucket
+# holds every longer trade.
+DURATION_BUCKET_EDGES = (
+    60, 5 * 60, 15 * 60, 60 * 60, 4 * 60 * 60, 24 * 60 * 60, 7 * 24 * 60 * 60,
+)
+
+DURATION_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def get_duration_rows(account, date_from=None, date_to=None):
+    """
+    `(duration, net_profit)` of every trade, the duration being computed
+    by the database as `close_time - open_time`.
+    """
+    return get_account_positions(account, date_from, date_to).filter(
+        position_type__in=TRADE_POSITION_TYPES
+    ).annotate(
+        duration=ExpressionWrapper(F("close_time") - F("open_time"), output_field=DurationField()),
+        net_profit=F("profit") + F("commission") + F("swap"),
+    ).order_by().values_list("duration", "net_profit")
+
+
+def rows_to_duration_arrays(rows):
+    """
+    Holding periods in seconds and net results of `get_duration_rows`.
+    """
+    if not rows:
+        return np.empty(0), np.empty(0)
+    durations, profits = zip(*rows)
+    seconds = np.array(durations, dtype="timedelta64[us]").astype(np.int64) / 1e6
+    # Statements may round the close time below the open time.
+    return np.maximum(seconds, 0.0), np.array(profits, dtype=np.float64)
+
+
+def _mean(values):
+    return float(values.mean()) if values.size else None
+
+
+def compute_duration_statistics(durations, profits, edges=DURATION_BUCKET_EDGES):
+    """
+    Distribution of the holding periods (seconds) of trades and their
+    results per duration bucket: one bucket below each of `edges` and one
+    above the last edge.
+    """
+    buckets = np.searchsorted(np.asarray(edges, dtype=np.float64), durations, side="left")
+    size = len(edges) + 1
+    trade_count = np.bincount(buckets, minlength=size)
+    win_count = np.bincount(buckets, weights=profits > 0, minlength=size).astype(np.int64)
+    net_profit = np.bincount(buckets, weights=profits, minlength=size)
+
+    lower_bounds = (0, *edges)
+    upper_bounds = (*edges, None)
+    return {
+        "trade_count": int(durations.size),
+        "average_duration": _mean(durations),
+        "winners_average_duration": _mean(durations[profits > 0]),
+        "losers_average_duration": _mean(durations[profits < 0]),
+        "percentiles": dict(zip(
+            DURATION_PERCENTILES,
+            np.percentile(durations, DURATION_PERCENTILES).tolist()
+            if durations.size else [None] * len(DURATION_PERCENTILES)
+        )),
+        "buckets": [
+            {
+                "min_duration": lower_bounds[index],
+                "max_duration": upper_bounds[index],
+                "trade_count": int(trade_count[index]),
+                "win_count": int(win_count[index]),
+                "win_rate": (
+                    float(win_count[index] / trade_count[index]) if trade_count[index] else None
+                ),
+                "net_profit": round(float(net_profit[index]), 2),
+                "average_profit": (
+                    round(float(net_profit[index] / trade_count[index]), 2)
+                    if trade_count[index] else None
+                ),
+            }
+            for index in range(size)
+        ],
+    }
+
+
+def _cache_parts(date_from, date_to):
+    return (
+        "durations",
+        date_from.isoformat() if date_from else "", date_to.isoformat() if date_to else "",
+    )
+
+
+def get_duration_statistics(account, date_from=None, date_to=None):
+    """
+    Cached holding period analytics of the trades of `account`, recomputed
+    once positions of the account change.
+    """
+    return get_or_compute(
+        ACCOUNT_CACHE_NAMESPACE, account.pk, _cache_parts(date_from, date_to),
+        lambda: compute_duration_statistics(
+            *rows_to_duration_arrays(list(get_duration_rows(account, date_from, date_to)))
+        )
+    )
+
+
+async def aget_duration_statistics(account, date_from=None, date_to=None):
+
+    async def compute():
+        rows = [row async for row in get_duration_rows(account, date_from, date_to)]
+        return await run_in_executor(
+            lambda: compute_duration_statistics(*rows_to_duration_arrays(rows))
+        )
+
+    return await aget_or_compute(
+        ACCOUNT_CACHE_NAMESPACE, account.pk, _cache_parts(date_from, date_to), compute
+    )
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from datetime import datetime, timezone
+
+from django.db import transaction
+from django.db.models import Q
+
+from trading_insights.models import Position, EquityPoint
+from trading_insights.services.statistics import (
+    load_position_arrays,
+    split_cash_flows,
+    compute_equity_path
+)
+
+
+# Number of positions materialized per query / bulk insert.
+EQUITY_CHUNK_SIZE = 5000
+
+
+def _to_decimal(value):
+    return Decimal(f"{value:.2f}")
+
+
+def get_last_equity_point(account):
+    return EquityPoint.objects.filter(account=account).order_by(
+        "-time", "-position_id"
+    ).first()
+
+
+def get_pending_positions(account, last_point=None):
+    """
+    Positions of `account` that closed after the last materialized point,
+    ordered the same way the equity curve is built.
+    """
+    positions = Position.objects.filter(account=account)
+    if last_point is not None:
+        positions = positions.filter(
+            Q(close_time__gt=last_point.time)
+            | Q(close_time=last_point.time, id__gt=last_point.position_id or 0)
+        )
+    return positions.order_by("close_time", "id")
+
+
+def materialize_equity_curve(account, chunk_size=EQUITY_CHUNK_SIZE):
+    """
+    Append the equity points of every position that closed after the last
+    materialized point. Returns the number of points computed, some of which
+    may have been inserted by a concurrent call.
+    """
+    last_point = get_last_equity_point(account)
+    if last_point is None:
+        balance = peak = float(account.starting_balance)
+    else:
+        balance, peak = float(last_point.balance), float(last_point.peak)
+
+    created = 0
+    while True:
+        positions = get_pending_positions(account, last_point)[:chunk_size]
+        arrays = load_position_arrays(positions)
+        if not arrays["id"].size:
+            break
+
+        cash, pnl = split_cash_flows(arrays)
+        balances, peaks = compute_equity_path(cash, pnl, balance=balance, peak=peak)
+        changes = cash + pnl
+
+        points = [
+            EquityPoint(
+                account=account,
+                position_id=int(position_id),
+                time=datetime.fromtimestamp(close_time, tz=timezone.utc),
+                kind=kind,
+                change=_to_decimal(change),
+                balance=_to_decimal(point_balance),
+                peak=_to_decimal(point_peak),
+                drawdown=_to_decimal(point_peak - point_balance),
+            )
+            for position_id, close_time, kind, change, point_balance, point_peak in zip(
+                arrays["id"].tolist(), arrays["close_time"].tolist(),
+                arrays["position_type"].tolist(), changes.tolist(),
+                balances.tolist(), peaks.tolist(),
+            )
+        ]
+        # Another request may be materializing the same points, they are
+        # identical: skip those already inserted rather than duplicate them.
+        with transaction.atomic():
+            EquityPoint.objects.bulk_create(points, ignore_conflicts=True)
+
+        created += len(points)
+        last_point = points[-1]
+        balance, peak = float(balances[-1]), float(peaks[-1])
+
+    return created
+
+
+def truncate_equity_curve(account, since=None):
+    """
+    Drop materialized points from `since` onwards (or all of them), so the
+    next `materialize_equity_curve` call replays only that part of the history.
+    """
+    points = EquityPoint.objects.filter(account=account)
+    if since is not None:
+        points = points.filter(time__gte=since)
+    return points.delete()[0]
+
+
+def get_equity_curve(account, date_from=None, date_to=None):
+    materialize_equity_curve(account)
+
+    points = EquityPoint.objects.filter(account=account)
+    if date_from is not None:
+        points = points.filter(time__gte=date_from)
+    if date_to is not None:
+        points = points.filter(time__lt=date_to)
+    return points.order_by("time", "position_id")
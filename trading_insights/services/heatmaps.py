@@ -0,0 +1,124 @@
+import zoneinfo
+
+import numpy as np
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay
+from django.utils import timezone
+
+from lava_light.caching import get_or_compute
+
+from trading_insights.models import Position
+from trading_insights.services.dashboard import ACCOUNT_CACHE_NAMESPACE
+from trading_insights.settings import TRADE_POSITION_TYPES
+
+
+HEATMAP_WEEKDAYS = 7
+
+HEATMAP_HOURS = 24
+
+HEATMAP_METRICS = ("net_profit", "win_rate", "trade_count")
+
+
+def get_timezone(name=None):
+    """
+    The `name` zone, or the current time zone (`TIME_ZONE` by default).
+    Raises ValueError for unknown zones.
+    """
+    if not name:
+        return timezone.get_current_timezone()
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+
+def get_bucket_rows(account, tz, date_from=None, date_to=None):
+    """
+    Trade count, wins and net P&L per (ISO weekday, hour) of `open_time` in
+    `tz`, grouped by the database in one query.
+    """
+    positions = Position.objects.filter(
+        account=account, position_type__in=TRADE_POSITION_TYPES
+    )
+    if date_from is not None:
+        positions = positions.filter(close_time__gte=date_from)
+    if date_to is not None:
+        positions = positions.filter(close_time__lt=date_to)
+
+    return positions.annotate(
+        net_profit=F("profit") + F("commission") + F("swap"),
+        weekday=ExtractIsoWeekDay("open_time", tzinfo=tz),
+        hour=ExtractHour("open_time", tzinfo=tz),
+    ).order_by().values("weekday", "hour").annotate(
+        trade_count=Count("id"),
+        win_count=Count("id", filter=Q(net_profit__gt=0)),
+        total=Sum("net_profit"),
+    ).values_list("weekday", "hour", "trade_count", "win_count", "total")
+
+
+def get_win_rates(win_count, trade_count):
+    """
+    Element-wise win rates as (nested) lists, None where there is no trade.
+    """
+    trade_count = np.asarray(trade_count)
+    rates = np.divide(
+        win_count, trade_count, out=np.zeros(trade_count.shape), where=trade_count > 0
+    )
+    return np.where(trade_count > 0, np.round(rates, 4), None).tolist()
+
+
+def build_heatmap(rows):
+    """
+    Dense weekday x hour grids (Monday first) of `rows` of
+    (weekday, hour, trade_count, win_count, net_profit), with the totals of
+    every weekday and hour.
+    """
+    shape = (HEATMAP_WEEKDAYS, HEATMAP_HOURS)
+    trade_count = np.zeros(shape, dtype=np.int64)
+    win_count = np.zeros(shape, dtype=np.int64)
+    net_profit = np.zeros(shape)
+    if rows:
+        weekdays, hours, counts, wins, totals = (np.array(column) for column in zip(*rows))
+        cells = (weekdays.astype(np.int64) - 1, hours.astype(np.int64))
+        trade_count[cells] = counts
+        win_count[cells] = wins
+        net_profit[cells] = totals.astype(np.float64)
+
+    return {
+        "trade_count": trade_count.tolist(),
+        "win_count": win_count.tolist(),
+        "net_profit": np.round(net_profit, 2).tolist(),
+        "win_rate": get_win_rates(win_count, trade_count),
+        "weekdays": {
+            "trade_count": trade_count.sum(axis=1).tolist(),
+            "net_profit": np.round(net_profit.sum(axis=1), 2).tolist(),
+            "win_rate": get_win_rates(win_count.sum(axis=1), trade_count.sum(axis=1)),
+        },
+        "hours": {
+            "trade_count": trade_count.sum(axis=0).tolist(),
+            "net_profit": np.round(net_profit.sum(axis=0), 2).tolist(),
+            "win_rate": get_win_rates(win_count.sum(axis=0), trade_count.sum(axis=0)),
+        },
+        "total": {
+            "trade_count": int(trade_count.sum()),
+            "net_profit": round(float(net_profit.sum()), 2),
+            "win_rate": get_win_rates(win_count.sum(), trade_count.sum()),
+        },
+    }
+
+
+def get_heatmap(account, tz=None, date_from=None, date_to=None):
+    """
+    Cached weekday x hour performance of `account` in `tz`, recomputed once
+    positions of the account change.
+    """
+    tz = tz or timezone.get_current_timezone()
+    parts = (
+        "heatmap", str(tz),
+        date_from.isoformat() if date_from else "", date_to.isoformat() if date_to else "",
+    )
+    return get_or_compute(
+        ACCOUNT_CACHE_NAMESPACE, account.pk, parts,
+        lambda: build_heatmap(list(get_bucket_rows(account, tz, date_from, date_to)))
+    )
@@ -0,0 +1,456 @@
+import csv
+import codecs
+from decimal import Decimal, InvalidOperation
+from datetime import datetime
+from html.parser import HTMLParser
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from trading_insights.models import Account, Symbol, Position
+from trading_insights.settings import CASH_SYMBOL_NAME
+from trading_insights.signals import positions_changed
+
+
+IMPORT_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 64 * 1024
+
+# Tried after ISO 8601, which also covers the MT "2024.01.31 23:59:59" format.
+DATETIME_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+)
+
+# Statement headers (lower case) mapped to Position fields. Covers the MT4
+# "Closed Transactions" and MT5 "Positions"/"Deals" tables as well as plain
+# CSV files using the field names directly.
+HEADER_ALIASES = {
+    "position": "position_id",
+    "position_id": "position_id",
+    "ticket": "position_id",
+    "deal": "position_id",
+    "symbol": "symbol",
+    "item": "symbol",
+    "type": "position_type",
+    "position_type": "position_type",
+    "volume": "volume",
+    "size": "volume",
+    "open time": "open_time",
+    "open_time": "open_time",
+    "close time": "close_time",
+    "close_time": "close_time",
+    "open price": "open_price",
+    "open_price": "open_price",
+    "close price": "close_price",
+    "close_price": "close_price",
+    "s / l": "stop_loss",
+    "s/l": "stop_loss",
+    "stop_loss": "stop_loss",
+    "t / p": "take_profit",
+    "t/p": "take_profit",
+    "take_profit": "take_profit",
+    "commission": "commission",
+    "swap": "swap",
+    "profit": "profit",
+    "amount": "amount",
+    "account": "account",
+}
+
+# Headers that appear twice in MT statements: first for the opening side,
+# then for the closing side of the position.
+REPEATED_HEADERS = {
+    "time": ("open_time", "close_time"),
+    "price": ("open_price", "close_price"),
+}
+
+# Statement types that become positions. Pending orders ("buy limit", ...)
+# and summary rows are skipped.
+IMPORTED_TYPES = ("buy", "sell", "balance", "deposit", "withdraw")
+
+DECIMAL_FIELDS = (
+    "volume", "open_price", "close_price", "stop_loss", "take_profit",
+    "commission", "swap", "profit", "amount",
+)
+
+
+# Fields overwritten when an imported position already exists.
+UPSERT_UNIQUE_FIELDS = ("account", "position_id")
+UPSERT_UPDATE_FIELDS = (
+    "symbol", "position_type", "open_time", "close_time", *DECIMAL_FIELDS,
+    "last_updated_at",
+)
+
+
+class StatementError(Exception):
+    pass
+
+
+def _open_text(path):
+    """
+    Open a statement as text. MT5 writes its HTML reports in UTF-16.
+    """
+    with open(path, "rb") as raw_file:
+        head = raw_file.read(4)
+
+    encoding = "utf-8-sig"
+    if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+        encoding = "utf-16"
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def read_csv_rows(path):
+    with _open_text(path) as csv_file:
+        sample = csv_file.read(READ_CHUNK_SIZE)
+        csv_file.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(csv_file, dialect)
+
+
+class _TableRowParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            colspan = dict(attrs).get("colspan") or "1"
+            self._colspan = int(colspan) if colspan.isdigit() else 1
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._row.extend([""] * (self._colspan - 1))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def read_html_rows(path):
+    parser = _TableRowParser()
+    with _open_text(path) as html_file:
+        while True:
+            chunk = html_file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.rows
+            parser.rows.clear()
+    parser.close()
+    yield from parser.rows
+
+
+def read_xlsx_rows(path):
+    # openpyxl is only needed for XLSX reports.
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            for row in worksheet.iter_rows(values_only=True):
+                yield ["" if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+STATEMENT_READERS = {
+    "csv": read_csv_rows,
+    "html": read_html_rows,
+    "htm": read_html_rows,
+    "xlsx": read_xlsx_rows,
+}
+
+
+def map_header(row):
+    """
+    Return a `{field: column index}` mapping if `row` is the header of a
+    positions table, None otherwise.
+    """
+    columns = {}
+    seen = {}
+    for index, cell in enumerate(row):
+        label = str(cell).strip().lower()
+        if label in REPEATED_HEADERS:
+            occurrence = seen.get(label, 0)
+            seen[label] = occurrence + 1
+            fields = REPEATED_HEADERS[label]
+            if occurrence < len(fields):
+                columns.setdefault(fields[occurrence], index)
+        elif label in HEADER_ALIASES:
+            columns.setdefault(HEADER_ALIASES[label], index)
+
+    if {"symbol", "position_type", "open_time", "profit"} <= columns.keys():
+        return columns
+    return None
+
+
+def parse_statement_rows(rows):
+    """
+    Turn the raw table rows of a statement into dicts keyed by Position field
+    names. Only the positions tables (and the balance rows of deal tables)
+    are kept; every other section of the report is skipped.
+    """
+    columns = None
+    deals_table = False
+    for row in rows:
+        filled = [cell for cell in row if str(cell).strip()]
+        if len(filled) <= 1:
+            # Empty rows and section titles ("Orders", "Open Trades:", ...)
+            # close the current table.
+            columns = None
+            continue
+
+        if columns is None:
+            columns = map_header(row)
+            if columns is not None:
+                labels = [str(cell).strip().lower() for cell in row]
+                deals_table = "deal" in labels and "position" not in labels
+            continue
+
+        values = {
+            field: row[index] if index < len(row) else ""
+            for field, index in columns.items()
+        }
+        position_type = str(values["position_type"]).strip().lower()
+        if position_type not in IMPORTED_TYPES:
+            continue
+        if position_type == "balance":
+            # MT5 deal tables keep the amount in the profit column, MT4
+            # statements merge the row and put it in the last cell.
+            values["amount"] = values["profit"] if deals_table else filled[-1]
+            values["close_time"] = values["open_time"]
+        elif deals_table:
+            continue
+        values["position_type"] = position_type
+        yield values
+
+
+def read_statement(path, statement_format=None):
+    if statement_format is None:
+        statement_format = str(path).rsplit(".", 1)[-1].lower()
+    if statement_format not in STATEMENT_READERS:
+        raise StatementError(f"Unsupported statement format: {statement_format}")
+    return parse_statement_rows(STATEMENT_READERS[statement_format](path))
+
+
+def parse_decimal(value):
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    value = str(value).replace(" ", "").replace("\xa0", "").split("/")[0]
+    if not value:
+        return Decimal(0)
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise StatementError(f"Invalid number: {value}")
+
+
+def parse_datetime(value, tz=None):
+    if not isinstance(value, datetime):
+        value = str(value).strip()
+        try:
+            value = datetime.fromisoformat(value.replace(".", "-", 2))
+        except ValueError:
+            for datetime_format in DATETIME_FORMATS:
+                try:
+                    value = datetime.strptime(value, datetime_format)
+                    break
+                except ValueError:
+                    pass
+            else:
+                raise StatementError(f"Invalid date: {value}")
+
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, tz or timezone.get_current_timezone())
+    return value
+
+
+def get_existing_positions(positions):
+    """
+    `{(account_id, position_id): (pk, close_time)}` of the stored positions
+    that `positions` would overwrite.
+    """
+    return {
+        (account_id, position_id): (pk, close_time)
+        for pk, account_id, position_id, close_time in Position.objects.filter(
+            account_id__in={position.account_id for position in positions},
+            position_id__in={position.position_id for position in positions},
+        ).values_list("pk", "account_id", "position_id", "close_time")
+    }
+
+
+def merge_changes(changes, other):
+    """
+    Merge the `{account_id: since}` mapping `other` into `changes`, keeping
+    the earliest time of every account.
+    """
+    for account_id, since in other.items():
+        if account_id not in changes or since < changes[account_id]:
+            changes[account_id] = since
+    return changes
+
+
+def upsert_positions(positions):
+    """
+    Insert `positions`, or update the existing rows with the same
+    (account, position_id), so importing the same trades twice is a no-op.
+
+    Returns `{account_id: since}`, the earliest close time affected in every
+    account: an updated position counts with both its previous and its new
+    close time, since moving it changes everything after the earlier one.
+    """
+    with transaction.atomic():
+        existing = get_existing_positions(positions)
+        changes = {}
+        for position in positions:
+            since = position.close_time
+            pk, close_time = existing.get(
+                (position.account_id, position.position_id), (None, None)
+            )
+            if close_time is not None and close_time < since:
+                since = close_time
+            merge_changes(changes, {position.account_id: since})
+
+        if connection.features.supports_update_conflicts_with_target:
+            Position.objects.bulk_create(
+                positions,
+                update_conflicts=True,
+                unique_fields=UPSERT_UNIQUE_FIELDS,
+                update_fields=UPSERT_UPDATE_FIELDS,
+            )
+            return changes
+
+        # Fallback for backends without `ON CONFLICT (...) DO UPDATE`.
+        new_positions = []
+        updated_positions = []
+        for position in positions:
+            pk, close_time = existing.get(
+                (position.account_id, position.position_id), (None, None)
+            )
+            if pk is None:
+                new_positions.append(position)
+            else:
+                position.pk = pk
+                position.last_updated_at = timezone.now()
+                updated_positions.append(position)
+
+        Position.objects.bulk_create(new_positions)
+        Position.objects.bulk_update(updated_positions, UPSERT_UPDATE_FIELDS)
+        return changes
+
+
+class PositionImporter:
+    """
+    Convert parsed statement rows into `Position` rows, upserted on
+    (account, position_id) in fixed-size batches.
+
+    Symbols and accounts are resolved through lookups loaded once, so the
+    database only sees one query per new symbol and one per batch.
+    """
+
+    def __init__(self, account=None, batch_size=IMPORT_BATCH_SIZE, tz=None, user=None):
+        self.account = account
+        self.batch_size = batch_size
+        self.tz = tz
+        self.user = user
+        self.accounts = {
+            account_id: pk
+            for account_id, pk in Account.objects.values_list("account_id", "pk")
+            if account_id
+        }
+        self.symbols = dict(Symbol.objects.values_list("name", "pk"))
+        self.imported = 0
+        self.changes = {}
+
+    def get_account_id(self, values):
+        account_id = str(values.get("account") or "").strip()
+        if account_id:
+            if account_id not in self.accounts:
+                raise StatementError(f"Unknown account: {account_id}")
+            return self.accounts[account_id]
+        if self.account is None:
+            raise StatementError("No account given for the imported positions.")
+        return self.account.pk
+
+    def get_symbol_id(self, name):
+        name = name or CASH_SYMBOL_NAME
+        if name not in self.symbols:
+            self.symbols[name] = Symbol.objects.create(name=name, created_by=self.user).pk
+        return self.symbols[name]
+
+    def build_position(self, values):
+        position_type = values["position_type"]
+        symbol = str(values.get("symbol") or "").strip().upper()
+        if position_type == "balance":
+            amount = parse_decimal(values.get("amount", ""))
+            position_type = "deposit" if amount >= 0 else "withdraw"
+            decimals = dict.fromkeys(DECIMAL_FIELDS, Decimal(0))
+            decimals["amount"] = abs(amount)
+            symbol = ""
+        else:
+            decimals = {
+                field: parse_decimal(values.get(field, ""))
+                for field in DECIMAL_FIELDS
+            }
+
+        open_time = parse_datetime(values["open_time"], self.tz)
+        close_time = open_time
+        if values.get("close_time"):
+            close_time = parse_datetime(values["close_time"], self.tz)
+
+        position_id = str(values.get("position_id") or "").strip()
+        if not position_id:
+            position_id = f"{position_type}-{int(open_time.timestamp())}-{decimals['amount']}"
+
+        return Position(
+            account_id=self.get_account_id(values),
+            symbol_id=self.get_symbol_id(symbol),
+            position_id=position_id,
+            position_type=position_type,
+            open_time=open_time,
+            close_time=close_time,
+            created_by=self.user,
+            **decimals,
+        )
+
+    def flush(self, positions):
+        if not positions:
+            return
+        # A statement may list the same position twice, keep the last one.
+        positions = list({
+            (position.account_id, position.position_id): position
+            for position in positions
+        }.values())
+        merge_changes(self.changes, upsert_positions(positions))
+        self.imported += len(positions)
+
+    def run(self, rows):
+        batch = []
+        try:
+            for values in rows:
+                batch.append(self.build_position(values))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            self.flush(batch)
+        finally:
+            # Batches are committed as they are flushed, the derived data of
+            # those must be refreshed even when a later row fails.
+            for account_id, since in self.changes.items():
+                positions_changed.send(
+                    sender=Position, account_id=account_id, since=since, bulk=True
+                )
+        return self.imported
@@ -0,0 +1,167 @@
+import numpy as np
+
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Q, Sum
+
+from trading_insights.models import Symbol, Position, PositionMetrics
+from trading_insights.settings import TRADE_POSITION_TYPES
+
+
+# Positions computed and upserted per batch.
+METRICS_BATCH_SIZE = 5000
+
+# Columns pulled for each position, keep in sync with `compute_metrics`.
+METRICS_POSITION_COLUMNS = (
+    "id", "account_id", "symbol_id", "position_type", "close_time",
+    "open_price", "close_price", "stop_loss", "take_profit",
+)
+
+METRICS_FIELDS = (
+    "pips", "risk_pips", "reward_pips", "reward_risk_ratio", "r_multiple",
+)
+
+
+def get_pip_values():
+    return {
+        pk: float(pip_value)
+        for pk, pip_value in Symbol.objects.values_list("pk", "pip_value")
+    }
+
+
+def compute_metrics(symbol_ids, position_types, prices, pip_values):
+    """
+    Vectorized metrics of trades. `prices` holds aligned float arrays of
+    `open_price`, `close_price`, `stop_loss` and `take_profit` (0 when not
+    set). Pip sizes are resolved once per symbol group, then broadcast.
+
+    Distances are signed in the trade direction: a stop on the wrong side of
+    the entry (moved to break even or beyond) gives no risk, so no R-multiple.
+    """
+    groups, group_index = np.unique(symbol_ids, return_inverse=True)
+    group_pips = np.array([pip_values.get(int(symbol_id), 0.0) for symbol_id in groups])
+    pip = group_pips[group_index] if groups.size else np.empty(0)
+    pip = np.where(pip > 0, pip, np.nan)
+
+    direction = np.where(position_types == "sell", -1.0, 1.0)
+    open_price = prices["open_price"]
+    stop_loss = np.where(prices["stop_loss"] > 0, prices["stop_loss"], np.nan)
+    take_profit = np.where(prices["take_profit"] > 0, prices["take_profit"], np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pips = direction * (prices["close_price"] - open_price) / pip
+        risk_pips = direction * (open_price - stop_loss) / pip
+        risk_pips = np.where(risk_pips > 0, risk_pips, np.nan)
+        reward_pips = direction * (take_profit - open_price) / pip
+        reward_pips = np.where(reward_pips > 0, reward_pips, np.nan)
+        return {
+            "pips": pips,
+            "risk_pips": risk_pips,
+            "reward_pips": reward_pips,
+            "reward_risk_ratio": reward_pips / risk_pips,
+            "r_multiple": pips / risk_pips,
+        }
+
+
+def _nullable(value):
+    return None if np.isnan(value) else round(value, 6)
+
+
+def build_metrics(rows, pip_values):
+    """
+    `PositionMetrics` of `rows` of `METRICS_POSITION_COLUMNS`.
+    """
+    ids, account_ids, symbol_ids, position_types, close_times, *price_columns = zip(*rows)
+    prices = {
+        name: np.array(values, dtype=np.float64)
+        for name, values in zip(METRICS_POSITION_COLUMNS[5:], price_columns)
+    }
+    metrics = compute_metrics(
+        np.array(symbol_ids, dtype=np.int64), np.array(position_types), prices, pip_values
+    )
+    columns = [metrics[name].tolist() for name in METRICS_FIELDS]
+    return [
+        PositionMetrics(
+            position_id=ids[index], account_id=account_ids[index],
+            symbol_id=symbol_ids[index], close_time=close_times[index],
+            **{name: _nullable(column[index]) for name, column in zip(METRICS_FIELDS, columns)},
+        )
+        for index in range(len(ids))
+    ]
+
+
+def save_metrics(metrics):
+    update_fields = ["account", "symbol", "close_time", *METRICS_FIELDS]
+    if connection.features.supports_update_conflicts_with_target:
+        PositionMetrics.objects.bulk_create(
+            metrics, update_conflicts=True,
+            unique_fields=["position"], update_fields=update_fields,
+        )
+        return
+
+    # Fallback for backends without `ON CONFLICT (...) DO UPDATE`.
+    PositionMetrics.objects.filter(
+        position_id__in=[item.position_id for item in metrics]
+    ).delete()
+    PositionMetrics.objects.bulk_create(metrics)
+
+
+def refresh_position_metrics(positions, batch_size=METRICS_BATCH_SIZE):
+    """
+    Compute and store the metrics of the trades in the `positions`
+    queryset, in batches of `batch_size`. Metrics of positions that are no
+    longer trades are dropped. Returns the number of trades refreshed.
+    """
+    pip_values = get_pip_values()
+    refreshed = 0
+    with transaction.atomic():
+        PositionMetrics.objects.filter(position__in=positions).exclude(
+            position__position_type__in=TRADE_POSITION_TYPES
+        ).delete()
+
+        rows = positions.filter(position_type__in=TRADE_POSITION_TYPES).order_by(
+        ).values_list(*METRICS_POSITION_COLUMNS).iterator(chunk_size=batch_size)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                save_metrics(build_metrics(batch, pip_values))
+                refreshed += len(batch)
+                batch = []
+        if batch:
+            save_metrics(build_metrics(batch, pip_values))
+            refreshed += len(batch)
+    return refreshed
+
+
+def rebuild_position_metrics(account_id=None, since=None, symbol_id=None):
+    positions = Position.objects.all()
+    if account_id is not None:
+        positions = positions.filter(account_id=account_id)
+    if since is not None:
+        positions = positions.filter(close_time__gte=since)
+    if symbol_id is not None:
+        positions = positions.filter(symbol_id=symbol_id)
+    return refresh_position_metrics(positions)
+
+
+def get_symbol_edges(account, date_from=None, date_to=None):
+    """
+    Per symbol edge of `account` from the stored metrics: pips, R-multiples
+    of the trades with a stop, and the planned reward/risk.
+    """
+    metrics = PositionMetrics.objects.filter(account=account)
+    if date_from is not None:
+        metrics = metrics.filter(close_time__gte=date_from)
+    if date_to is not None:
+        metrics = metrics.filter(close_time__lt=date_to)
+
+    return list(metrics.values(symbol_name=F("symbol__name")).annotate(
+        trade_count=Count("position"),
+        win_count=Count("position", filter=Q(pips__gt=0)),
+        total_pips=Sum("pips", default=0.0),
+        average_pips=Avg("pips"),
+        risked_count=Count("r_multiple"),
+        total_r=Sum("r_multiple", default=0.0),
+        expectancy_r=Avg("r_multiple"),
+        average_reward_risk_ratio=Avg("reward_risk_ratio"),
+    ).order_by("-total_r", "symbol_name"))
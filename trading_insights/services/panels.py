@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, time, timedelta
+
+import numpy as np
+
+from django.utils import timezone
+
+from trading_insights.models import Scenario
+from trading_insights.services.dashboard import DASHBOARD_CURVE_DAYS
+from trading_insights.services.durations import aget_duration_statistics
+from trading_insights.services.statistics import aget_account_statistics
+from trading_insights.services.tracking import (
+    aget_daily_balances,
+    acompare_scenario
+)
+
+
+def to_series(array):
+    """
+    JSON friendly list of a NumPy array: ISO dates, rounded floats and None
+    for missing (NaN) values.
+    """
+    if np.issubdtype(array.dtype, np.datetime64):
+        return np.datetime_as_string(array, unit="D").tolist()
+    if np.issubdtype(array.dtype, np.floating):
+        return [None if np.isnan(value) else round(value, 2) for value in array.tolist()]
+    return array.tolist()
+
+
+def serialize_report(report):
+    return {
+        name: to_series(value) if isinstance(value, np.ndarray) else value
+        for name, value in report.items()
+    }
+
+
+async def aget_equity_panel(account, today=None):
+    today = today or timezone.localdate()
+    first_day = today - timedelta(days=DASHBOARD_CURVE_DAYS - 1)
+    balances = await aget_daily_balances(account, first_day, today)
+    return {
+        "dates": to_series(np.arange(
+            np.datetime64(first_day, "D"), np.datetime64(today, "D") + 1
+        )),
+        "balances": to_series(balances),
+    }
+
+
+async def aget_scenario_panel(scenario, today=None):
+    return {
+        "id": scenario.pk,
+        "name": scenario.name,
+        **serialize_report(await acompare_scenario(scenario, today)),
+    }
+
+
+async def aget_account_panels(account, today=None):
+    """
+    Every analytics panel of `account`: all time and current month
+    statistics, holding periods, the recent equity curve and the tracking
+    of each of its scenarios. Panels are independent and computed concurrently, their
+    queries go through the async ORM and their NumPy work through the
+    bounded executor.
+    """
+    today = today or timezone.localdate()
+    month_start = timezone.make_aware(datetime.combine(today.replace(day=1), time.min))
+    scenarios = [
+        scenario
+        async for scenario in Scenario.objects.filter(account=account).order_by("name", "id")
+    ]
+    for scenario in scenarios:
+        scenario.account = account
+
+    statistics, month_statistics, durations, equity, *scenario_panels = await asyncio.gather(
+        aget_account_statistics(account),
+        aget_account_statistics(account, date_from=month_start),
+        aget_duration_statistics(account),
+        aget_equity_panel(account, today),
+        *(aget_scenario_panel(scenario, today) for scenario in scenarios),
+    )
+    return {
+        "account": {"id": account.pk, "name": str(account)},
+        "date": today,
+        "statistics": statistics,
+        "month_statistics": month_statistics,
+        "durations": durations,
+        "equity": equity,
+        "scenarios": scenario_panels,
+    }
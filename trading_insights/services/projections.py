@@ -0,0 +1,163 @@
+from datetime import date
+
+import numpy as np
+
+from lava_light.executors import run_in_executor
+
+from trading_insights.models import ScenarioLine
+from trading_insights.settings import (
+    SCENARIO_TRADING_WEEKDAYS,
+    SCENARIO_WITHDRAWAL_WEEKDAY
+)
+
+
+# Columns pulled for each scenario line, keep in sync with `project_lines`.
+SCENARIO_LINE_COLUMNS = (
+    "start_date", "end_date", "start_amount", "target_amount",
+    "daily_profit_ratio", "weekly_withdrawal_amount",
+)
+
+
+def get_line_dates(start_date, end_date):
+    """
+    Every day from `start_date` to `end_date` included, as `datetime64[D]`.
+    """
+    return np.arange(
+        np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1,
+        dtype="datetime64[D]"
+    )
+
+
+def get_weekdays(dates):
+    # 1970-01-01, day 0 of `datetime64[D]`, was a Thursday.
+    return (dates.astype(np.int64) + 3) % 7
+
+
+def compute_projection(
+    dates,
+    start_amount,
+    daily_profit_ratio,
+    weekly_withdrawal_amount,
+    trading_weekdays=SCENARIO_TRADING_WEEKDAYS,
+    withdrawal_weekday=SCENARIO_WITHDRAWAL_WEEKDAY,
+):
+    """
+    Project the end of day balance over `dates`, compounding
+    `daily_profit_ratio` (a percentage) on trading days and taking
+    `weekly_withdrawal_amount` once a week.
+
+    With `g` the growth factor of each day and `G` its cumulative product,
+    `b[t] = g[t] * b[t - 1] - w[t]` unrolls to
+    `b[t] = G[t] * (start_amount - cumsum(w / G)[t])`, so the whole path is
+    computed without a Python loop. Once the balance is exhausted it stays
+    at zero and no more withdrawals are taken.
+
+    Returns the balances along with the daily profits and withdrawals.
+    """
+    weekdays = get_weekdays(dates)
+    ratio = float(daily_profit_ratio) / 100
+    growth = np.where(np.isin(weekdays, trading_weekdays), 1 + ratio, 1.0)
+    withdrawals = np.where(
+        weekdays == withdrawal_weekday, float(weekly_withdrawal_amount), 0.0
+    )
+
+    cumulative_growth = np.cumprod(growth)
+    balances = cumulative_growth * (
+        float(start_amount) - np.cumsum(withdrawals / cumulative_growth)
+    )
+
+    exhausted = np.flatnonzero(balances <= 0)
+    if exhausted.size:
+        first = exhausted[0]
+        # Only what was left could be withdrawn on the last day.
+        previous = balances[first - 1] if first else float(start_amount)
+        withdrawals[first] = max(previous * growth[first], 0.0)
+        withdrawals[first + 1:] = 0.0
+        balances[first:] = 0.0
+
+    opening = np.concatenate(([float(start_amount)], balances[:-1]))
+    profits = opening * (growth - 1)
+    return balances, profits, withdrawals
+
+
+def get_target_date(dates, balances, target_amount):
+    """
+    First day the balance reaches `target_amount`, or None.
+    """
+    reached = np.flatnonzero(balances >= float(target_amount))
+    if not reached.size:
+        return None
+    return dates[reached[0]].astype(date)
+
+
+def get_scenario_lines(scenario):
+    return ScenarioLine.objects.filter(scenario=scenario).order_by(
+        "start_date", "id"
+    ).values_list(*SCENARIO_LINE_COLUMNS)
+
+
+def project_lines(rows, chain=False):
+    """
+    Expand scenario lines, given as rows of `SCENARIO_LINE_COLUMNS` in date
+    order, into daily series. No database access, see `project_scenario`.
+    """
+    parts = {"dates": [], "balances": [], "profits": [], "withdrawals": [], "line": []}
+    lines = []
+    balance = None
+    for index, (
+        start_date, end_date, start_amount, target_amount,
+        daily_profit_ratio, weekly_withdrawal_amount,
+    ) in enumerate(rows):
+        if chain and balance is not None:
+            start_amount = balance
+
+        dates = get_line_dates(start_date, end_date)
+        balances, profits, withdrawals = compute_projection(
+            dates, start_amount, daily_profit_ratio, weekly_withdrawal_amount
+        )
+        if balances.size:
+            balance = float(balances[-1])
+
+        parts["dates"].append(dates)
+        parts["balances"].append(balances)
+        parts["profits"].append(profits)
+        parts["withdrawals"].append(withdrawals)
+        parts["line"].append(np.full(dates.size, index, dtype=np.int64))
+        lines.append({
+            "start_date": start_date,
+            "end_date": end_date,
+            "start_amount": float(start_amount),
+            "target_amount": float(target_amount),
+            "end_amount": float(balances[-1]) if balances.size else float(start_amount),
+            "profit": float(profits.sum()),
+            "withdrawals": float(withdrawals.sum()),
+            "target_date": get_target_date(dates, balances, target_amount),
+        })
+
+    projection = {
+        "dates": np.concatenate(parts["dates"]) if lines else np.empty(0, "datetime64[D]"),
+        "balances": np.concatenate(parts["balances"]) if lines else np.empty(0),
+        "profits": np.concatenate(parts["profits"]) if lines else np.empty(0),
+        "withdrawals": np.concatenate(parts["withdrawals"]) if lines else np.empty(0),
+        "line": np.concatenate(parts["line"]) if lines else np.empty(0, np.int64),
+    }
+    projection["lines"] = lines
+    return projection
+
+
+def project_scenario(scenario, chain=False):
+    """
+    Expand every line of `scenario` into a daily series and concatenate them
+    in date order. Each line starts from its own `start_amount`, or from the
+    previous line's last balance when `chain` is set.
+
+    Returns a dict of aligned arrays (`dates`, `balances`, `profits`,
+    `withdrawals`, `line`: the index of the line of each day) and a `lines`
+    list with the outcome of every line.
+    """
+    return project_lines(get_scenario_lines(scenario), chain)
+
+
+async def aproject_scenario(scenario, chain=False):
+    rows = [row async for row in get_scenario_lines(scenario)]
+    return await run_in_executor(project_lines, rows, chain)
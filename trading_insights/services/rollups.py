@@ -0,0 +1,175 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import Abs, Trunc
+from django.utils import timezone
+
+from trading_insights.models import Position, PositionRollup
+from trading_insights.settings import (
+    ROLLUP_PERIOD_CHOICES,
+    TRADE_POSITION_TYPES
+)
+
+
+ROLLUP_PERIODS = tuple(period for period, _label in ROLLUP_PERIOD_CHOICES)
+
+ROLLUP_FIELDS = (
+    "trade_count", "win_count", "loss_count", "gross_profit", "gross_loss",
+    "commission", "swap", "volume", "deposits", "withdrawals",
+)
+
+# Position columns a rollup depends on, remembered before each save.
+ROLLUP_POSITION_COLUMNS = (
+    "account_id", "symbol_id", "position_type", "close_time",
+    "volume", "profit", "commission", "swap", "amount",
+)
+
+
+def get_period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def get_contribution(state):
+    """
+    What a position, given as a dict of `ROLLUP_POSITION_COLUMNS`, adds to
+    its rollups.
+    """
+    contribution = dict.fromkeys(ROLLUP_FIELDS, 0)
+    position_type = state["position_type"]
+    if position_type in TRADE_POSITION_TYPES:
+        net = state["profit"] + state["commission"] + state["swap"]
+        contribution.update({
+            "trade_count": 1,
+            "win_count": int(net > 0),
+            "loss_count": int(net < 0),
+            "gross_profit": max(net, 0),
+            "gross_loss": max(-net, 0),
+            "commission": state["commission"],
+            "swap": state["swap"],
+            "volume": state["volume"],
+        })
+    elif position_type == "deposit":
+        contribution["deposits"] = abs(state["amount"])
+    elif position_type == "withdraw":
+        contribution["withdrawals"] = abs(state["amount"])
+    return contribution
+
+
+def apply_rollup_delta(state, sign=1):
+    """
+    Add (`sign=1`) or remove (`sign=-1`) a position's contribution to the
+    day, week and month rollups it falls in.
+    """
+    contribution = get_contribution(state)
+    if not any(contribution.values()):
+        return
+
+    day = timezone.localtime(state["close_time"]).date()
+    changes = {
+        name: F(name) + sign * value for name, value in contribution.items() if value
+    }
+    keys = Q()
+    with transaction.atomic():
+        for period in ROLLUP_PERIODS:
+            key = {
+                "account_id": state["account_id"], "symbol_id": state["symbol_id"],
+                "period": period, "period_start": get_period_start(day, period),
+            }
+            keys |= Q(**key)
+            if not PositionRollup.objects.filter(**key).update(**changes):
+                PositionRollup.objects.create(**key, **{
+                    name: sign * value for name, value in contribution.items()
+                })
+        if sign < 0:
+            PositionRollup.objects.filter(
+                keys, trade_count=0, deposits=0, withdrawals=0
+            ).delete()
+
+
+def update_rollups(previous, current):
+    """
+    Move a saved position's contribution from its `previous` state to its
+    `current` one, either may be None.
+    """
+    if previous == current:
+        return
+    if previous is not None:
+        apply_rollup_delta(previous, sign=-1)
+    if current is not None:
+        apply_rollup_delta(current)
+
+
+def get_rollup_aggregates():
+    net = F("profit") + F("commission") + F("swap")
+    is_trade = Q(position_type__in=TRADE_POSITION_TYPES)
+    is_win = Q(is_trade, net_profit__gt=0)
+    is_loss = Q(is_trade, net_profit__lt=0)
+    return {
+        "trade_count": Count("id", filter=is_trade),
+        "win_count": Count("id", filter=is_win),
+        "loss_count": Count("id", filter=is_loss),
+        "gross_profit": Sum("net_profit", filter=is_win, default=Decimal(0)),
+        "gross_loss": Sum(-F("net_profit"), filter=is_loss, default=Decimal(0)),
+        "commission": Sum("commission", filter=is_trade, default=Decimal(0)),
+        "swap": Sum("swap", filter=is_trade, default=Decimal(0)),
+        "volume": Sum("volume", filter=is_trade, default=Decimal(0)),
+        "deposits": Sum(Abs("amount"), filter=Q(position_type="deposit"), default=Decimal(0)),
+        "withdrawals": Sum(Abs("amount"), filter=Q(position_type="withdraw"), default=Decimal(0)),
+    }, net
+
+
+def rebuild_rollups(account_id, since=None):
+    """
+    Recompute the rollups of an account from the period containing `since`
+    (or from the start) with one aggregate query per period. Used after bulk
+    changes that do not send per-row signals.
+    """
+    tz = timezone.get_current_timezone()
+    since_day = timezone.localtime(since).date() if since is not None else None
+    created = 0
+    with transaction.atomic():
+        for period in ROLLUP_PERIODS:
+            rollups = PositionRollup.objects.filter(account_id=account_id, period=period)
+            positions = Position.objects.filter(account_id=account_id)
+            if since_day is not None:
+                period_start = get_period_start(since_day, period)
+                rollups = rollups.filter(period_start__gte=period_start)
+                positions = positions.filter(close_time__gte=timezone.make_aware(
+                    datetime.combine(period_start, time.min), tz
+                ))
+            rollups.delete()
+
+            aggregates, net = get_rollup_aggregates()
+            rows = positions.annotate(
+                net_profit=net,
+                rollup_start=Trunc("close_time", period, output_field=DateField(), tzinfo=tz),
+            ).order_by().values("symbol_id", "rollup_start").annotate(**aggregates)
+
+            new_rollups = [
+                PositionRollup(
+                    account_id=account_id, symbol_id=row["symbol_id"], period=period,
+                    period_start=row["rollup_start"],
+                    **{name: row[name] for name in ROLLUP_FIELDS},
+                )
+                for row in rows
+            ]
+            PositionRollup.objects.bulk_create(new_rollups)
+            created += len(new_rollups)
+    return created
+
+
+def get_rollups(account, period, date_from=None, date_to=None, symbol=None):
+    rollups = PositionRollup.objects.filter(account=account, period=period)
+    if symbol is not None:
+        rollups = rollups.filter(symbol=symbol)
+    if date_from is not None:
+        rollups = rollups.filter(period_start__gte=date_from)
+    if date_to is not None:
+        rollups = rollups.filter(period_start__lt=date_to)
+    return rollups.order_by("period_start", "symbol")
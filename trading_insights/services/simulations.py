@@ -0,0 +1,230 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from trading_insights.services.projections import (
+    SCENARIO_LINE_COLUMNS,
+    get_scenario_lines,
+    get_line_dates,
+    get_weekdays
+)
+from trading_insights.services.statistics import (
+    get_account_positions,
+    load_position_arrays,
+    split_cash_flows,
+    compute_equity_path
+)
+from trading_insights.settings import (
+    TRADE_POSITION_TYPES,
+    SCENARIO_TRADING_WEEKDAYS,
+    SCENARIO_WITHDRAWAL_WEEKDAY
+)
+
+
+SIMULATION_PATHS = 10_000
+
+# Paths simulated per task, a batch holds `batch_size x days` floats.
+SIMULATION_BATCH_SIZE = 1000
+
+# A path is ruined once its balance falls below this share of the start amount.
+SIMULATION_RUIN_RATIO = 0.5
+
+SIMULATION_PERCENTILES = (50, 75, 90, 95, 99)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def get_trade_returns(arrays, starting_balance):
+    """
+    Return of every trade relative to the balance right before it, and the
+    POSIX close time of these trades.
+    """
+    cash, pnl = split_cash_flows(arrays)
+    balances, _peaks = compute_equity_path(cash, pnl, balance=float(starting_balance))
+    if not balances.size:
+        return np.empty(0), np.empty(0)
+
+    opening = balances - cash - pnl
+    is_trade = np.isin(arrays["position_type"], TRADE_POSITION_TYPES) & (opening > 0)
+    return pnl[is_trade] / opening[is_trade], arrays["close_time"][is_trade]
+
+
+def get_daily_returns(trade_returns, close_times, trading_weekdays=SCENARIO_TRADING_WEEKDAYS):
+    """
+    Compound trade returns per (UTC) day, from the first to the last trading
+    day of the history. Trading days without trades count as a zero return.
+    """
+    if not trade_returns.size:
+        return np.empty(0)
+
+    days = (close_times // SECONDS_PER_DAY).astype(np.int64)
+    first_day = days.min()
+    log_returns = np.bincount(
+        days - first_day, weights=np.log1p(np.maximum(trade_returns, -0.999999))
+    )
+    calendar = np.arange(first_day, first_day + log_returns.size).astype("datetime64[D]")
+    is_trading_day = np.isin(get_weekdays(calendar), trading_weekdays)
+    return np.expm1(log_returns[is_trading_day | (log_returns != 0)])
+
+
+def get_historical_returns(account, mode="day"):
+    """
+    Sample of historical returns of `account`, per trading day (`mode="day"`)
+    or per trade (`mode="trade"`), along with the average number of trades
+    per trading day.
+    """
+    arrays = load_position_arrays(get_account_positions(account))
+    trade_returns, close_times = get_trade_returns(arrays, account.starting_balance)
+    daily_returns = get_daily_returns(trade_returns, close_times)
+    trades_per_day = trade_returns.size / daily_returns.size if daily_returns.size else 0.0
+    if mode == "trade":
+        return trade_returns, trades_per_day
+    return daily_returns, trades_per_day
+
+
+def simulate_batch(
+    seed, paths, returns, trading_days, withdrawals, start_amount,
+    target_amount, ruin_amount, steps_per_day=1,
+):
+    """
+    Simulate `paths` balance paths as one matrix: each trading day draws
+    `steps_per_day` returns from `returns`, each day then takes its
+    `withdrawals`. Runs in the worker processes, no database access here.
+    """
+    days = trading_days.size
+    if not days:
+        # A line ending before it starts keeps its start amount, as in the
+        # projections, and no day reaches the target nor the ruin amount.
+        return {
+            "reached": 0,
+            "ruined": 0,
+            "max_drawdowns": np.zeros(paths),
+            "end_amounts": np.full(paths, float(start_amount)),
+        }
+
+    rng = np.random.default_rng(seed)
+    trading_count = int(trading_days.sum())
+
+    samples = rng.choice(returns, size=(paths, trading_count, steps_per_day))
+    growth = np.ones((paths, days))
+    growth[:, trading_days] = np.prod(1 + samples, axis=2)
+
+    # Same closed form as the projections: b = G * (b0 - cumsum(w / G)).
+    cumulative_growth = np.cumprod(growth, axis=1)
+    balances = cumulative_growth * (
+        start_amount - np.cumsum(withdrawals / cumulative_growth, axis=1)
+    )
+    exhausted = np.maximum.accumulate(balances <= 0, axis=1)
+    balances[exhausted] = 0.0
+
+    # Drawdowns only measure trading losses, withdrawals are not losses.
+    drawdowns = 1 - cumulative_growth / np.maximum.accumulate(cumulative_growth, axis=1)
+    return {
+        "reached": int((balances >= target_amount).any(axis=1).sum()),
+        "ruined": int((balances < ruin_amount).any(axis=1).sum()),
+        "max_drawdowns": drawdowns.max(axis=1),
+        "end_amounts": balances[:, -1],
+    }
+
+
+def simulate_line(
+    line, returns, paths=SIMULATION_PATHS, seed=None, steps_per_day=1,
+    batch_size=SIMULATION_BATCH_SIZE, ruin_ratio=SIMULATION_RUIN_RATIO,
+    executor=None,
+):
+    """
+    Monte Carlo `paths` resamples of `returns` over the days of a scenario
+    `line` (a dict of `SCENARIO_LINE_COLUMNS`). Batches are spread over
+    `executor` when given. Every batch gets its own child of `seed` (an int
+    or a `SeedSequence`), so results do not depend on the number of workers.
+    """
+    dates = get_line_dates(line["start_date"], line["end_date"])
+    weekdays = get_weekdays(dates)
+    trading_days = np.isin(weekdays, SCENARIO_TRADING_WEEKDAYS)
+    withdrawals = np.where(
+        weekdays == SCENARIO_WITHDRAWAL_WEEKDAY, float(line["weekly_withdrawal_amount"]), 0.0
+    )
+    start_amount = float(line["start_amount"])
+    target_amount = float(line["target_amount"])
+
+    sizes = [min(batch_size, paths - offset) for offset in range(0, paths, batch_size)]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+    arguments = [
+        (
+            batch_seed, size, returns, trading_days, withdrawals, start_amount,
+            target_amount, start_amount * ruin_ratio, steps_per_day,
+        )
+        for batch_seed, size in zip(seeds, sizes)
+    ]
+    if executor is None:
+        batches = [simulate_batch(*batch_arguments) for batch_arguments in arguments]
+    else:
+        batches = list(executor.map(simulate_batch, *zip(*arguments)))
+
+    max_drawdowns = np.concatenate([batch["max_drawdowns"] for batch in batches])
+    end_amounts = np.concatenate([batch["end_amounts"] for batch in batches])
+    return {
+        "start_date": line["start_date"],
+        "end_date": line["end_date"],
+        "start_amount": start_amount,
+        "target_amount": target_amount,
+        "paths": paths,
+        "days": int(dates.size),
+        "target_probability": sum(batch["reached"] for batch in batches) / paths,
+        "ruin_probability": sum(batch["ruined"] for batch in batches) / paths,
+        "drawdown_percentiles": dict(zip(
+            SIMULATION_PERCENTILES,
+            np.percentile(max_drawdowns, SIMULATION_PERCENTILES).tolist()
+        )),
+        "end_amount_percentiles": dict(zip(
+            SIMULATION_PERCENTILES,
+            np.percentile(end_amounts, SIMULATION_PERCENTILES).tolist()
+        )),
+    }
+
+
+def simulate_scenario(
+    scenario, account=None, mode="day", paths=SIMULATION_PATHS, seed=None,
+    workers=None, batch_size=SIMULATION_BATCH_SIZE, ruin_ratio=SIMULATION_RUIN_RATIO,
+):
+    """
+    Stress test every line of `scenario` against the historical returns of
+    `account` (the scenario's account by default). `mode` resamples per
+    trading day ("day") or per trade ("trade", with the historical number of
+    trades per day). `workers=1` runs in the current process.
+
+    Returns one result per line, in date order.
+    """
+    account = account or scenario.account
+    if account is None:
+        raise ValueError("The scenario has no account to sample returns from.")
+
+    returns, trades_per_day = get_historical_returns(account, mode)
+    if not returns.size:
+        raise ValueError("The account has no trades to sample returns from.")
+    steps_per_day = max(int(round(trades_per_day)), 1) if mode == "trade" else 1
+
+    lines = [
+        dict(zip(SCENARIO_LINE_COLUMNS, row))
+        for row in get_scenario_lines(scenario)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(lines))
+    options = {
+        "paths": paths, "steps_per_day": steps_per_day,
+        "batch_size": batch_size, "ruin_ratio": ruin_ratio,
+    }
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [
+            simulate_line(line, returns, seed=line_seed, **options)
+            for line, line_seed in zip(lines, seeds)
+        ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [
+            simulate_line(line, returns, seed=line_seed, executor=executor, **options)
+            for line, line_seed in zip(lines, seeds)
+        ]
@@ -0,0 +1,237 @@
+import numpy as np
+
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Abs
+
+from lava_light.executors import run_in_executor
+
+from trading_insights.models import Position
+from trading_insights.settings import (
+    TRADE_POSITION_TYPES,
+    CASH_POSITION_TYPES
+)
+
+
+# Columns pulled from the database in a single `values_list` query.
+# Keep the order in sync with `positions_to_arrays`.
+POSITION_COLUMNS = (
+    "id", "position_type", "open_time", "close_time",
+    "volume", "profit", "commission", "swap", "amount",
+)
+
+
+def get_account_positions(account, date_from=None, date_to=None):
+    positions = Position.objects.filter(account=account)
+    if date_from is not None:
+        positions = positions.filter(close_time__gte=date_from)
+    if date_to is not None:
+        positions = positions.filter(close_time__lt=date_to)
+    return positions.order_by("close_time", "id")
+
+
+def get_balance_aggregates():
+    return {
+        "pnl": Sum(
+            F("profit") + F("commission") + F("swap"),
+            filter=Q(position_type__in=TRADE_POSITION_TYPES)
+        ),
+        "deposits": Sum(Abs("amount"), filter=Q(position_type="deposit")),
+        "withdrawals": Sum(Abs("amount"), filter=Q(position_type="withdraw")),
+    }
+
+
+def _balance_from_totals(account, totals):
+    return (
+        account.starting_balance
+        + (totals["pnl"] or 0)
+        + (totals["deposits"] or 0)
+        - (totals["withdrawals"] or 0)
+    )
+
+
+def get_balance_before(account, moment):
+    """
+    Balance of `account` right before `moment`, aggregated in the database.
+    """
+    positions = Position.objects.filter(account=account, close_time__lt=moment)
+    return _balance_from_totals(account, positions.aggregate(**get_balance_aggregates()))
+
+
+async def aget_balance_before(account, moment):
+    positions = Position.objects.filter(account=account, close_time__lt=moment)
+    return _balance_from_totals(
+        account, await positions.aaggregate(**get_balance_aggregates())
+    )
+
+
+def positions_to_arrays(rows):
+    """
+    Convert rows returned by `values_list(*POSITION_COLUMNS)` into a dict
+    of NumPy arrays, one per column. Times are stored as POSIX timestamps.
+    """
+    rows = list(rows)
+    if not rows:
+        columns = [()] * len(POSITION_COLUMNS)
+    else:
+        columns = list(zip(*rows))
+
+    (
+        ids, position_types, open_times, close_times,
+        volumes, profits, commissions, swaps, amounts,
+    ) = columns
+
+    count = len(rows)
+    return {
+        "id": np.fromiter(ids, dtype=np.int64, count=count),
+        "position_type": np.array(position_types, dtype="U16"),
+        "open_time": np.fromiter(
+            (t.timestamp() for t in open_times), dtype=np.float64, count=count
+        ),
+        "close_time": np.fromiter(
+            (t.timestamp() for t in close_times), dtype=np.float64, count=count
+        ),
+        "volume": np.array(volumes, dtype=np.float64),
+        "profit": np.array(profits, dtype=np.float64),
+        "commission": np.array(commissions, dtype=np.float64),
+        "swap": np.array(swaps, dtype=np.float64),
+        "amount": np.array(amounts, dtype=np.float64),
+    }
+
+
+def load_position_arrays(queryset):
+    return positions_to_arrays(queryset.values_list(*POSITION_COLUMNS))
+
+
+async def aload_position_rows(queryset):
+    return [row async for row in queryset.values_list(*POSITION_COLUMNS)]
+
+
+def split_cash_flows(arrays):
+    """
+    Return two aligned arrays: the signed cash movement (deposits and
+    withdrawals) and the net trading result (profit + commission + swap)
+    of every row. Each row contributes to exactly one of them.
+    """
+    position_types = arrays["position_type"]
+    is_trade = np.isin(position_types, TRADE_POSITION_TYPES)
+    is_withdraw = position_types == "withdraw"
+    is_cash = np.isin(position_types, CASH_POSITION_TYPES)
+
+    amounts = np.abs(arrays["amount"])
+    cash = np.where(is_cash, np.where(is_withdraw, -amounts, amounts), 0.0)
+    pnl = np.where(
+        is_trade, arrays["profit"] + arrays["commission"] + arrays["swap"], 0.0
+    )
+    return cash, pnl
+
+
+def compute_equity_path(cash, pnl, balance=0.0, peak=None):
+    """
+    Compute the running balance and peak after each row.
+
+    Deposits and withdrawals move both the balance and the peak, so the
+    drawdown (`peak - balance`) only reflects trading losses. `balance` and
+    `peak` are the values before the first row, which makes it possible to
+    continue a previously computed path.
+    """
+    if peak is None:
+        peak = balance
+
+    if not len(pnl):
+        return np.empty(0), np.empty(0)
+
+    cumulative_cash = np.cumsum(cash)
+    cumulative_pnl = np.cumsum(pnl)
+    balances = balance + cumulative_cash + cumulative_pnl
+    peaks = cumulative_cash + np.maximum(
+        peak, balance + np.maximum.accumulate(cumulative_pnl)
+    )
+    return balances, peaks
+
+
+def _ratio(numerator, denominator):
+    if not denominator:
+        return None
+    return float(numerator / denominator)
+
+
+def compute_statistics(arrays, starting_balance=0.0):
+    starting_balance = float(starting_balance)
+    cash, pnl = split_cash_flows(arrays)
+    balances, peaks = compute_equity_path(cash, pnl, balance=starting_balance)
+
+    is_trade = np.isin(arrays["position_type"], TRADE_POSITION_TYPES)
+    trades = pnl[is_trade]
+    wins = trades[trades > 0]
+    losses = trades[trades < 0]
+
+    trade_count = int(trades.size)
+    gross_profit = float(wins.sum())
+    gross_loss = float(-losses.sum())
+    average_win = float(wins.mean()) if wins.size else 0.0
+    average_loss = float(-losses.mean()) if losses.size else 0.0
+    expectancy = float(trades.mean()) if trade_count else 0.0
+
+    drawdowns = peaks - balances
+    max_drawdown = float(drawdowns.max()) if drawdowns.size else 0.0
+    max_drawdown_ratio = None
+    if drawdowns.size:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(peaks > 0, drawdowns / peaks, 0.0)
+        max_drawdown_ratio = float(ratios.max())
+
+    deposits = float(cash[cash > 0].sum())
+    withdrawals = float(np.abs(cash[cash < 0].sum()))
+
+    return {
+        "trade_count": trade_count,
+        "win_count": int(wins.size),
+        "loss_count": int(losses.size),
+        "win_rate": _ratio(wins.size, trade_count),
+        "gross_profit": gross_profit,
+        "gross_loss": gross_loss,
+        "net_profit": float(trades.sum()),
+        "profit_factor": _ratio(gross_profit, gross_loss),
+        "average_win": average_win,
+        "average_loss": average_loss,
+        "payoff_ratio": _ratio(average_win, average_loss),
+        "expectancy": expectancy,
+        # Without per-trade risk, one R is the average losing trade.
+        "average_r": _ratio(expectancy, average_loss),
+        "largest_win": float(wins.max()) if wins.size else 0.0,
+        "largest_loss": float(-losses.min()) if losses.size else 0.0,
+        "total_commission": float(arrays["commission"][is_trade].sum()),
+        "total_swap": float(arrays["swap"][is_trade].sum()),
+        "total_volume": float(arrays["volume"][is_trade].sum()),
+        "deposits": deposits,
+        "withdrawals": withdrawals,
+        "starting_balance": starting_balance,
+        "balance": float(balances[-1]) if balances.size else starting_balance,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_ratio": max_drawdown_ratio,
+    }
+
+
+def get_account_statistics(account, date_from=None, date_to=None):
+    starting_balance = account.starting_balance
+    if date_from is not None:
+        starting_balance = get_balance_before(account, date_from)
+
+    positions = get_account_positions(account, date_from, date_to)
+    arrays = load_position_arrays(positions)
+    return compute_statistics(arrays, starting_balance=starting_balance)
+
+
+async def aget_account_statistics(account, date_from=None, date_to=None):
+    """
+    `get_account_statistics` for async views: the queries go through the
+    async ORM and the NumPy work runs in the bounded executor.
+    """
+    starting_balance = account.starting_balance
+    if date_from is not None:
+        starting_balance = await aget_balance_before(account, date_from)
+
+    rows = await aload_position_rows(get_account_positions(account, date_from, date_to))
+    return await run_in_executor(
+        lambda: compute_statistics(positions_to_arrays(rows), starting_balance)
+    )
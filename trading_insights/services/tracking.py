@@ -0,0 +1,243 @@
+from datetime import datetime, time, timedelta
+
+import numpy as np
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from lava_light.executors import run_in_executor
+
+from trading_insights.models import EquityPoint
+from trading_insights.services.equity import (
+    get_equity_curve,
+    materialize_equity_curve
+)
+from trading_insights.services.projections import (
+    project_scenario,
+    aproject_scenario,
+    get_weekdays
+)
+from trading_insights.settings import SCENARIO_TRADING_WEEKDAYS
+
+
+# Bisection steps used to solve the catch-up ratio, enough for 1e-12 precision.
+CATCH_UP_ITERATIONS = 60
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def fill_daily_balances(points, opening, date_from, days, tz=None):
+    """
+    Dense end of day balances from the `(time, balance)` equity `points` of
+    `days` days from `date_from`, carrying `opening` and then the previous
+    balance forward on days without points. No database access.
+    """
+    balances = np.full(days + 1, np.nan)
+    balances[0] = float(opening)
+    if points:
+        day_indexes = np.fromiter(
+            (
+                (timezone.localtime(moment, tz).date() - date_from).days + 1
+                for moment, _balance in points
+            ),
+            dtype=np.int64, count=len(points)
+        )
+        values = np.array([balance for _moment, balance in points], dtype=np.float64)
+        # Points are in time order, keep the last one of each day.
+        unique_days, reversed_index = np.unique(day_indexes[::-1], return_index=True)
+        balances[unique_days] = values[::-1][reversed_index]
+
+    # Forward fill the days without points.
+    filled = np.where(np.isnan(balances), 0, np.arange(balances.size))
+    return balances[np.maximum.accumulate(filled)][1:]
+
+
+def _get_opening_balance(account, start):
+    return EquityPoint.objects.filter(account=account, time__lt=start).order_by(
+        "-time", "-position_id"
+    ).values_list("balance", flat=True)
+
+
+def get_daily_balances(account, date_from, date_to):
+    """
+    End of day balance of `account` for every day from `date_from` to
+    `date_to` included, as a dense array. Days without a closed position
+    carry the previous balance forward.
+
+    Reads the materialized equity curve, which only replays positions closed
+    since its last update, and only the points within the range.
+    """
+    days = (date_to - date_from).days + 1
+    if days <= 0:
+        return np.empty(0)
+
+    start, end = _start_of_day(date_from), _start_of_day(date_to + timedelta(days=1))
+    points = list(get_equity_curve(account, start, end).values_list("time", "balance"))
+    opening = _get_opening_balance(account, start).first()
+    if opening is None:
+        opening = account.starting_balance
+    return fill_daily_balances(points, opening, date_from, days)
+
+
+async def aget_daily_balances(account, date_from, date_to):
+    days = (date_to - date_from).days + 1
+    if days <= 0:
+        return np.empty(0)
+
+    start, end = _start_of_day(date_from), _start_of_day(date_to + timedelta(days=1))
+    # Appending the pending points writes in a transaction, keep it sync.
+    await sync_to_async(materialize_equity_curve)(account)
+    points = [
+        row async for row in EquityPoint.objects.filter(
+            account=account, time__gte=start, time__lt=end
+        ).order_by("time", "position_id").values_list("time", "balance")
+    ]
+    opening = await _get_opening_balance(account, start).afirst()
+    if opening is None:
+        opening = account.starting_balance
+    return await run_in_executor(
+        fill_daily_balances, points, opening, date_from, days,
+        timezone.get_current_timezone()
+    )
+
+
+def get_days_ahead(planned, balance, day_index):
+    """
+    Days between `day_index` and the first day the plan reaches `balance`:
+    positive when ahead of the plan, negative when behind it, None when the
+    plan never reaches it.
+    """
+    reached = np.flatnonzero(planned >= balance)
+    if not reached.size:
+        return None
+    return int(reached[0] - day_index)
+
+
+def get_catch_up_ratio(balance, target, trading_days, withdrawals):
+    """
+    Daily profit ratio, as a percentage, needed from `balance` to reach
+    `target` at the end of the remaining days, taking the planned
+    `withdrawals` into account. Solved by bisection on the closed form used
+    by `compute_projection`.
+    """
+    if not trading_days.any() or balance <= 0:
+        return None
+
+    def end_balance(ratio):
+        cumulative_growth = np.cumprod(np.where(trading_days, 1 + ratio, 1.0))
+        return cumulative_growth[-1] * (balance - np.sum(withdrawals / cumulative_growth))
+
+    low, high = -0.99, 1.0
+    if end_balance(high) < target:
+        return None
+    if end_balance(low) > target:
+        return low * 100
+    for _index in range(CATCH_UP_ITERATIONS):
+        middle = (low + high) / 2
+        if end_balance(middle) < target:
+            low = middle
+        else:
+            high = middle
+    return high * 100
+
+
+def get_report_day(dates, today=None):
+    """
+    Index of `today` in the scenario `dates`, -1 before the first one.
+    """
+    today = today or timezone.localdate()
+    return int(np.searchsorted(dates, np.datetime64(today, "D"), side="right")) - 1
+
+
+def get_report_range(dates, day_index):
+    """
+    Dates of the account history needed to report on `day_index`.
+    """
+    return dates[0].astype(object), dates[day_index].astype(object)
+
+
+def build_report(projection, day_index=-1, daily_balances=None):
+    """
+    The `compare_scenario` report of a `projection`, given the account
+    `daily_balances` over `get_report_range`. No database access.
+    """
+    dates, planned = projection["dates"], projection["balances"]
+    actual = np.full(planned.size, np.nan)
+    report = {
+        "dates": dates,
+        "planned": planned,
+        "actual": actual,
+        "deviation": actual - planned,
+        "date": None,
+        "planned_balance": None,
+        "actual_balance": None,
+        "days_ahead": None,
+        "catch_up_ratio": None,
+    }
+    if day_index < 0 or daily_balances is None:
+        return report
+
+    # Lines may leave gaps between them, pick the scenario days in the
+    # dense account history.
+    offsets = (dates[:day_index + 1] - dates[0]).astype(np.int64)
+    actual[:day_index + 1] = daily_balances[offsets]
+    report["deviation"] = actual - planned
+
+    balance = float(actual[day_index])
+    remaining = slice(day_index + 1, None)
+    trading_days = np.isin(get_weekdays(dates[remaining]), SCENARIO_TRADING_WEEKDAYS)
+    report.update({
+        "date": dates[day_index].astype(object),
+        "planned_balance": float(planned[day_index]),
+        "actual_balance": balance,
+        "days_ahead": get_days_ahead(planned, balance, day_index),
+        "catch_up_ratio": get_catch_up_ratio(
+            balance, float(planned[-1]), trading_days,
+            projection["withdrawals"][remaining]
+        ),
+    })
+    return report
+
+
+def compare_scenario(scenario, today=None):
+    """
+    Align the projected daily balance of `scenario` with the realized daily
+    balance of its account. Days after `today` have no actual balance (NaN).
+
+    Returns the aligned `dates`, `planned` and `actual` arrays along with the
+    `deviation` (actual - planned) and, as of `today`: the balances,
+    `days_ahead` of the plan and the `catch_up_ratio` needed to end the
+    scenario on its last planned balance.
+    """
+    projection = project_scenario(scenario)
+    if not projection["dates"].size or scenario.account_id is None:
+        return build_report(projection)
+
+    day_index = get_report_day(projection["dates"], today)
+    if day_index < 0:
+        return build_report(projection)
+
+    daily_balances = get_daily_balances(
+        scenario.account, *get_report_range(projection["dates"], day_index)
+    )
+    return build_report(projection, day_index, daily_balances)
+
+
+async def acompare_scenario(scenario, today=None):
+    """
+    `compare_scenario` for async views, `scenario.account` must be loaded.
+    """
+    projection = await aproject_scenario(scenario)
+    if not projection["dates"].size or scenario.account_id is None:
+        return build_report(projection)
+
+    day_index = get_report_day(projection["dates"], today)
+    if day_index < 0:
+        return build_report(projection)
+
+    daily_balances = await aget_daily_balances(
+        scenario.account, *get_report_range(projection["dates"], day_index)
+    )
+    return await run_in_executor(build_report, projection, day_index, daily_balances)
@@ -26,3 +26,32 @@ SYMBOLS = [
     "GBPSGD", "GBPTRY", "NOKJPY", "NOKSEK", "SEKJPY", "SGDJPY",
     "USDCNH", "USDCZK", "USDDKK", "USDHKD",
  ]
+
+
+ROLLUP_PERIOD_CHOICES = (
+    ("day", _("Day")),
+    ("week", _("Week")),
+    ("month", _("Month")),
+)
+
+
+TRADE_POSITION_TYPES = ("buy", "sell")
+
+CASH_POSITION_TYPES = ("deposit", "withdraw")
+
+# Symbol attached to deposit/withdraw positions imported from statements.
+CASH_SYMBOL_NAME = "BALANCE"
+
+# Days (Monday is 0) on which scenario projections apply the daily profit.
+SCENARIO_TRADING_WEEKDAYS = (0, 1, 2, 3, 4)
+
+# Day (Monday is 0) on which scenario projections take the weekly withdrawal,
+# after that day's profit.
+SCENARIO_WITHDRAWAL_WEEKDAY = 4
+
+
+# Time zones offered on the heatmap page, besides `TIME_ZONE`.
+HEATMAP_TIME_ZONES = (
+    "UTC", "Europe/London", "Europe/Paris", "America/New_York", "Asia/Tokyo",
+    "Australia/Sydney",
+)
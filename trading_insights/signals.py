@@ -0,0 +1,119 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from lava_light.caching import bump_version
+
+from trading_insights.models import Account, Symbol, Position
+from trading_insights.services.equity import truncate_equity_curve
+from trading_insights.services.dashboard import ACCOUNT_CACHE_NAMESPACE
+from trading_insights.services.rollups import (
+    ROLLUP_POSITION_COLUMNS,
+    apply_rollup_delta,
+    update_rollups,
+    rebuild_rollups
+)
+from trading_insights.services.metrics import (
+    refresh_position_metrics,
+    rebuild_position_metrics
+)
+
+
+# Sent whenever positions of an account are created, changed or deleted,
+# including by bulk operations that bypass `post_save`/`post_delete`.
+# `since` is the earliest `close_time` affected, or None for the whole history.
+# `bulk` is set by bulk operations, which send no per-row signals.
+positions_changed = Signal()
+
+
+def get_position_state(instance):
+    return {column: getattr(instance, column) for column in ROLLUP_POSITION_COLUMNS}
+
+
+@receiver(pre_save, sender=Position)
+def remember_position_state(sender, instance, **kwargs):
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = Position.objects.filter(pk=instance.pk).values(
+            *ROLLUP_POSITION_COLUMNS
+        ).first()
+
+
+@receiver(post_save, sender=Position)
+def position_saved(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    update_rollups(previous, get_position_state(instance))
+    refresh_position_metrics(Position.objects.filter(pk=instance.pk))
+
+    if previous and previous["account_id"] != instance.account_id:
+        positions_changed.send(
+            sender=Position, account_id=previous["account_id"],
+            since=previous["close_time"]
+        )
+        previous = None
+
+    since = instance.close_time
+    if previous:
+        since = min(since, previous["close_time"])
+    positions_changed.send(sender=Position, account_id=instance.account_id, since=since)
+
+
+@receiver(post_delete, sender=Position)
+def position_deleted(sender, instance, **kwargs):
+    apply_rollup_delta(get_position_state(instance), sign=-1)
+    positions_changed.send(
+        sender=Position, account_id=instance.account_id, since=instance.close_time
+    )
+
+
+@receiver(pre_save, sender=Account)
+def remember_starting_balance(sender, instance, **kwargs):
+    instance._previous_starting_balance = None
+    if instance.pk:
+        instance._previous_starting_balance = Account.objects.filter(
+            pk=instance.pk
+        ).values_list("starting_balance", flat=True).first()
+
+
+@receiver(post_save, sender=Account)
+def account_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_starting_balance", None)
+    if not created and previous != instance.starting_balance:
+        positions_changed.send(sender=Account, account_id=instance.pk, since=None)
+
+
+@receiver(pre_save, sender=Symbol)
+def remember_pip_value(sender, instance, **kwargs):
+    instance._previous_pip_value = None
+    if instance.pk:
+        instance._previous_pip_value = Symbol.objects.filter(
+            pk=instance.pk
+        ).values_list("pip_value", flat=True).first()
+
+
+@receiver(post_save, sender=Symbol)
+def symbol_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_pip_value", None)
+    if not created and previous != instance.pip_value:
+        rebuild_position_metrics(symbol_id=instance.pk)
+
+
+@receiver(positions_changed)
+def truncate_equity_on_change(sender, account_id, since, **kwargs):
+    truncate_equity_curve(account_id, since=since)
+
+
+@receiver(positions_changed)
+def rebuild_rollups_on_bulk_change(sender, account_id, since, bulk=False, **kwargs):
+    if bulk:
+        rebuild_rollups(account_id, since=since)
+
+
+@receiver(positions_changed)
+def refresh_metrics_on_bulk_change(sender, account_id, since, bulk=False, **kwargs):
+    if bulk:
+        rebuild_position_metrics(account_id, since=since)
+
+
+@receiver(positions_changed)
+def bump_account_cache_version(sender, account_id, **kwargs):
+    bump_version(ACCOUNT_CACHE_NAMESPACE, account_id)
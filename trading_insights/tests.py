@@ -1,3 +1,1049 @@
-from django.test import TestCase
+import json
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.formats import localize
+
+from lava_light.caching import get_cache
+from lava_light.columns import EMPTY_VALUE, render_rows
+from lava_light.executors import run_in_executor
+from lava_light.models import User
+
+from trading_insights.management.commands.trading_insights_benchmark import (
+    BENCHMARK_ACCOUNT_ID,
+    BENCHMARK_ACCOUNT_NAME
+)
+from trading_insights.models import (
+    Account, Symbol, Position, EquityPoint, PositionMetrics, PositionRollup, Scenario
+)
+from trading_insights.services.archives import ArchiveError, export_archive, import_archive
+from trading_insights.services.durations import (
+    DURATION_BUCKET_EDGES,
+    aget_duration_statistics,
+    compute_duration_statistics,
+    get_duration_statistics,
+    rows_to_duration_arrays
+)
+from trading_insights.services.equity import materialize_equity_curve, truncate_equity_curve
+from trading_insights.services.heatmaps import build_heatmap, get_bucket_rows, get_timezone
+from trading_insights.services.importers import (
+    PositionImporter,
+    StatementError,
+    parse_statement_rows
+)
+from trading_insights.services.metrics import (
+    METRICS_FIELDS,
+    compute_metrics,
+    get_symbol_edges,
+    refresh_position_metrics
+)
+from trading_insights.services.projections import (
+    compute_projection,
+    get_line_dates,
+    get_weekdays,
+    project_lines
+)
+from trading_insights.services.rollups import rebuild_rollups
+from trading_insights.services.simulations import get_daily_returns, simulate_line
+from trading_insights.services.statistics import (
+    compute_statistics,
+    get_account_statistics,
+    positions_to_arrays
+)
+from trading_insights.services.tracking import get_catch_up_ratio
+from trading_insights.settings import (
+    SCENARIO_TRADING_WEEKDAYS,
+    SCENARIO_WITHDRAWAL_WEEKDAY
+)
+from trading_insights.views import AnalyticsView
+
+
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime(2026, 1, 1, hour) + timedelta(days=day))
+
+
+def create_position(account, symbol, position_id, day, profit=0, position_type="buy", **fields):
+    values = dict(
+        volume=Decimal("0.10"), open_price=Decimal("1.10000"),
+        stop_loss=Decimal("0"), take_profit=Decimal("0"),
+        close_price=Decimal("1.10000"), commission=Decimal("0"), swap=Decimal("0"),
+        amount=Decimal("0"),
+    )
+    values.update(fields)
+    return Position.objects.create(
+        account=account, symbol=symbol, position_id=position_id,
+        position_type=position_type, open_time=at(day, 8), close_time=at(day),
+        profit=Decimal(str(profit)), **values
+    )
+
+
+def get_curve(account):
+    return list(EquityPoint.objects.filter(account=account).order_by(
+        "time", "position_id"
+    ).values_list("position_id", "balance", "peak", "drawdown"))
+
+
+def get_rollups(account):
+    return sorted(PositionRollup.objects.filter(account=account).values_list(
+        "period", "period_start", "symbol_id", "trade_count", "win_count",
+        "gross_profit", "gross_loss", "deposits", "withdrawals",
+    ))
+
+
+class StatisticsTests(SimpleTestCase):
+
+    def test_compute_statistics(self):
+        rows = [
+            (1, "deposit", at(0), at(0), 0, 0, 0, 0, 1000),
+            (2, "buy", at(1), at(1), 0.1, 100, -2, 0, 0),
+            (3, "sell", at(2), at(2), 0.1, -50, 0, 0, 0),
+            (4, "withdraw", at(3), at(3), 0, 0, 0, 0, 200),
+            (5, "buy", at(4), at(4), 0.2, 30, 0, 0, 0),
+        ]
+        statistics = compute_statistics(positions_to_arrays(rows))
+
+        self.assertEqual(statistics["trade_count"], 3)
+        self.assertEqual(statistics["win_count"], 2)
+        self.assertEqual(statistics["loss_count"], 1)
+        self.assertAlmostEqual(statistics["net_profit"], 78)
+        self.assertAlmostEqual(statistics["gross_profit"], 128)
+        self.assertAlmostEqual(statistics["gross_loss"], 50)
+        self.assertAlmostEqual(statistics["profit_factor"], 2.56)
+        self.assertAlmostEqual(statistics["total_volume"], 0.4)
+        self.assertAlmostEqual(statistics["deposits"], 1000)
+        self.assertAlmostEqual(statistics["withdrawals"], 200)
+        self.assertAlmostEqual(statistics["balance"], 878)
+        # Withdrawals lower the peak too, only trading losses are drawdowns.
+        self.assertAlmostEqual(statistics["max_drawdown"], 50)
+
+    def test_compute_statistics_without_positions(self):
+        statistics = compute_statistics(positions_to_arrays([]), starting_balance=500)
+
+        self.assertEqual(statistics["trade_count"], 0)
+        self.assertIsNone(statistics["win_rate"])
+        self.assertIsNone(statistics["profit_factor"])
+        self.assertEqual(statistics["balance"], 500)
+        self.assertEqual(statistics["max_drawdown"], 0)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class EquityCurveTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create(name="Test", starting_balance=Decimal("1000"))
+        self.symbol = Symbol.objects.create(name="EURUSD")
+        for day, profit in enumerate([20, -35, 50, -10, 5]):
+            create_position(self.account, self.symbol, f"P{day}", day, profit)
+
+    def assertCurveMatchesRebuild(self):
+        materialize_equity_curve(self.account)
+        curve = get_curve(self.account)
+        truncate_equity_curve(self.account)
+        materialize_equity_curve(self.account)
+
+        self.assertEqual(curve, get_curve(self.account))
+        self.assertEqual(len(curve), Position.objects.filter(account=self.account).count())
+        self.assertAlmostEqual(
+            float(curve[-1][1]), get_account_statistics(self.account)["balance"]
+        )
+
+    def test_materialize_is_incremental(self):
+        self.assertEqual(materialize_equity_curve(self.account), 5)
+        self.assertEqual(materialize_equity_curve(self.account), 0)
+        create_position(self.account, self.symbol, "P5", 5, 12)
+
+        self.assertEqual(materialize_equity_curve(self.account), 1)
+        self.assertCurveMatchesRebuild()
+
+    def test_concurrent_materialization_does_not_duplicate_points(self):
+        materialize_equity_curve(self.account)
+        # A request that read the last point before another one appended
+        # the rest of the curve.
+        with mock.patch(
+            "trading_insights.services.equity.get_last_equity_point", return_value=None
+        ):
+            materialize_equity_curve(self.account)
+
+        self.assertCurveMatchesRebuild()
+
+    def test_edited_position_truncates_curve(self):
+        materialize_equity_curve(self.account)
+        position = Position.objects.get(position_id="P1")
+        position.profit = Decimal("80")
+        position.save()
+
+        self.assertCurveMatchesRebuild()
+
+    def test_moved_position_truncates_from_previous_time(self):
+        materialize_equity_curve(self.account)
+        position = Position.objects.get(position_id="P0")
+        position.close_time = at(10)
+        position.save()
+
+        self.assertCurveMatchesRebuild()
+
+    def test_deleted_position_truncates_curve(self):
+        materialize_equity_curve(self.account)
+        Position.objects.get(position_id="P2").delete()
+
+        self.assertCurveMatchesRebuild()
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ImporterTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create(name="Test")
+
+    def get_rows(self, close_times=None):
+        close_times = close_times or {}
+        rows = [{
+            "position_id": "D1", "symbol": "", "position_type": "balance",
+            "open_time": "2026.01.01 00:00:00", "profit": "1000",
+        }]
+        for index, (day, profit) in enumerate([(5, "20"), (12, "-8"), (20, "15")], start=1):
+            rows.append({
+                "position_id": f"P{index}", "symbol": "gbpusd", "position_type": "buy",
+                "open_time": f"2026.01.{day:02d} 09:00:00",
+                "close_time": close_times.get(f"P{index}", f"2026.01.{day:02d} 17:00:00"),
+                "volume": "0.10", "profit": profit, "commission": "-1",
+            })
+        return rows
+
+    def import_rows(self, rows, **kwargs):
+        return PositionImporter(account=self.account, **kwargs).run(rows)
+
+    def assertDerivedDataMatchesRebuild(self):
+        materialize_equity_curve(self.account)
+        curve = get_curve(self.account)
+        rollups = get_rollups(self.account)
+        truncate_equity_curve(self.account)
+        materialize_equity_curve(self.account)
+        rebuild_rollups(self.account.pk)
+
+        self.assertEqual(curve, get_curve(self.account))
+        self.assertEqual(rollups, get_rollups(self.account))
+        self.assertEqual(len(curve), Position.objects.filter(account=self.account).count())
+
+    def test_parse_mt4_statement_rows(self):
+        rows = [
+            ["Closed Transactions:"],
+            ["Ticket", "Open Time", "Type", "Size", "Item", "Price", "S / L", "T / P",
+             "Close Time", "Price", "Commission", "Taxes", "Swap", "Profit"],
+            ["1", "2026.01.02 10:00:00", "buy", "0.10", "eurusd", "1.10000", "0", "0",
+             "2026.01.02 12:00:00", "1.10100", "-0.70", "0", "0", "10.00"],
+            ["2", "2026.01.03 10:00:00", "buy limit", "0.10", "eurusd", "1.10000", "0", "0",
+             "", "", "", "", "", ""],
+            ["3", "2026.01.01 00:00:00", "balance", "Deposit", "", "", "", "", "", "", "",
+             "", "", "500.00"],
+        ]
+        values = list(parse_statement_rows(rows))
+
+        self.assertEqual([row["position_type"] for row in values], ["buy", "balance"])
+        self.assertEqual(values[0]["open_price"], "1.10000")
+        self.assertEqual(values[0]["close_price"], "1.10100")
+        self.assertEqual(values[1]["amount"], "500.00")
+
+    def test_import_is_idempotent(self):
+        self.assertEqual(self.import_rows(self.get_rows()), 4)
+        self.assertEqual(self.import_rows(self.get_rows(), batch_size=2), 4)
+
+        positions = Position.objects.filter(account=self.account)
+        self.assertEqual(positions.count(), 4)
+        self.assertEqual(positions.get(position_id="D1").position_type, "deposit")
+        self.assertEqual(positions.get(position_id="P1").symbol.name, "GBPUSD")
+        self.assertDerivedDataMatchesRebuild()
+
+    def test_upsert_moving_close_time_later(self):
+        self.import_rows(self.get_rows())
+        materialize_equity_curve(self.account)
+        rows = self.get_rows({"P1": "2026.02.20 17:00:00"})
+        self.import_rows([row for row in rows if row["position_id"] == "P1"])
+
+        self.assertDerivedDataMatchesRebuild()
+        self.assertAlmostEqual(
+            float(get_curve(self.account)[-1][1]),
+            get_account_statistics(self.account)["balance"]
+        )
+
+    def test_failed_import_refreshes_flushed_batches(self):
+        self.import_rows(self.get_rows()[:2])
+        materialize_equity_curve(self.account)
+        rows = self.get_rows()
+        rows.append({"position_id": "X", "symbol": "X", "position_type": "buy",
+                     "open_time": "not a date", "profit": "1"})
+
+        with self.assertRaises(StatementError):
+            self.import_rows(rows, batch_size=2)
+        self.assertEqual(Position.objects.filter(account=self.account).count(), 4)
+        self.assertDerivedDataMatchesRebuild()
+
+
+def project_by_loop(dates, start_amount, ratio, withdrawal):
+    """
+    Day by day reference of `compute_projection`.
+    """
+    balances = []
+    balance = start_amount
+    for weekday in get_weekdays(dates):
+        if weekday in SCENARIO_TRADING_WEEKDAYS:
+            balance *= 1 + ratio / 100
+        if weekday == SCENARIO_WITHDRAWAL_WEEKDAY:
+            balance = max(balance - withdrawal, 0.0)
+        balances.append(balance)
+    return np.array(balances)
+
+
+class ProjectionTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dates = get_line_dates(date(2026, 1, 1), date(2026, 6, 30))
+
+    def test_projection_matches_daily_loop(self):
+        balances, profits, withdrawals = compute_projection(self.dates, 1000, 1.5, 50)
+
+        np.testing.assert_allclose(balances, project_by_loop(self.dates, 1000, 1.5, 50))
+        self.assertAlmostEqual(
+            balances[-1], 1000 + profits.sum() - withdrawals.sum(), places=6
+        )
+
+    def test_exhausted_balance_stays_at_zero(self):
+        balances, profits, withdrawals = compute_projection(self.dates, 1000, 0.5, 300)
+
+        np.testing.assert_allclose(
+            balances, project_by_loop(self.dates, 1000, 0.5, 300), atol=1e-9
+        )
+        self.assertEqual(balances[-1], 0)
+        # No more than the account held is ever withdrawn.
+        self.assertAlmostEqual(withdrawals.sum(), 1000 + profits.sum(), places=6)
+
+    def test_catch_up_ratio_reaches_target(self):
+        weekdays = get_weekdays(self.dates)
+        trading_days = np.isin(weekdays, SCENARIO_TRADING_WEEKDAYS)
+        withdrawals = np.where(weekdays == SCENARIO_WITHDRAWAL_WEEKDAY, 20.0, 0.0)
+
+        ratio = get_catch_up_ratio(1000, 5000, trading_days, withdrawals)
+        self.assertIsNotNone(ratio)
+        end_balance = project_by_loop(self.dates, 1000, ratio, 20)[-1]
+        self.assertAlmostEqual(end_balance, 5000, delta=0.01)
+
+    def test_catch_up_ratio_without_trading_days(self):
+        trading_days = np.zeros(self.dates.size, dtype=bool)
+        withdrawals = np.zeros(self.dates.size)
+
+        self.assertIsNone(get_catch_up_ratio(1000, 5000, trading_days, withdrawals))
+        self.assertIsNone(get_catch_up_ratio(0, 5000, ~trading_days, withdrawals))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RollupTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create(name="Test")
+        self.symbols = [Symbol.objects.create(name=name) for name in ("EURUSD", "GBPUSD")]
+
+    def assertDeltaMatchesRebuild(self):
+        rollups = get_rollups(self.account)
+        rebuild_rollups(self.account.pk)
+        self.assertEqual(rollups, get_rollups(self.account))
+
+    def test_delta_updates_match_rebuild(self):
+        create_position(
+            self.account, self.symbols[0], "D", 0, position_type="deposit",
+            amount=Decimal("500")
+        )
+        positions = [
+            create_position(self.account, self.symbols[index % 2], f"P{index}", day, profit)
+            for index, (day, profit) in enumerate([(1, 10), (3, -4), (20, 7), (40, -12)])
+        ]
+        self.assertDeltaMatchesRebuild()
+
+        # Move a trade to another month and symbol, turn a loss into a win.
+        positions[0].close_time = at(45)
+        positions[0].symbol = self.symbols[1]
+        positions[0].save()
+        positions[1].profit = Decimal("6")
+        positions[1].save()
+        positions[2].delete()
+        self.assertDeltaMatchesRebuild()
+
+    def test_rebuild_from_a_period(self):
+        for day in range(0, 60, 7):
+            create_position(self.account, self.symbols[0], f"P{day}", day, day - 20)
+        rollups = get_rollups(self.account)
+        rebuild_rollups(self.account.pk, since=at(30))
+
+        self.assertEqual(rollups, get_rollups(self.account))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DetailViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.account = Account.objects.create(name="Test", starting_balance=Decimal("1000"))
+        cls.symbol = Symbol.objects.create(name="EURUSD")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_detail(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.account.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        return response, [query["sql"] for query in queries.captured_queries]
+
+    def test_reverse_relations_are_counted(self):
+        for day in range(3):
+            create_position(self.account, self.symbol, f"P{day}", day, 10)
+        materialize_equity_curve(self.account)
+        _response, queries = self.get_detail()
+
+        for day in range(12):
+            create_position(self.account, self.symbol, f"Q{day}", day, -5)
+        materialize_equity_curve(self.account)
+        response, more_queries = self.get_detail()
+
+        self.assertEqual(len(queries), len(more_queries))
+        position_table = Position._meta.db_table
+        self.assertFalse([
+            sql for sql in more_queries
+            if f'FROM "{position_table}"' in sql and "COUNT(" not in sql
+        ])
+        # Counted rather than listed.
+        self.assertContains(response, "<td>15</td>", html=True)
+        self.assertNotContains(response, str(EquityPoint.objects.first()))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BenchmarkCommandTests(TestCase):
+
+    def run_benchmark(self, rows, **options):
+        call_command(
+            "trading_insights_benchmark", rows=rows, batch_size=10, repeat=1,
+            stdout=StringIO(), **options
+        )
+
+    def test_accounts_named_benchmark_are_left_alone(self):
+        account = Account.objects.create(name=BENCHMARK_ACCOUNT_NAME)
+        create_position(account, Symbol.objects.create(name="EURUSD"), "P1", 0, 10)
+        self.run_benchmark(25)
+
+        self.assertEqual(Position.objects.filter(account=account).count(), 1)
+        self.assertFalse(Account.objects.filter(account_id=BENCHMARK_ACCOUNT_ID).exists())
+
+    def test_protected_benchmark_account_is_not_reset(self):
+        self.run_benchmark(25, keep=True)
+        account = Account.objects.get(account_id=BENCHMARK_ACCOUNT_ID)
+        Scenario.objects.create(name="Plan", account=account)
+
+        with self.assertRaises(CommandError):
+            self.run_benchmark(30)
+        self.assertEqual(Position.objects.filter(account=account).count(), 25)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ArchiveTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create(
+            name="Live", broker="Broker", account_id="1234", starting_balance=Decimal("100")
+        )
+        symbols = [Symbol.objects.create(name=name) for name in ("EURUSD", "XAUUSD")]
+        for day in range(7):
+            create_position(
+                self.account, symbols[day % 2], f"P{day}", day, day * 3 - 8,
+                commission=Decimal("-0.70")
+            )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def get_rows(self, account):
+        return list(Position.objects.filter(account=account).order_by("position_id").values_list(
+            "position_id", "symbol__name", "position_type", "open_time", "close_time",
+            "volume", "profit", "commission", "amount",
+        ))
+
+    def test_round_trip(self):
+        for extension in ("parquet", "arrow"):
+            path = self.directory / f"history.{extension}"
+            self.assertEqual(export_archive(self.account, path, batch_size=3), 7)
+            target = Account.objects.create(name=f"Copy {extension}")
+
+            account, imported = import_archive(path, account=target, batch_size=4)
+            self.assertEqual((account, imported), (target, 7))
+            self.assertEqual(self.get_rows(target), self.get_rows(self.account))
+
+    def test_reimport_into_archived_account_is_idempotent(self):
+        path = self.directory / "history.parquet"
+        export_archive(self.account, path)
+        Position.objects.filter(account=self.account, position_id="P6").delete()
+
+        for _index in range(2):
+            account, imported = import_archive(path)
+            self.assertEqual((account, imported), (self.account, 7))
+        self.assertEqual(Account.objects.count(), 1)
+        self.assertEqual(Position.objects.filter(account=self.account).count(), 7)
+
+    def test_archive_without_account_id_needs_an_account(self):
+        Account.objects.filter(pk=self.account.pk).update(account_id="")
+        self.account.refresh_from_db()
+        path = self.directory / "history.arrow"
+        export_archive(self.account, path)
+
+        with self.assertRaises(ArchiveError):
+            import_archive(path)
+        self.assertEqual(Account.objects.count(), 1)
+
+
+def get_line(start_date, end_date, start_amount=1000, target_amount=1500, withdrawal=0):
+    return {
+        "start_date": start_date, "end_date": end_date,
+        "start_amount": Decimal(start_amount), "target_amount": Decimal(target_amount),
+        "daily_profit_ratio": Decimal("0"), "weekly_withdrawal_amount": Decimal(withdrawal),
+    }
+
+
+class SimulationTests(SimpleTestCase):
+
+    def test_constant_returns_follow_the_projection(self):
+        line = get_line(date(2026, 1, 1), date(2026, 3, 31), withdrawal=10)
+        result = simulate_line(line, np.array([0.01]), paths=50, seed=1, batch_size=20)
+
+        dates = get_line_dates(line["start_date"], line["end_date"])
+        balances, _profits, _withdrawals = compute_projection(dates, 1000, 1, 10)
+        self.assertEqual(result["days"], dates.size)
+        for value in result["end_amount_percentiles"].values():
+            self.assertAlmostEqual(value, balances[-1], places=6)
+        self.assertEqual(result["target_probability"], 1.0)
+        self.assertEqual(result["ruin_probability"], 0.0)
+        self.assertEqual(set(result["drawdown_percentiles"].values()), {0.0})
+
+    def test_results_depend_on_the_seed_only(self):
+        line = get_line(date(2026, 1, 1), date(2026, 2, 28))
+        returns = np.array([-0.03, -0.01, 0.0, 0.01, 0.02, 0.04])
+
+        def simulate(seed):
+            return simulate_line(line, returns, paths=300, seed=seed, batch_size=100)
+
+        result = simulate(7)
+        self.assertEqual(result, simulate(7))
+        self.assertNotEqual(result, simulate(8))
+        self.assertGreater(result["drawdown_percentiles"][99], 0)
+
+    def test_line_without_days(self):
+        line = get_line(date(2026, 3, 1), date(2026, 2, 1))
+        result = simulate_line(line, np.array([0.01, -0.01]), paths=10, seed=1)
+
+        self.assertEqual(result["days"], 0)
+        self.assertEqual(set(result["end_amount_percentiles"].values()), {1000.0})
+        self.assertEqual(set(result["drawdown_percentiles"].values()), {0.0})
+        self.assertEqual(result["target_probability"], 0.0)
+        self.assertEqual(
+            project_lines([tuple(line.values())])["lines"][0]["end_amount"], 1000.0
+        )
+
+    def test_daily_returns_compound_trades_of_a_day(self):
+        monday = datetime(2026, 1, 5, tzinfo=dt_timezone.utc).timestamp()
+        day = 24 * 60 * 60
+        # Two trades on Monday, none on Tuesday, one on Wednesday.
+        returns = get_daily_returns(
+            np.array([0.1, -0.05, 0.02]), np.array([monday, monday + 60, monday + 2 * day])
+        )
+
+        np.testing.assert_allclose(returns, [1.1 * 0.95 - 1, 0, 0.02])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DataEndpointTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.account = Account.objects.create(name="Test")
+        cls.symbols = [Symbol.objects.create(name=name) for name in ("EURUSD", "GBPJPY")]
+        for index in range(23):
+            # Pairs of positions closing at the same time.
+            create_position(
+                cls.account, cls.symbols[index % 2], f"T{index:02d}", index // 2, index - 10
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_data(self, **params):
+        params = {"draw": 1, "length": 10, **params}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(Position.get_data_url(), params)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertFalse([
+            query for query in queries.captured_queries if "COUNT(" in query["sql"]
+        ])
+        return data
+
+    def get_position_ids(self, data):
+        return [re.search(r'/(\d+)/?"', row[0]).group(1) for row in data["data"]]
+
+    def test_list_page_loads_no_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(Position.get_list_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, Position.get_data_url())
+        position_table = Position._meta.db_table
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if f'FROM "{position_table}"' in query["sql"]
+        ])
+
+    def test_pages_follow_keyset_cursors(self):
+        expected = [str(pk) for pk in Position.objects.values_list("pk", flat=True)]
+        pages = []
+        data = self.get_data()
+        while True:
+            pages.append(self.get_position_ids(data))
+            if data["next"] is None:
+                break
+            data = self.get_data(cursor=data["next"], start=len(sum(pages, [])))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 3])
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual(data["recordsFiltered"], 23)
+
+        previous = self.get_data(cursor=data["previous"], direction="previous", start=10)
+        self.assertEqual(self.get_position_ids(previous), pages[1])
+
+    def get_all_ids(self, **params):
+        ids, data = [], self.get_data(length=100, **params)
+        ids.extend(self.get_position_ids(data))
+        self.assertIsNone(data["next"])
+        return ids
+
+    def test_orders_by_sortable_column(self):
+        # Column 5 is `close_time`, the leading field of an index.
+        ascending = self.get_all_ids(**{"order[0][column]": 5, "order[0][dir]": "asc"})
+        descending = self.get_all_ids(**{"order[0][column]": 5, "order[0][dir]": "desc"})
+
+        expected = [str(pk) for pk in Position.objects.order_by(
+            "close_time", "id"
+        ).values_list("pk", flat=True)]
+        self.assertEqual(ascending, expected)
+        self.assertEqual(descending, expected[::-1])
+
+    def test_unsortable_column_falls_back_to_model_ordering(self):
+        # Column 7 is `profit`, no index serves it.
+        ids = self.get_all_ids(**{"order[0][column]": 7, "order[0][dir]": "asc"})
+
+        expected = [str(pk) for pk in Position.objects.values_list("pk", flat=True)]
+        self.assertEqual(ids, expected)
+
+    def test_search_matches_prefixes(self):
+        self.assertEqual(len(self.get_all_ids(**{"search[value]": "T1"})), 10)
+        self.assertEqual(len(self.get_all_ids(**{"search[value]": "GBP"})), 11)
+        self.assertEqual(self.get_all_ids(**{"search[value]": "USD"}), [])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(Position.get_data_url(), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cells_are_escaped(self):
+        Symbol.objects.filter(pk=self.symbols[0].pk).update(name="<b>EURUSD</b>")
+        data = self.get_data(**{"search[value]": "T00"})
+
+        self.assertEqual(len(data["data"]), 1)
+        self.assertIn("&lt;b&gt;EURUSD&lt;/b&gt;", data["data"][0])
+        self.assertNotIn("<b>", json.dumps(data["data"]))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ListColumnTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.account = Account.objects.create(name="Test")
+        cls.symbol = Symbol.objects.create(
+            name="XAUUSD", symbol_type="commodity", pip_value=Decimal("0.0100")
+        )
+        cls.position = create_position(cls.account, cls.symbol, "T1", 1, 25)
+
+    def test_columns_are_built_once(self):
+        columns = Symbol.get_list_columns()
+
+        self.assertIs(Symbol.get_list_columns(), columns)
+        self.assertEqual(
+            [column.name for column in columns], ["display_name", "symbol_type", "pip_value"]
+        )
+
+    def test_render(self):
+        display_name, symbol_type, pip_value = Symbol.get_list_columns()
+
+        self.assertEqual(display_name.render(self.symbol), EMPTY_VALUE)
+        self.assertEqual(symbol_type.render(self.symbol), "Commodity")
+        self.assertEqual(pip_value.render(self.symbol), localize(Decimal("0.0100")))
+
+        columns = {column.name: column for column in Position.get_list_columns()}
+        self.assertEqual(columns["account"].render(self.position), str(self.account))
+        self.assertEqual(columns["position_type"].render(self.position), "Buy")
+        self.assertEqual(
+            columns["close_time"].render(self.position),
+            localize(timezone.localtime(self.position.close_time))
+        )
+
+    def test_render_rows(self):
+        columns = Symbol.get_list_columns()
+        rows = render_rows([self.symbol], columns)
+
+        self.assertEqual(rows, [(
+            self.symbol.get_absolute_url(), str(self.symbol),
+            tuple(column.render(self.symbol) for column in columns)
+        )])
+
+    def test_list_page_renders_choice_labels(self):
+        self.client.force_login(self.user)
+        response = self.client.get(Symbol.get_list_url())
+
+        self.assertContains(response, "<td>Commodity</td>", html=True)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AnalyticsViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="analyst")
+        cls.account = Account.objects.create(name="Test", starting_balance=Decimal("1000"))
+        cls.scenario = Scenario.objects.create(name="Plan", account=cls.account)
+        symbol = Symbol.objects.create(name="EURUSD")
+        for index, profit in enumerate([100, -50, 30]):
+            create_position(cls.account, symbol, f"T{index}", index, profit)
+
+    def get(self, name, pk, **params):
+        return self.client.get(reverse(f"trading_insights:{name}", args=[pk]), params)
+
+    def grant(self, codename):
+        self.user.user_permissions.add(Permission.objects.get(codename=codename))
+        self.client.force_login(self.user)
+
+    def test_access(self):
+        self.assertEqual(self.get("account_statistics", self.account.pk).status_code, 302)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.get("account_statistics", self.account.pk).status_code, 403)
+
+        self.grant("view_account")
+        self.assertEqual(self.get("account_statistics", self.account.pk).status_code, 200)
+        self.assertEqual(self.get("account_statistics", 0).status_code, 404)
+        self.assertEqual(self.get("scenario_projection", self.scenario.pk).status_code, 403)
+
+    def test_statistics(self):
+        self.grant("view_account")
+        response = self.get("account_statistics", self.account.pk)
+
+        expected = json.loads(json.dumps(
+            get_account_statistics(self.account), cls=DjangoJSONEncoder
+        ))
+        self.assertEqual(response.json(), expected)
+
+    def test_account_panels(self):
+        self.grant("view_account")
+        today = at(30).date().isoformat()
+        data = self.get("account_analytics", self.account.pk, date=today).json()
+        statistics = self.get("account_statistics", self.account.pk).json()
+
+        self.assertEqual(data["account"], {"id": self.account.pk, "name": str(self.account)})
+        self.assertEqual(data["date"], today)
+        self.assertEqual(data["statistics"]["trade_count"], 3)
+        self.assertEqual(data["statistics"], statistics)
+        self.assertEqual(len(data["equity"]["dates"]), len(data["equity"]["balances"]))
+        self.assertEqual(data["equity"]["dates"][-1], today)
+        self.assertEqual([panel["id"] for panel in data["scenarios"]], [self.scenario.pk])
+
+    def test_get_data_is_required(self):
+        class IncompleteView(AnalyticsView):
+            model = Account
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+        with self.assertRaises(ImproperlyConfigured):
+            async_to_sync(IncompleteView.as_view())(request, pk=self.account.pk)
+
+    def test_run_in_executor(self):
+        thread = async_to_sync(run_in_executor)(threading.current_thread)
+
+        self.assertNotEqual(thread, threading.current_thread())
+        self.assertTrue(thread.name.startswith("lava_light"))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class MetricsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(name="Test")
+        cls.eurusd = Symbol.objects.create(name="EURUSD", pip_value=Decimal("0.0001"))
+        cls.usdjpy = Symbol.objects.create(name="USDJPY", pip_value=Decimal("0.0100"))
+
+    def create_trade(self, symbol, position_id, prices, position_type="buy"):
+        open_price, close_price, stop_loss, take_profit = (Decimal(p) for p in prices)
+        return create_position(
+            self.account, symbol, position_id, 1, position_type=position_type,
+            open_price=open_price, close_price=close_price,
+            stop_loss=stop_loss, take_profit=take_profit,
+        )
+
+    def get_metrics(self, position):
+        return PositionMetrics.objects.filter(position=position).values_list(
+            *METRICS_FIELDS
+        ).first()
+
+    def assertMetrics(self, position, expected):
+        metrics = self.get_metrics(position)
+        self.assertIsNotNone(metrics)
+        for value, expected_value in zip(metrics, expected):
+            if expected_value is None:
+                self.assertIsNone(value)
+            else:
+                self.assertAlmostEqual(value, expected_value, places=4)
+
+    def test_compute_metrics(self):
+        metrics = compute_metrics(
+            np.array([self.eurusd.pk, self.eurusd.pk, 0]),
+            np.array(["buy", "sell", "buy"]),
+            {
+                "open_price": np.array([1.1, 1.2, 1.1]),
+                "close_price": np.array([1.105, 1.19, 1.2]),
+                "stop_loss": np.array([1.098, 1.21, 1.09]),
+                "take_profit": np.array([1.106, 0, 0]),
+            },
+            {self.eurusd.pk: 0.0001},
+        )
+
+        np.testing.assert_allclose(metrics["pips"], [50, 100, np.nan])
+        np.testing.assert_allclose(metrics["risk_pips"], [20, 100, np.nan])
+        np.testing.assert_allclose(metrics["reward_pips"], [60, np.nan, np.nan])
+        np.testing.assert_allclose(metrics["reward_risk_ratio"], [3, np.nan, np.nan])
+        np.testing.assert_allclose(metrics["r_multiple"], [2.5, 1, np.nan])
+
+    def test_metrics_follow_positions(self):
+        trade = self.create_trade(self.eurusd, "T1", ("1.1", "1.105", "1.098", "1.106"))
+        self.assertMetrics(trade, (50, 20, 60, 3, 2.5))
+
+        # A stop moved beyond the entry risks nothing.
+        trade.stop_loss = Decimal("1.101")
+        trade.save()
+        self.assertMetrics(trade, (50, None, 60, None, None))
+
+        trade.position_type = "deposit"
+        trade.save()
+        self.assertIsNone(self.get_metrics(trade))
+
+    def test_pip_value_change_refreshes_the_symbol(self):
+        trade = self.create_trade(self.usdjpy, "T1", ("150", "149", "151", "0"), "sell")
+        self.assertMetrics(trade, (100, 100, None, None, 1))
+
+        self.usdjpy.pip_value = Decimal("0.0010")
+        self.usdjpy.save()
+        self.assertMetrics(trade, (1000, 1000, None, None, 1))
+
+    def test_bulk_refresh(self):
+        trades = [
+            self.create_trade(self.eurusd, f"T{index}", ("1.1", "1.101", "1.099", "0"))
+            for index in range(5)
+        ]
+        PositionMetrics.objects.all().delete()
+
+        positions = Position.objects.filter(account=self.account)
+        self.assertEqual(refresh_position_metrics(positions, batch_size=2), 5)
+        for trade in trades:
+            self.assertMetrics(trade, (10, 10, None, None, 1))
+
+    def test_symbol_edges(self):
+        self.create_trade(self.eurusd, "T1", ("1.1", "1.105", "1.098", "0"))
+        self.create_trade(self.eurusd, "T2", ("1.1", "1.099", "1.098", "0"))
+        self.create_trade(self.usdjpy, "T3", ("150", "151", "0", "0"))
+
+        edges = {edge["symbol_name"]: edge for edge in get_symbol_edges(self.account)}
+        self.assertEqual(list(edges), ["EURUSD", "USDJPY"])
+        self.assertEqual(edges["EURUSD"]["trade_count"], 2)
+        self.assertEqual(edges["EURUSD"]["win_count"], 1)
+        self.assertAlmostEqual(edges["EURUSD"]["total_pips"], 40)
+        self.assertAlmostEqual(edges["EURUSD"]["total_r"], 2)
+        self.assertAlmostEqual(edges["EURUSD"]["expectancy_r"], 1)
+        self.assertEqual(edges["USDJPY"]["risked_count"], 0)
+        self.assertAlmostEqual(edges["USDJPY"]["total_pips"], 100)
+        self.assertIsNone(edges["USDJPY"]["expectancy_r"])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class HeatmapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="analyst")
+        cls.account = Account.objects.create(name="Test")
+        symbol = Symbol.objects.create(name="EURUSD")
+        # Monday 2026-01-05, 23:30 UTC is Tuesday 08:30 in Tokyo.
+        monday = datetime(2026, 1, 5, 23, 30, tzinfo=dt_timezone.utc)
+        for position_id, profit, position_type in (
+            ("T1", 100, "buy"), ("T2", -40, "sell"), ("T3", 5, "buy"), ("D1", 1000, "deposit"),
+        ):
+            position = create_position(
+                cls.account, symbol, position_id, 10, profit, position_type,
+                commission=Decimal("-10"),
+            )
+            Position.objects.filter(pk=position.pk).update(open_time=monday)
+
+    def get_heatmap(self, tz_name):
+        return build_heatmap(list(get_bucket_rows(self.account, get_timezone(tz_name))))
+
+    def test_buckets_in_time_zone(self):
+        for tz_name, weekday, hour in (("UTC", 0, 23), ("Asia/Tokyo", 1, 8)):
+            heatmap = self.get_heatmap(tz_name)
+
+            self.assertEqual(heatmap["trade_count"][weekday][hour], 3)
+            self.assertEqual(heatmap["win_count"][weekday][hour], 1)
+            # Commissions count, deposits do not.
+            self.assertEqual(heatmap["net_profit"][weekday][hour], 35)
+            self.assertAlmostEqual(heatmap["win_rate"][weekday][hour], 0.3333)
+            self.assertEqual(heatmap["weekdays"]["trade_count"][weekday], 3)
+            self.assertEqual(heatmap["hours"]["net_profit"][hour], 35)
+            self.assertEqual(heatmap["total"]["trade_count"], 3)
+            self.assertIsNone(heatmap["win_rate"][weekday][(hour + 1) % 24])
+
+    def test_empty_heatmap(self):
+        heatmap = build_heatmap([])
+
+        self.assertEqual(len(heatmap["trade_count"]), 7)
+        self.assertEqual(len(heatmap["trade_count"][0]), 24)
+        self.assertEqual(heatmap["total"], {"trade_count": 0, "net_profit": 0, "win_rate": None})
+
+    def test_get_timezone(self):
+        self.assertEqual(str(get_timezone()), settings.TIME_ZONE)
+        self.assertEqual(str(get_timezone("Asia/Tokyo")), "Asia/Tokyo")
+        with self.assertRaises(ValueError):
+            get_timezone("Mars/Olympus")
+
+    def test_view(self):
+        url = reverse("trading_insights:heatmap")
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.user.user_permissions.add(Permission.objects.get(codename="view_account"))
+        response = self.client.get(url, {"tz": "Asia/Tokyo", "metric": "trade_count"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["time_zone"], "Asia/Tokyo")
+        self.assertEqual(response.context["total"], 3)
+
+        response = self.client.get(url, {"tz": "Mars/Olympus"})
+        self.assertEqual(response.context["time_zone"], settings.TIME_ZONE)
+        self.assertEqual(response.context["metric"], "net_profit")
+        self.assertEqual(
+            [str(message) for message in response.context["messages"]],
+            ["Unknown time zone: Mars/Olympus"]
+        )
+
+
+class DurationTests(SimpleTestCase):
+
+    def test_compute_duration_statistics(self):
+        durations = np.array([30, 60, 120, 5 * 60 * 60, 10 ** 7], dtype=np.float64)
+        profits = np.array([10, -5, 0, 20, -1], dtype=np.float64)
+        statistics = compute_duration_statistics(durations, profits)
+
+        self.assertEqual(statistics["trade_count"], 5)
+        self.assertAlmostEqual(statistics["average_duration"], durations.mean())
+        self.assertAlmostEqual(statistics["winners_average_duration"], (30 + 18000) / 2)
+        self.assertAlmostEqual(statistics["losers_average_duration"], (60 + 10 ** 7) / 2)
+        self.assertEqual(statistics["percentiles"][50], 120)
+
+        buckets = statistics["buckets"]
+        self.assertEqual(len(buckets), len(DURATION_BUCKET_EDGES) + 1)
+        self.assertEqual([bucket["trade_count"] for bucket in buckets], [2, 1, 0, 0, 0, 1, 0, 1])
+        self.assertEqual((buckets[0]["min_duration"], buckets[0]["max_duration"]), (0, 60))
+        self.assertIsNone(buckets[-1]["max_duration"])
+        self.assertEqual(buckets[0]["win_rate"], 0.5)
+        self.assertEqual(buckets[0]["net_profit"], 5)
+        self.assertEqual(buckets[0]["average_profit"], 2.5)
+        self.assertIsNone(buckets[2]["win_rate"])
+        self.assertIsNone(buckets[2]["average_profit"])
+
+    def test_without_trades(self):
+        statistics = compute_duration_statistics(*rows_to_duration_arrays([]))
+
+        self.assertEqual(statistics["trade_count"], 0)
+        self.assertIsNone(statistics["average_duration"])
+        self.assertEqual(set(statistics["percentiles"].values()), {None})
+        self.assertEqual({bucket["trade_count"] for bucket in statistics["buckets"]}, {0})
+
+    def test_rows_to_duration_arrays(self):
+        durations, profits = rows_to_duration_arrays([
+            (timedelta(minutes=90), Decimal("12.50")),
+            # Statements may close a trade before it opened.
+            (timedelta(seconds=-1), Decimal("-3")),
+        ])
+
+        np.testing.assert_array_equal(durations, [5400, 0])
+        np.testing.assert_array_equal(profits, [12.5, -3])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class DurationStatisticsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.account = Account.objects.create(name="Test")
+        cls.symbol = Symbol.objects.create(name="EURUSD")
+        # Trades are opened at 08:00 and closed at 12:00.
+        create_position(cls.account, cls.symbol, "T1", 1, 100, commission=Decimal("-5"))
+        create_position(cls.account, cls.symbol, "T2", 2, -40)
+        create_position(cls.account, cls.symbol, "D1", 3, 1000, "deposit")
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_statistics(self):
+        statistics = get_duration_statistics(self.account)
+
+        self.assertEqual(statistics["trade_count"], 2)
+        self.assertEqual(statistics["average_duration"], 4 * 60 * 60)
+        bucket = next(
+            bucket for bucket in statistics["buckets"] if bucket["max_duration"] == 4 * 60 * 60
+        )
+        self.assertEqual(bucket["trade_count"], 2)
+        self.assertEqual(bucket["net_profit"], 55)
+        self.assertEqual(async_to_sync(aget_duration_statistics)(self.account), statistics)
+
+    def test_position_changes_refresh_the_cache(self):
+        self.assertEqual(get_duration_statistics(self.account)["trade_count"], 2)
+
+        create_position(self.account, self.symbol, "T3", 4, 10)
+        self.assertEqual(get_duration_statistics(self.account)["trade_count"], 3)
+        self.assertEqual(get_duration_statistics(self.account, date_from=at(2))["trade_count"], 2)
@@ -1,11 +1,37 @@
 from django.urls import path
 
-from trading_insights.views import ScenarioListView
+from trading_insights.views import (
+    ScenarioListView,
+    AccountStatisticsView,
+    AccountEquityView,
+    AccountDurationsView,
+    AccountAnalyticsView,
+    ScenarioProjectionView,
+    HeatmapView
+)
 
 
 app_name = "trading_insights"
 
 
-# urlpatterns = [
-#     path('scenario', ScenarioListView.as_view(), name='scenarios'),
-# ]
+urlpatterns = [
+    # path('scenario', ScenarioListView.as_view(), name='scenarios'),
+    path("heatmap/", HeatmapView.as_view(), name="heatmap"),
+    path(
+        "account/<int:pk>/statistics/",
+        AccountStatisticsView.as_view(), name="account_statistics"
+    ),
+    path("account/<int:pk>/equity/", AccountEquityView.as_view(), name="account_equity"),
+    path(
+        "account/<int:pk>/durations/",
+        AccountDurationsView.as_view(), name="account_durations"
+    ),
+    path(
+        "account/<int:pk>/analytics/",
+        AccountAnalyticsView.as_view(), name="account_analytics"
+    ),
+    path(
+        "scenario/<int:pk>/projection/",
+        ScenarioProjectionView.as_view(), name="scenario_projection"
+    ),
+]
@@ -1,17 +1,45 @@
+from datetime import date
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils.dates import WEEKDAYS
+from django.utils.translation import gettext_lazy as _
+
 from lava_light.views.generic_views import (
     DetailView,
     UpdateView,
-    CreateView,
-    TemplateView
+    CreateView
 )
 
 from lava_light.views import (
-    ListView
+    ListView,
+    AsyncProtectedView,
+    ProtectedTemplateView
 )
 
 from trading_insights.models import (
-    Scenario, ScenarioLine
+    Account, Scenario, ScenarioLine
+)
+from trading_insights.services.panels import (
+    aget_account_panels,
+    aget_equity_panel,
+    aget_scenario_panel
+)
+from trading_insights.services.dashboard import (
+    ACCOUNT_VIEW_PERMISSION,
+    get_selected_account
+)
+from trading_insights.services.durations import aget_duration_statistics
+from trading_insights.services.heatmaps import (
+    HEATMAP_METRICS,
+    get_heatmap,
+    get_timezone
 )
+from trading_insights.services.statistics import aget_account_statistics
+from trading_insights.settings import HEATMAP_TIME_ZONES
 
 
 class ScenarioListView(ListView):
@@ -21,3 +49,170 @@ class ScenarioListView(ListView):
     def get(self, request, *args, **kwargs):
         # raise Exception("HI THERE FROM CUSTOM LIST VIEW")
         return super().get(request, *args, **kwargs)
+
+
+class AnalyticsView(AsyncProtectedView):
+    """
+    Base of the async JSON analytics endpoints of an object of `model`.
+    Subclasses define `async get_data(obj)`, returning the JSON payload.
+    """
+
+    model = None
+    queryset = None
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model.objects.all()
+
+    async def get_object(self):
+        try:
+            return await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except self.model.DoesNotExist:
+            raise Http404
+
+    def get_date(self, name):
+        """
+        ISO date of the `name` GET parameter, None when missing or invalid.
+        """
+        try:
+            return date.fromisoformat(self.request.GET.get(name, ""))
+        except ValueError:
+            return None
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not hasattr(self, "get_data"):
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} must define an async get_data(obj) method."
+            )
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        data = await self.get_data(await self.get_object())
+        return JsonResponse(data, encoder=DjangoJSONEncoder)
+
+
+class AccountStatisticsView(AnalyticsView):
+    model = Account
+    permission_required = "trading_insights.view_account"
+
+    async def get_data(self, account):
+        return await aget_account_statistics(account)
+
+
+class AccountEquityView(AnalyticsView):
+    model = Account
+    permission_required = "trading_insights.view_account"
+
+    async def get_data(self, account):
+        return await aget_equity_panel(account, self.get_date("date"))
+
+
+class AccountDurationsView(AnalyticsView):
+    model = Account
+    permission_required = "trading_insights.view_account"
+
+    async def get_data(self, account):
+        return await aget_duration_statistics(account)
+
+
+class AccountAnalyticsView(AnalyticsView):
+    model = Account
+    permission_required = "trading_insights.view_account"
+
+    async def get_data(self, account):
+        return await aget_account_panels(account, self.get_date("date"))
+
+
+class ScenarioProjectionView(AnalyticsView):
+    model = Scenario
+    queryset = Scenario.objects.select_related("account")
+    permission_required = "trading_insights.view_scenario"
+
+    async def get_data(self, scenario):
+        return await aget_scenario_panel(scenario, self.get_date("date"))
+
+
+def get_cell_style(value, scale, metric):
+    """
+    Background of a heatmap cell: green for gains (or win rates above 50%),
+    red for losses, more opaque the further from neutral.
+    """
+    if value is None or not scale:
+        return ""
+    if metric == "win_rate":
+        value, scale = value - 0.5, 0.5
+    if metric == "trade_count" or value >= 0:
+        color = "63, 135, 245" if metric == "trade_count" else "0, 201, 167"
+    else:
+        color = "222, 68, 54"
+    return f"background-color: rgba({color}, {min(abs(value) / scale, 1):.2f})"
+
+
+def get_heatmap_rows(heatmap, metric):
+    """
+    `(weekday, cells, total)` rows of the `metric` grid, each cell being a
+    `(value, trade_count, style)` tuple.
+    """
+    grid = heatmap[metric]
+    scale = max((abs(value) for row in grid for value in row if value is not None), default=0)
+    return [
+        (
+            WEEKDAYS[weekday],
+            [
+                (value, count, get_cell_style(value, scale, metric))
+                for value, count in zip(grid[weekday], heatmap["trade_count"][weekday])
+            ],
+            heatmap["weekdays"][metric][weekday],
+        )
+        for weekday in range(len(grid))
+    ]
+
+
+class HeatmapView(ProtectedTemplateView):
+    """
+    Performance of the trades of an account by weekday and hour of their
+    opening, in the chosen time zone.
+    """
+
+    template_name = "trading_insights/heatmap.html"
+    permission_required = ACCOUNT_VIEW_PERMISSION
+
+    def get_timezone(self):
+        try:
+            return get_timezone(self.request.GET.get("tz"))
+        except ValueError as e:
+            messages.error(self.request, str(e))
+            return get_timezone()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        accounts, account = get_selected_account(self.request)
+        tz = self.get_timezone()
+        metric = self.request.GET.get("metric")
+        if metric not in HEATMAP_METRICS:
+            metric = HEATMAP_METRICS[0]
+
+        context.update({
+            "model_verbose_name_plural": _("Performance horaire"),
+            "accounts": accounts,
+            "account": account,
+            "time_zones": [settings.TIME_ZONE, *HEATMAP_TIME_ZONES],
+            "time_zone": str(tz),
+            "metrics": [
+                ("net_profit", _("P&L")),
+                ("win_rate", _("Taux de réussite")),
+                ("trade_count", _("Nombre de trades")),
+            ],
+            "metric": metric,
+            "hours": range(24),
+        })
+        if account is not None:
+            heatmap = get_heatmap(account, tz)
+            context.update({
+                "heatmap": heatmap,
+                "heatmap_rows": get_heatmap_rows(heatmap, metric),
+                "hour_totals": heatmap["hours"][metric],
+                "total": heatmap["total"][metric],
+            })
+        return context